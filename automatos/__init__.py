@@ -5,16 +5,43 @@ automatos: Uma biblioteca para manipulação de Autómatos Finitos.
 
 Este pacote exporta as classes e funções essenciais para criar, manipular
 e utilizar Autómatos Finitos Determinísticos (AFD) e Não-Determinísticos (AFND).
+
+Os submódulos só são importados quando um dos nomes abaixo é usado pela
+primeira vez, e as mensagens de diagnóstico vão para o módulo `logging`
+(logger 'automatos').
 """
+from importlib import import_module
 
-# Expõe as classes principais para que possam ser importadas diretamente
-from .afd import AFD
-from .afd import AFDBuscaPadrao
-from .afnd import AFND
-from .afnd import AFNDBuscaPadrao
-from .ap import AP
 
+# Expõe as classes principais para que possam ser importadas diretamente
+_EXPORTACOES = {
+    'AFD': '.afd',
+    'AFDBuscaPadrao': '.afd',
+    'AFDBuscaMultiPadrao': '.afd',
+    'AFND': '.afnd',
+    'AFNDBuscaPadrao': '.afnd',
+    'AP': '.ap',
+    'OrcamentoEsgotado': '.ap',
+    'compilar_regex': '.regex',
+    'thompson': '.regex',
+    'ErroRegex': '.regex',
+    'AFDProduto': '.produto',
+    'AFDCompacto': '.compacto',
+    'AFNDCompacto': '.compacto',
+}
 
+__all__ = list(_EXPORTACOES)
 __version__ = "1.0.0"
 
-print("Pacote 'automatos' carregado.")
\ No newline at end of file
+
+def __getattr__(nome):
+    modulo = _EXPORTACOES.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(import_module(modulo, __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTACOES))
@@ -0,0 +1,34 @@
+"""
+Suporte comum à verificação em lote e à busca paralela com processos.
+
+Os dois módulos dividem o trabalho em blocos e enviam um objeto (o autómato
+compilado ou a busca) uma única vez para cada processo, pelo inicializador do
+conjunto. Aqui ficam a decisão de correr localmente, o tamanho dos blocos e a
+criação do conjunto.
+"""
+from __future__ import annotations
+import os
+
+# Blocos por processo: alguns equilibram a carga sem multiplicar as mensagens.
+BLOCOS_POR_PROCESSO = 4
+
+
+def planear(tamanho: int, workers: int | None, bloco: int | None, limite_local: int) -> tuple[int, int] | None:
+    """
+    Devolve `(workers, bloco)` para dividir `tamanho` unidades de trabalho, ou
+    None se for melhor correr no processo atual: com um único processo ou com
+    menos de `limite_local` unidades, o custo de arrancar o conjunto não compensa.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or tamanho < limite_local:
+        return None
+    if bloco is None:
+        bloco = max(1, -(-tamanho // (workers * BLOCOS_POR_PROCESSO)))
+    return workers, bloco
+
+
+def conjunto_processos(workers: int, inicializar, objeto):
+    """`ProcessPoolExecutor` cujos processos recebem `objeto` através de `inicializar`."""
+    # Importado só aqui: o módulo de processos é caro de carregar e raramente usado.
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers, initializer=inicializar, initargs=(objeto,))
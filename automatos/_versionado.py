@@ -0,0 +1,180 @@
+"""
+Contêineres que registam modificações num contador de versão partilhado.
+
+Os autómatos guardam formas compiladas (tabelas de inteiros, caches) que
+dependem de `transicoes`, `estados_finais`, etc. Como estes atributos são
+dicionários e conjuntos mutáveis, os contêineres abaixo incrementam uma
+`Versao` sempre que são alterados no lugar, o que permite detetar quando a
+forma compilada precisa de ser reconstruída.
+"""
+from __future__ import annotations
+
+
+class Versao:
+    """Contador de modificações partilhado por todos os contêineres de um objeto."""
+    __slots__ = ('valor',)
+
+    def __init__(self, valor: int = 0):
+        self.valor = valor
+
+
+class DictVersionado(dict):
+    """
+    Dicionário que incrementa a versão a cada modificação.
+
+    `filho` é uma função (valor, versao) -> contêiner usada para envolver os
+    valores inseridos (por exemplo, as linhas da tabela de transições). Quando
+    definido, o dicionário comporta-se como um `defaultdict`: aceder a uma chave
+    inexistente cria um filho vazio.
+    """
+    __slots__ = ('_versao', '_filho')
+
+    def __init__(self, versao: Versao, filho=None, dados=None):
+        super().__init__()
+        self._versao = versao
+        self._filho = filho
+        if dados:
+            for chave, valor in dados.items():
+                dict.__setitem__(self, chave, self._envolver(valor))
+
+    def _envolver(self, valor):
+        if self._filho is None:
+            return valor
+        return self._filho(valor, self._versao)
+
+    def __missing__(self, chave):
+        if self._filho is None:
+            raise KeyError(chave)
+        valor = self._filho(None, self._versao)
+        dict.__setitem__(self, chave, valor)
+        return valor
+
+    def __setitem__(self, chave, valor):
+        dict.__setitem__(self, chave, self._envolver(valor))
+        self._versao.valor += 1
+
+    def __delitem__(self, chave):
+        dict.__delitem__(self, chave)
+        self._versao.valor += 1
+
+    def setdefault(self, chave, padrao=None):
+        if chave not in self:
+            self[chave] = padrao
+        return dict.__getitem__(self, chave)
+
+    def update(self, *args, **kwargs):
+        for chave, valor in dict(*args, **kwargs).items():
+            dict.__setitem__(self, chave, self._envolver(valor))
+        self._versao.valor += 1
+
+    def __ior__(self, outro):
+        self.update(outro)
+        return self
+
+    def pop(self, *args):
+        valor = dict.pop(self, *args)
+        self._versao.valor += 1
+        return valor
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self._versao.valor += 1
+        return item
+
+    def clear(self):
+        dict.clear(self)
+        self._versao.valor += 1
+
+    def __reduce__(self):
+        return (self.__class__, (self._versao, self._filho, dict(self)))
+
+
+class SetVersionado(set):
+    """Conjunto que incrementa a versão a cada modificação."""
+    __slots__ = ('_versao',)
+
+    def __init__(self, versao: Versao, dados=None):
+        super().__init__(dados or ())
+        self._versao = versao
+
+    def _modificado(self):
+        self._versao.valor += 1
+
+    def add(self, elemento):
+        set.add(self, elemento)
+        self._modificado()
+
+    def discard(self, elemento):
+        set.discard(self, elemento)
+        self._modificado()
+
+    def remove(self, elemento):
+        set.remove(self, elemento)
+        self._modificado()
+
+    def pop(self):
+        elemento = set.pop(self)
+        self._modificado()
+        return elemento
+
+    def clear(self):
+        set.clear(self)
+        self._modificado()
+
+    def update(self, *outros):
+        set.update(self, *outros)
+        self._modificado()
+
+    def difference_update(self, *outros):
+        set.difference_update(self, *outros)
+        self._modificado()
+
+    def intersection_update(self, *outros):
+        set.intersection_update(self, *outros)
+        self._modificado()
+
+    def symmetric_difference_update(self, outro):
+        set.symmetric_difference_update(self, outro)
+        self._modificado()
+
+    def __ior__(self, outro):
+        self.update(outro)
+        return self
+
+    def __iand__(self, outro):
+        self.intersection_update(outro)
+        return self
+
+    def __isub__(self, outro):
+        self.difference_update(outro)
+        return self
+
+    def __ixor__(self, outro):
+        self.symmetric_difference_update(outro)
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (self._versao, list(self)))
+
+
+# --- Fábricas de filhos (funções de módulo para poderem ser serializadas) ---
+
+def conjunto_versionado(valor, versao: Versao) -> SetVersionado:
+    """Envolve um conjunto (ou None) num `SetVersionado`."""
+    if isinstance(valor, SetVersionado) and valor._versao is versao:
+        return valor
+    return SetVersionado(versao, valor)
+
+
+def linha_afd(valor, versao: Versao) -> DictVersionado:
+    """Linha da tabela de um AFD: simbolo -> estado de destino."""
+    if isinstance(valor, DictVersionado) and valor._versao is versao:
+        return valor
+    return DictVersionado(versao, None, valor)
+
+
+def linha_afnd(valor, versao: Versao) -> DictVersionado:
+    """Linha da tabela de um AFND: simbolo -> conjunto de estados de destino."""
+    if isinstance(valor, DictVersionado) and valor._versao is versao:
+        return valor
+    return DictVersionado(versao, conjunto_versionado, valor)
@@ -1,19 +1,433 @@
 from __future__ import annotations 
+from array import array
 from collections import defaultdict
+import logging
+from itertools import repeat
 
+from ._versionado import Versao, SetVersionado, DictVersionado, linha_afd
+from .varredura import BuscaEmFluxo
+from .lote import aceita_lote
+from .binario import eh_binario, salvar_afd, carregar_afd, copiar_inteiros
+from .instrumentacao import Instrumentavel
+from .classes import ParticaoAlfabeto
 
-class AFD:
+
+logger = logging.getLogger(__name__)
+
+
+class AFDCompilado:
+    """
+    Forma compilada de um AFD usada nas simulações.
+
+    Estados e símbolos são internados como inteiros e as transições ficam numa
+    tabela plana (`array`) com `largura` colunas por estado. Cada entrada guarda
+    diretamente o deslocamento da linha do estado de destino, de modo que um
+    passo da simulação é apenas `estado = tabela[estado + simbolo]`.
+    A última coluna (`outros`) é usada por qualquer símbolo que não tenha
+    transição definida e leva ao estado padrão (o estado inicial).
+
+    Com `classes` (ver `por_classes`), as colunas são classes de equivalência
+    de símbolos: `simbolos` associa cada símbolo à sua classe e a coluna
+    `outros` é a classe 0.
+
+    Uma tabela carregada do formato binário é uma vista do ficheiro mapeado,
+    guardado em `arquivo` até `fechar()` (ver `automatos.binario`).
+    """
+    __slots__ = ('estados', 'simbolos', 'largura', 'outros', 'tabela', 'inicial', 'finais', 'classes',
+                 'arquivo')
+
+    def __init__(self, estados, simbolos, tabela, inicial, finais, classes: ParticaoAlfabeto | None = None):
+        self.estados = estados
+        self.simbolos = simbolos
+        self.classes = classes
+        if classes is None:
+            self.largura = len(simbolos) + 1
+            self.outros = len(simbolos)
+        else:
+            self.largura = classes.n_classes
+            self.outros = 0
+        self.tabela = tabela
+        self.inicial = inicial
+        self.finais = finais
+        self.arquivo = None
+
+    @classmethod
+    def de_afd(cls, afd: AFD) -> AFDCompilado:
+        """Interna os estados e símbolos do AFD e monta a tabela plana."""
+        indices = {afd.estado_inicial: 0}
+        for estado in sorted(afd.estados | set(afd.estados_finais)):
+            indices.setdefault(estado, len(indices))
+        simbolos_vistos = set(afd.alfabeto)
+        for origem, transicao in afd.transicoes.items():
+            indices.setdefault(origem, len(indices))
+            for simbolo, destino in transicao.items():
+                indices.setdefault(destino, len(indices))
+                simbolos_vistos.add(simbolo)
+
+        simbolos = {simbolo: i for i, simbolo in enumerate(sorted(simbolos_vistos))}
+        largura = len(simbolos) + 1
+        # Estado padrão: transições ausentes voltam ao estado inicial (linha 0).
+        tabela = array('i', [0]) * (len(indices) * largura)
+        for origem, transicao in afd.transicoes.items():
+            linha = indices[origem] * largura
+            for simbolo, destino in transicao.items():
+                tabela[linha + simbolos[simbolo]] = indices[destino] * largura
+
+        finais = bytearray(len(tabela))
+        for estado in afd.estados_finais:
+            if estado in indices:
+                finais[indices[estado] * largura] = 1
+
+        return cls(list(indices), simbolos, tabela, 0, finais)
+
+    def por_classes(self) -> AFDCompilado:
+        """
+        Devolve uma cópia com uma coluna por classe de símbolos equivalentes
+        (ver `automatos.classes`), com os mesmos estados pela mesma ordem.
+        """
+        if self.classes is not None:
+            return self
+        particao, representantes = ParticaoAlfabeto.de_tabela(self.simbolos, self.tabela, self.largura)
+        largura = particao.n_classes
+        tabela = array('i', [0]) * (len(self.estados) * largura)
+        finais = bytearray(len(tabela))
+        for estado in range(len(self.estados)):
+            linha = estado * self.largura
+            nova = estado * largura
+            for classe, coluna in enumerate(representantes):
+                tabela[nova + classe] = self.tabela[linha + coluna] // self.largura * largura
+            finais[nova] = self.finais[linha]
+        inicial = self.inicial // self.largura * largura
+        return AFDCompilado(self.estados, particao.classe_de, tabela, inicial, finais, particao)
+
+    def colunas(self, cadeia):
+        """Sequência das colunas da tabela para os símbolos de `cadeia`."""
+        if self.classes is not None:
+            return self.classes.classes(cadeia)
+        return map(self.simbolos.get, cadeia, repeat(self.outros))
+
+    def executar(self, cadeia, estado: int | None = None) -> int:
+        """Processa a cadeia a partir de `estado` (deslocamento de linha) e devolve o estado final."""
+        tabela = self.tabela
+        atual = self.inicial if estado is None else estado
+        for coluna in self.colunas(cadeia):
+            atual = tabela[atual + coluna]
+        return atual
+
+    def aceita(self, cadeia) -> bool:
+        return bool(self.finais[self.executar(cadeia)])
+
+    def sincronizar(self, cadeia) -> tuple[int, int] | None:
+        """
+        Simula a cadeia a partir de todos os estados ao mesmo tempo, até que
+        as simulações convirjam. Devolve (p, estado) tal que qualquer estado
+        leva a `estado` após ler cadeia[:p], ou None se não convergirem.
+        """
+        tabela = self.tabela
+        atuais = set(range(0, len(tabela), self.largura))
+        for p, simbolo in enumerate(self.colunas(cadeia)):
+            if len(atuais) == 1:
+                return p, atuais.pop()
+            atuais = {tabela[estado + simbolo] for estado in atuais}
+        if len(atuais) == 1:
+            return len(cadeia), atuais.pop()
+        return None
+
+    def nome_estado(self, estado: int):
+        """Converte um deslocamento de linha de volta no nome do estado."""
+        return self.estados[estado // self.largura]
+
+    def para_transicoes(self, explicitas: bytes | None = None) -> dict:
+        """
+        Reconstrói o dicionário de transições a partir da tabela. `explicitas` é
+        um mapa de bits (estado * n_simbolos + coluna) das transições que estavam
+        definidas; sem ele, todas as colunas são incluídas.
+        """
+        largura = self.largura
+        tabela = self.tabela
+        simbolos = sorted(self.simbolos.items(), key=lambda item: item[1])
+        transicoes = {}
+        for indice, nome in enumerate(self.estados):
+            linha = indice * largura
+            base = indice * (largura - 1)
+            transicao = {
+                simbolo: self.estados[tabela[linha + coluna] // largura]
+                for simbolo, coluna in simbolos
+                if explicitas is None or explicitas[(base + coluna) >> 3] >> ((base + coluna) & 7) & 1
+            }
+            if transicao:
+                transicoes[nome] = transicao
+        return transicoes
+
+    def mapear(self, arquivo):
+        """Associa a tabela (uma vista de `arquivo`) ao ficheiro mapeado de onde foi lida."""
+        self.arquivo = arquivo
+        arquivo.registar(self)
+
+    def _desmapear(self):
+        self.tabela = copiar_inteiros(self.tabela, 'i')
+        self.arquivo = None
+
+    def fechar(self):
+        """
+        Fecha o ficheiro de onde a tabela foi carregada; as tabelas mapeadas
+        dele passam antes para memória própria. Sem ficheiro, não faz nada.
+        """
+        if self.arquivo is not None:
+            self.arquivo.fechar()
+
+    def __getstate__(self):
+        # Uma tabela mapeada de um ficheiro (memoryview) é copiada para poder ser serializada.
+        estado = {nome: getattr(self, nome) for nome in self.__slots__}
+        estado['arquivo'] = None
+        if isinstance(self.tabela, memoryview):
+            estado['tabela'] = array('i', self.tabela)
+        return (None, estado)
+
+    def __setstate__(self, estado):
+        for nome, valor in estado[1].items():
+            setattr(self, nome, valor)
+
+
+class AFD(Instrumentavel):
     """
     Autômato Finito Determinístico (AFD).
     """
+    METODOS_INSTRUMENTADOS = ('aceita',)
 
     def __init__(self, estados=None, alfabeto=None, transicoes=None, estado_inicial=None, estados_finais=None):
+        # Contador de modificações: a forma compilada é reconstruída quando muda.
+        self._versao = Versao()
+        self._compilado = None
+        self._versao_compilada = -1
+        self._classes = None
+        self._versao_classes = -1
+        self._mapeado = None
         self.estados = estados or set()
         self.alfabeto = alfabeto or set()
         self.transicoes = transicoes or defaultdict(dict)
         self.estado_inicial = estado_inicial
         self.estados_finais = estados_finais or set()
 
+    @property
+    def transicoes(self):
+        if self._transicoes is None:
+            # Carregado de um ficheiro binário: o dicionário só é montado quando pedido.
+            transicoes = self._compilado_carregado.para_transicoes(self._explicitas)
+            self._transicoes = DictVersionado(self._versao, linha_afd, transicoes)
+            self._compilado_carregado = self._explicitas = None
+        return self._transicoes
+
+    @transicoes.setter
+    def transicoes(self, valor):
+        self._transicoes = DictVersionado(self._versao, linha_afd, valor)
+        self._versao.valor += 1
+
+    @property
+    def estado_inicial(self):
+        return self._estado_inicial
+
+    @estado_inicial.setter
+    def estado_inicial(self, valor):
+        self._estado_inicial = valor
+        self._versao.valor += 1
+
+    @property
+    def estados_finais(self):
+        return self._estados_finais
+
+    @estados_finais.setter
+    def estados_finais(self, valor):
+        self._estados_finais = SetVersionado(self._versao, valor)
+        self._versao.valor += 1
+
+    def _usar_compilado(self, compilado: AFDCompilado, estados, alfabeto, estados_finais, explicitas=None,
+                        por_classes: AFDCompilado | None = None):
+        """
+        Adota uma forma compilada já pronta (por exemplo, a tabela mapeada de um
+        ficheiro binário) e, se indicada, a sua forma por classes. O dicionário
+        `transicoes` só é reconstruído se for acedido, e só com as transições
+        marcadas em `explicitas`.
+        """
+        self.estados = estados
+        self.alfabeto = alfabeto
+        self.estado_inicial = compilado.nome_estado(compilado.inicial)
+        self.estados_finais = estados_finais
+        self._transicoes = None
+        self._compilado_carregado = compilado
+        self._explicitas = explicitas
+        self._compilado = compilado
+        self._versao_compilada = self._versao.valor
+        if por_classes is not None:
+            self._classes = por_classes
+            self._versao_classes = self._versao.valor
+        if compilado.arquivo is not None:
+            self._mapeado = compilado
+
+    def fechar(self):
+        """
+        Fecha o ficheiro binário de onde o AFD foi carregado (ver
+        `automatos.binario`); a tabela passa a ser uma cópia em memória e o
+        AFD continua utilizável. Também pode ser usado num bloco `with`.
+        """
+        if self._mapeado is not None:
+            self._mapeado.fechar()
+            self._mapeado = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def compilar(self) -> AFDCompilado:
+        """
+        Devolve a forma compilada do AFD, reconstruindo-a apenas se as transições,
+        o estado inicial ou os estados finais tiverem sido modificados.
+        """
+        if self._versao_compilada != self._versao.valor:
+            self._compilado = AFDCompilado.de_afd(self)
+            self._versao_compilada = self._versao.valor
+        return self._compilado
+
+    def compilar_classes(self) -> AFDCompilado:
+        """
+        Forma compilada com as colunas agrupadas em classes de símbolos
+        equivalentes (`AFDCompilado.por_classes`), usada nas simulações e buscas.
+        Num AFD carregado do formato binário é a tabela guardada no ficheiro.
+        """
+        if self._versao_classes != self._versao.valor:
+            self._classes = self.compilar().por_classes()
+            self._versao_classes = self._versao.valor
+        return self._classes
+
+    def _outros_ao_inicial(self) -> bool:
+        """
+        Indica se, em todos os estados, os símbolos sem transição levam ao
+        estado inicial, como num AFD montado a partir de dicionários. As tabelas
+        adotadas (`compilar_regex`, `AFDProduto.para_afd`, `minimizar`) podem
+        enviá-los para um estado morto ou para o destino de um '.'.
+        """
+        compilado = self.compilar()
+        inicial = compilado.inicial
+        tabela = compilado.tabela
+        return all(tabela[linha + compilado.outros] == inicial
+                   for linha in range(0, len(tabela), compilado.largura))
+
+    def minimizar(self) -> AFD:
+        """
+        Devolve um novo AFD mínimo que aceita a mesma linguagem.
+
+        Trabalha sobre a forma compilada (transições completas): descarta os
+        estados inalcançáveis e aplica o refinamento de partições de Hopcroft,
+        em O(n·|E|·log n). Cada bloco de estados equivalentes recebe o nome do
+        menor estado que contém.
+
+        A coluna "outros" entra no refinamento como qualquer símbolo: num AFD
+        montado a partir de dicionários leva sempre ao estado inicial, mas nas
+        tabelas adotadas (`compilar_regex`, `AFDProduto.para_afd`) pode levar
+        a um estado morto ou ao destino de um '.'. Nesse caso o AFD mínimo é
+        devolvido na forma compilada, que a preserva.
+        """
+        compilado = self.compilar()
+        largura = compilado.largura
+        tabela = compilado.tabela
+        colunas = range(largura)
+        total = len(compilado.estados)
+
+        # 1. Estados alcançáveis a partir do inicial.
+        alcancaveis = [compilado.inicial // largura]
+        visitado = bytearray(total)
+        visitado[alcancaveis[0]] = 1
+        for estado in alcancaveis:
+            linha = estado * largura
+            for coluna in colunas:
+                destino = tabela[linha + coluna] // largura
+                if not visitado[destino]:
+                    visitado[destino] = 1
+                    alcancaveis.append(destino)
+
+        # 2. Transições inversas: predecessores[coluna][estado]
+        predecessores = [dict() for _ in colunas]
+        for estado in alcancaveis:
+            linha = estado * largura
+            for coluna in colunas:
+                predecessores[coluna].setdefault(tabela[linha + coluna] // largura, []).append(estado)
+
+        # 3. Partição inicial: finais e não-finais.
+        finais = {e for e in alcancaveis if compilado.finais[e * largura]}
+        blocos = [bloco for bloco in (set(finais), set(alcancaveis) - finais) if bloco]
+        bloco_de = [0] * total
+        for id_bloco, bloco in enumerate(blocos):
+            for estado in bloco:
+                bloco_de[estado] = id_bloco
+
+        # 4. Refinamento: basta usar o menor dos dois blocos como separador.
+        menor = min(range(len(blocos)), key=lambda b: len(blocos[b]))
+        pendentes = [(menor, coluna) for coluna in colunas]
+        em_pendentes = set(pendentes)
+        while pendentes:
+            separador = pendentes.pop()
+            em_pendentes.discard(separador)
+            id_separador, coluna = separador
+            inversa = predecessores[coluna]
+
+            tocados = {}
+            for estado in blocos[id_separador]:
+                for anterior in inversa.get(estado, ()):
+                    tocados.setdefault(bloco_de[anterior], []).append(anterior)
+
+            for id_bloco, membros in tocados.items():
+                if len(membros) == len(blocos[id_bloco]):
+                    continue
+                novo = set(membros)
+                blocos[id_bloco] -= novo
+                id_novo = len(blocos)
+                blocos.append(novo)
+                for estado in novo:
+                    bloco_de[estado] = id_novo
+                for c in colunas:
+                    if (id_bloco, c) in em_pendentes:
+                        par = (id_novo, c)
+                    elif len(novo) <= len(blocos[id_bloco]):
+                        par = (id_novo, c)
+                    else:
+                        par = (id_bloco, c)
+                    pendentes.append(par)
+                    em_pendentes.add(par)
+
+        # 5. Monta o AFD quociente.
+        nomes = [min((compilado.estados[e] for e in bloco), key=str) for bloco in blocos]
+        simbolos = sorted(compilado.simbolos, key=compilado.simbolos.get)
+        bloco_inicial = bloco_de[compilado.inicial // largura]
+        destinos = [[bloco_de[tabela[next(iter(bloco)) * largura + coluna] // largura] for coluna in colunas]
+                    for bloco in blocos]
+        alfabeto = set(self.alfabeto) | set(simbolos)
+        estados_finais = {nomes[bloco_de[e]] for e in finais}
+
+        if any(linha[compilado.outros] != bloco_inicial for linha in destinos):
+            tabela_minima = array('i', [0]) * (len(blocos) * largura)
+            finais_minimos = bytearray(len(tabela_minima))
+            for id_bloco, linha in enumerate(destinos):
+                for coluna, destino in enumerate(linha):
+                    tabela_minima[id_bloco * largura + coluna] = destino * largura
+                finais_minimos[id_bloco * largura] = nomes[id_bloco] in estados_finais
+            minimo = AFD()
+            minimo._usar_compilado(
+                AFDCompilado(nomes, dict(compilado.simbolos), tabela_minima, bloco_inicial * largura,
+                             finais_minimos),
+                set(nomes), alfabeto, estados_finais)
+            return minimo
+
+        return AFD(
+            estados=set(nomes),
+            alfabeto=alfabeto,
+            transicoes={nomes[id_bloco]: dict(zip(simbolos, (nomes[destino] for destino in linha)))
+                        for id_bloco, linha in enumerate(destinos)},
+            estado_inicial=nomes[bloco_inicial],
+            estados_finais=estados_finais,
+        )
+
     def __str__(self):
         """Representação em string do AFD."""
         transicoes_str = ""
@@ -36,19 +450,98 @@ class AFD:
         """
         Simula a execução do AFD para determinar se a cadeia de entrada é aceita.
         """
-        estado_atual = self.estado_inicial
-        result = False
-        for i, caractere_do_texto in enumerate(cadeia):
-            estado_atual = self.transicoes.get(estado_atual, {}).get(
-                caractere_do_texto, self.estado_inicial)
-        
-        if estado_atual in self.estados_finais:
-            result = True
-        
-        return result
+        return self.compilar_classes().aceita(cadeia)
+
+    def aceita_instrumentado(self, cadeia: str) -> bool:
+        """Variante de `aceita` ativada por `instrumentar()` (ver `automatos.instrumentacao`)."""
+        instrumentacao = self.instrumentacao
+        with instrumentacao.fase('compilar'):
+            compilado = self.compilar_classes()
+            # O mapa de classes omite os símbolos da classe 0; os ausentes são
+            # os que nem a tabela com uma coluna por símbolo tem.
+            alfabeto = self.compilar().simbolos
+        tabela = compilado.tabela
+        classes = compilado.simbolos
+        rastreio = instrumentacao.rastreio
+        atual = compilado.inicial
+        ausentes = 0
+        passos = 0
+
+        with instrumentacao.fase('simular'):
+            for passos, simbolo in enumerate(cadeia, 1):
+                if simbolo not in alfabeto:
+                    ausentes += 1
+                atual = tabela[atual + classes.get(simbolo, compilado.outros)]
+                if rastreio is not None:
+                    rastreio(passos - 1, simbolo, compilado.nome_estado(atual))
+
+        contadores = instrumentacao.contadores
+        contadores['transicoes'] += passos
+        contadores['ausentes'] += ausentes
+        if passos:
+            instrumentacao.ativos(1)
+            contadores['ativos_total'] += passos - 1
+        return bool(compilado.finais[atual])
+
+    def aceita_lote(self, cadeias, workers: int | None = None, chunksize: int | None = None) -> list[bool]:
+        """
+        Verifica uma lista de cadeias e devolve os resultados pela mesma ordem.
+        Lotes grandes são divididos por um conjunto de processos que recebem a
+        forma compilada do AFD uma única vez; lotes pequenos correm no próprio processo.
+        """
+        return aceita_lote(self.compilar_classes(), cadeias, workers, chunksize)
+
+    def aceita_vetorizado(self, cadeias):
+        """
+        Versão de `aceita` para muitas cadeias de uma vez, vetorizada com NumPy
+        (dependência opcional). Devolve um array booleano pela ordem de entrada.
+        """
+        # Importado só aqui: o NumPy é opcional e caro de carregar.
+        from .vetorizado import aceita_vetorizado
+        return aceita_vetorizado(self.compilar(), cadeias)
+
+    def compactar(self):
+        """Devolve a representação compacta do AFD (ver `automatos.compacto`)."""
+        from .compacto import AFDCompacto
+        return AFDCompacto.de_afd(self)
+
+    def __and__(self, outro):
+        """Interseção preguiçosa (ver `automatos.produto`)."""
+        from .produto import AFDProduto
+        return AFDProduto('e', self, outro)
 
-    def salvar_automato(self, filepath: str):
-        """Salva o autômato."""
+    def __or__(self, outro):
+        """União preguiçosa (ver `automatos.produto`)."""
+        from .produto import AFDProduto
+        return AFDProduto('ou', self, outro)
+
+    def __sub__(self, outro):
+        """Diferença preguiçosa (ver `automatos.produto`)."""
+        from .produto import AFDProduto
+        return AFDProduto('menos', self, outro)
+
+    def __invert__(self):
+        """Complemento preguiçoso (ver `automatos.produto`)."""
+        from .produto import AFDProduto
+        return AFDProduto('nao', self)
+
+    def salvar_automato(self, filepath: str, binario: bool = False):
+        """
+        Salva o autômato. Com `binario=True` usa o formato binário
+        (ver `automatos.binario`), que é carregado sem interpretar texto.
+
+        O formato de texto só guarda as transições explícitas, e ao carregar os
+        símbolos sem transição voltam ao estado inicial. Um AFD cuja coluna
+        "outros" leva a outro estado (ver `_outros_ao_inicial`) é recusado com
+        `ValueError`; o formato binário guarda a tabela completa.
+        """
+        if binario:
+            salvar_afd(self, filepath)
+            logger.info("AFD salvo em %r", filepath)
+            return
+        if not self._outros_ao_inicial():
+            raise ValueError("Neste AFD os símbolos sem transição não levam ao estado inicial, o que o "
+                             "formato de texto não representa; use binario=True.")
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(f"TIPO:AFD\n")
             f.write(f"ESTADOS:{','.join(sorted(list(self.estados)))}\n")
@@ -60,12 +553,17 @@ class AFD:
                 if origem_estado in self.transicoes:
                     for simbolo, destino_estado in sorted(self.transicoes[origem_estado].items()):
                         f.write(f"{origem_estado},{simbolo},{destino_estado}\n")
-        print(f"✔ AFD salvo com sucesso em '{filepath}'")
+        logger.info("AFD salvo em %r", filepath)
 
     @classmethod
     def abrir_arquivo(cls, filepath: str) -> AFD:
-        """Cria uma instância de AFD a partir de um ficheiro."""
+        """Cria uma instância de AFD a partir de um ficheiro (texto ou binário)."""
         afd = cls()
+        if eh_binario(filepath):
+            carregar_afd(afd, filepath)
+            logger.info("AFD carregado de %r", filepath)
+            return afd
+
         with open(filepath, 'r', encoding='utf-8') as f:
             linhas = [line.strip() for line in f if line.strip()]
 
@@ -87,16 +585,17 @@ class AFD:
                     origem, simbolo, destino = linha.split(',')
                     afd.transicoes[origem][simbolo] = destino
                 except ValueError:
-                    print(f"Aviso: Linha de transição mal formatada ignorada: '{linha}'")
+                    logger.warning("Linha de transição mal formatada ignorada: %r", linha)
         
-        print(f"✔ AFD carregado com sucesso de '{filepath}'")
+        logger.info("AFD carregado de %r", filepath)
         return afd
 
 
-class AFDBuscaPadrao(AFD):
+class AFDBuscaPadrao(BuscaEmFluxo, AFD):
     """
     É um AFD para busca de padrões.
     """
+    METODOS_INSTRUMENTADOS = ('aceita', '_varrer')
 
     def __init__(self, padrao: str):
         if not padrao:
@@ -115,6 +614,44 @@ class AFDBuscaPadrao(AFD):
         """
         Método privado que configura os atributos do próprio objeto (self)
         para funcionar como um AFD de busca de padrão.
+
+        Usa a função de falha do KMP: a linha do estado j é uma cópia da linha
+        do estado de reinício X (o estado em que o AFD estaria após ler
+        padrao[1:j]), exceto pela transição de sucesso em padrao[j]. O custo
+        total é O(m·|E|), contra O(m³·|E|) de `_construir_automato_de_padrao_referencia`.
+        """
+        tamanho_padrao = len(padrao)
+
+        # Configura os atributos herdados de AFD
+        self.estados = {str(i) for i in range(tamanho_padrao + 1)}
+        self.estado_inicial = '0'
+        self.estados_finais = {str(tamanho_padrao)}
+        self.alfabeto = set(padrao)
+
+        logger.debug("Construindo AFD para o padrão %r", padrao)
+
+        linhas = [dict.fromkeys(self.alfabeto, 0)]
+        linhas[0][padrao[0]] = 1
+        reinicio = 0
+        for estado in range(1, tamanho_padrao + 1):
+            linha = dict(linhas[reinicio])
+            if estado < tamanho_padrao:
+                linha[padrao[estado]] = estado + 1
+                reinicio = linhas[reinicio][padrao[estado]]
+            linhas.append(linha)
+
+        self.transicoes = {
+            str(estado): {caractere: str(destino) for caractere, destino in linha.items()}
+            for estado, linha in enumerate(linhas)
+        }
+
+        logger.debug("AFD de busca de padrão construído")
+
+    def _construir_automato_de_padrao_referencia(self, padrao: str):
+        """
+        Construção direta (e lenta) do AFD de busca, mantida como referência
+        para validar `_construir_automato_de_padrao`: para cada estado e
+        símbolo procura o maior prefixo do padrão que é sufixo da cadeia lida.
         """
         tamanho_padrao = len(padrao)
         
@@ -124,7 +661,7 @@ class AFDBuscaPadrao(AFD):
         self.estados_finais = {str(tamanho_padrao)}
         self.alfabeto = set(padrao)
 
-        print(f"Construindo AFD para o padrão '{padrao}'...")
+        logger.debug("Construindo AFD para o padrão %r", padrao)
 
         for estado_atual_int in range(tamanho_padrao + 1):
             estado_atual_str = str(estado_atual_int)
@@ -143,31 +680,28 @@ class AFDBuscaPadrao(AFD):
                 
                 self.transicoes[estado_atual_str][caractere_lido] = str(proximo_estado)
 
-        print("✔ AFD de busca de padrão construído.")
+        logger.debug("AFD de busca de padrão construído")
 
     def buscar(self, texto: str) -> list[int]:
         """
         Executa a busca pelo padrão no texto usando a lógica de simulação
         do AFD.
         """
-        estado_atual = self.estado_inicial
-        indices_encontrados = []
+        return self._varrer(texto, self._estado_varredura_inicial(), 0)[1]
 
-        for i, caractere_do_texto in enumerate(texto):
-            # Obtém o próximo estado. O default é o estado inicial.
-            estado_atual = self.transicoes.get(estado_atual, {}).get(
-                caractere_do_texto, self.estado_inicial)
+    def _saidas_do_estado(self, nome) -> tuple:
+        """Cada estado final reporta uma ocorrência do padrão, iniciada `tamanho - 1` posições antes."""
+        return ((None, self.tamanho_padrao - 1),)
 
-            if estado_atual in self.estados_finais:
-                indice_inicial = i - self.tamanho_padrao + 1
-                indices_encontrados.append(indice_inicial)
-
-        return indices_encontrados
-    
     @classmethod
     def abrir_arquivo(cls, filepath: str, padrao: str) -> AFD:
-        """Cria uma instância de AFD a partir de um ficheiro."""
+        """Cria uma instância de AFD a partir de um ficheiro (texto ou binário)."""
         afd = cls(padrao)
+        if eh_binario(filepath):
+            carregar_afd(afd, filepath)
+            logger.info("AFD carregado de %r", filepath)
+            return afd
+
         with open(filepath, 'r', encoding='utf-8') as f:
             linhas = [line.strip() for line in f if line.strip()]
 
@@ -189,7 +723,101 @@ class AFDBuscaPadrao(AFD):
                     origem, simbolo, destino = linha.split(',')
                     afd.transicoes[origem][simbolo] = destino
                 except ValueError:
-                    print(f"Aviso: Linha de transição mal formatada ignorada: '{linha}'")
+                    logger.warning("Linha de transição mal formatada ignorada: %r", linha)
         
-        print(f"✔ AFD carregado com sucesso de '{filepath}'")
-        return afd
\ No newline at end of file
+        logger.info("AFD carregado de %r", filepath)
+        return afd
+
+class AFDBuscaMultiPadrao(BuscaEmFluxo, AFD):
+    """
+    É um AFD para busca simultânea de vários padrões (Aho-Corasick).
+
+    O autômato é a trie dos padrões completada com as ligações de falha, de
+    modo que o texto é percorrido uma única vez. Cada estado final guarda os
+    padrões que terminam nele em `saidas`.
+    """
+    METODOS_INSTRUMENTADOS = ('aceita', '_varrer')
+
+    def __init__(self, padroes):
+        padroes = list(padroes)
+        if not padroes:
+            raise ValueError("É necessário pelo menos um padrão.")
+        if not all(padroes):
+            raise ValueError("O padrão não pode ser vazio.")
+
+        super().__init__()
+
+        self.padroes = padroes
+        self.saidas = {}
+
+        self._construir_automato_de_padroes(padroes)
+
+    def _construir_automato_de_padroes(self, padroes: list[str]):
+        """
+        Método privado que monta a trie dos padrões, calcula as ligações de
+        falha em largura e completa a função de transição com elas.
+        """
+        logger.debug("Construindo AFD para %d padrões", len(padroes))
+
+        # 1. Trie: filhos[estado] = {caractere: estado}
+        filhos = [{}]
+        saidas = [[]]
+        for id_padrao, padrao in enumerate(padroes):
+            estado = 0
+            for caractere in padrao:
+                if caractere not in filhos[estado]:
+                    filhos[estado][caractere] = len(filhos)
+                    filhos.append({})
+                    saidas.append([])
+                estado = filhos[estado][caractere]
+            saidas[estado].append(id_padrao)
+
+        # 2. Ligações de falha e transições completas, em ordem de largura.
+        # A linha de cada estado começa como cópia da linha do seu estado de falha.
+        alfabeto = {caractere for padrao in padroes for caractere in padrao}
+        linhas = [dict.fromkeys(alfabeto, 0)] + [None] * (len(filhos) - 1)
+        linhas[0].update(filhos[0])
+        falha = [0] * len(filhos)
+        fila = list(filhos[0].values())
+        for estado in fila:
+            linhas[estado] = dict(linhas[falha[estado]])
+            linhas[estado].update(filhos[estado])
+            saidas[estado].extend(saidas[falha[estado]])
+            for caractere, filho in filhos[estado].items():
+                falha[filho] = linhas[falha[estado]][caractere]
+                fila.append(filho)
+
+        self.estados = {str(i) for i in range(len(filhos))}
+        self.alfabeto = alfabeto
+        self.estado_inicial = '0'
+        self.estados_finais = {str(i) for i, saida in enumerate(saidas) if saida}
+        self.saidas = {str(i): tuple(saida) for i, saida in enumerate(saidas) if saida}
+        self.transicoes = {
+            str(estado): {caractere: str(destino) for caractere, destino in linha.items()}
+            for estado, linha in enumerate(linhas)
+        }
+
+        logger.debug("AFD de busca de múltiplos padrões construído")
+
+    def _saidas_do_estado(self, nome) -> tuple:
+        """Ocorrências (id_padrao, tamanho - 1) reportadas ao chegar ao estado `nome`."""
+        return tuple((id_padrao, len(self.padroes[id_padrao]) - 1) for id_padrao in self.saidas.get(nome, ()))
+
+    def buscar(self, texto: str) -> list[tuple[int, int]]:
+        """
+        Percorre o texto uma única vez e devolve as ocorrências de todos os
+        padrões como pares (id_padrao, indice_inicial), pela ordem em que terminam.
+        """
+        return self._varrer(texto, self._estado_varredura_inicial(), 0)[1]
+
+    @classmethod
+    def abrir_arquivo(cls, filepath: str, padroes) -> AFD:
+        """Cria uma instância a partir de um ficheiro salvo com `salvar_automato`."""
+        afd = cls(padroes)
+        with AFD.abrir_arquivo(filepath) as carregado:
+            afd.estados = carregado.estados
+            afd.alfabeto = carregado.alfabeto
+            afd.estado_inicial = carregado.estado_inicial
+            afd.estados_finais = carregado.estados_finais
+            afd.transicoes = carregado.transicoes
+        return afd
@@ -1,15 +1,163 @@
 from __future__ import annotations # Permite usar AFND como tipo de retorno dentro da própria classe
 from collections import defaultdict
+import logging
+from itertools import repeat
 import collections.abc # Para checagem de tipo iterável
+import time
 
-class AFND:
+from ._versionado import Versao, SetVersionado, DictVersionado, linha_afnd
+from .varredura import BuscaEmFluxo
+from .lote import aceita_lote
+from .binario import eh_binario, salvar_afnd, carregar_afnd
+from .instrumentacao import Instrumentavel
+
+
+logger = logging.getLogger(__name__)
+
+
+class CacheDeterminizacao:
+    """
+    Cache da determinização preguiçosa de um AFND.
+
+    Cada conjunto de estados ativos (frozenset) descoberto durante a simulação
+    recebe um id inteiro, e as transições (id, simbolo) -> id são memorizadas à
+    medida que são usadas. O número de conjuntos é limitado por `limite`.
+    """
+    __slots__ = ('ids', 'conjuntos', 'transicoes', 'finais', 'limite')
+
+    def __init__(self, limite: int):
+        self.limite = limite
+        self.limpar()
+
+    def limpar(self):
+        """Descarta todos os conjuntos e transições memorizados."""
+        self.ids = {}
+        self.conjuntos = []
+        self.transicoes = []
+        self.finais = []
+
+    def cheio(self) -> bool:
+        return len(self.conjuntos) >= self.limite
+
+    def registrar(self, conjunto: frozenset, estados_finais) -> int:
+        """Devolve o id do conjunto, criando-o se ainda não existir."""
+        id_conjunto = self.ids.get(conjunto)
+        if id_conjunto is None:
+            id_conjunto = len(self.conjuntos)
+            self.ids[conjunto] = id_conjunto
+            self.conjuntos.append(conjunto)
+            self.transicoes.append({})
+            self.finais.append(not conjunto.isdisjoint(estados_finais))
+        return id_conjunto
+
+
+class AFNDCompilado:
+    """
+    Forma compacta e serializável de um AFND.
+
+    Os estados são internados como inteiros e cada conjunto de estados é um
+    inteiro usado como máscara de bits. `transicoes[estado][simbolo]` já é a
+    máscara do épsilon-fecho dos destinos, de modo que um passo da simulação é
+    apenas a união das máscaras dos estados ativos. Os passos (máscara, símbolo)
+    já calculados são memorizados, até `limite` entradas.
+    """
+    __slots__ = ('estados', 'transicoes', 'inicial', 'finais', 'limite', '_passos')
+
+    def __init__(self, estados, transicoes, inicial, finais, limite):
+        self.estados = estados
+        self.transicoes = transicoes
+        self.inicial = inicial
+        self.finais = finais
+        self.limite = limite
+        self._passos = {}
+
+    @classmethod
+    def de_afnd(cls, afnd: AFND) -> AFNDCompilado:
+        fechos = afnd.fechos_epsilon()
+        indices = {afnd.estado_inicial: 0}
+        for estado in sorted(afnd.estados):
+            indices.setdefault(estado, len(indices))
+        for origem, transicao in afnd.transicoes.items():
+            indices.setdefault(origem, len(indices))
+            for destinos in transicao.values():
+                for destino in destinos:
+                    indices.setdefault(destino, len(indices))
+
+        def mascara(estados) -> int:
+            resultado = 0
+            for estado in estados:
+                for alcancado in fechos.get(estado, (estado,)):
+                    resultado |= 1 << indices[alcancado]
+            return resultado
+
+        transicoes = [{} for _ in indices]
+        for origem, transicao in afnd.transicoes.items():
+            linha = transicoes[indices[origem]]
+            for simbolo, destinos in transicao.items():
+                if simbolo != afnd.EPSILON and destinos:
+                    linha[simbolo] = mascara(destinos)
+
+        finais = 0
+        for estado in afnd.estados_finais:
+            if estado in indices:
+                finais |= 1 << indices[estado]
+
+        return cls(list(indices), transicoes, mascara({afnd.estado_inicial}), finais, afnd.LIMITE_CACHE)
+
+    def passo(self, ativos: int, simbolo) -> int:
+        chave = (ativos, simbolo)
+        proximos = self._passos.get(chave)
+        if proximos is None:
+            proximos = 0
+            transicoes = self.transicoes
+            restantes = ativos
+            while restantes:
+                bit = restantes & -restantes
+                proximos |= transicoes[bit.bit_length() - 1].get(simbolo, 0)
+                restantes ^= bit
+            if len(self._passos) >= self.limite:
+                self._passos.clear()
+            self._passos[chave] = proximos
+        return proximos
+
+    def aceita(self, cadeia) -> bool:
+        ativos = self.inicial
+        for simbolo in cadeia:
+            ativos = self.passo(ativos, simbolo)
+        return bool(ativos & self.finais)
+
+    def __getstate__(self):
+        # A memória de passos não é enviada para outros processos.
+        return (None, {nome: getattr(self, nome) for nome in self.__slots__ if nome != '_passos'})
+
+    def __setstate__(self, estado):
+        for nome, valor in estado[1].items():
+            setattr(self, nome, valor)
+        self._passos = {}
+
+
+class AFND(Instrumentavel):
     """
     Autômato Finito Não-Determinístico (AFND)
     """
     # Constante para representar a transição épsilon.
     EPSILON = "&"
+    # Número máximo de conjuntos de estados no cache de determinização.
+    LIMITE_CACHE = 4096
+    # Quantas vezes o cache pode ser esvaziado numa única chamada antes de
+    # recorrer à simulação com conjuntos.
+    MAX_REINICIOS_CACHE = 2
+    METODOS_INSTRUMENTADOS = ('aceita', 'e_fecho')
 
     def __init__(self, estados=None, alfabeto=None, transicoes=None, estado_inicial=None, estados_finais=None):
+        # Contador de modificações: os caches são descartados quando muda.
+        self._versao = Versao()
+        self._cache = None
+        self._versao_cache = -1
+        self._fechos = None
+        self._versao_fechos = -1
+        self._compilado = None
+        self._versao_compilada = -1
         self.estados = estados or set()
         self.alfabeto = alfabeto or set()
         # A principal diferença: o valor de uma transição é um CONJUNTO de estados de destino.
@@ -19,6 +167,33 @@ class AFND:
         self.estado_inicial = estado_inicial
         self.estados_finais = estados_finais or set()
 
+    @property
+    def transicoes(self):
+        return self._transicoes
+
+    @transicoes.setter
+    def transicoes(self, valor):
+        self._transicoes = DictVersionado(self._versao, linha_afnd, valor)
+        self._versao.valor += 1
+
+    @property
+    def estado_inicial(self):
+        return self._estado_inicial
+
+    @estado_inicial.setter
+    def estado_inicial(self, valor):
+        self._estado_inicial = valor
+        self._versao.valor += 1
+
+    @property
+    def estados_finais(self):
+        return self._estados_finais
+
+    @estados_finais.setter
+    def estados_finais(self, valor):
+        self._estados_finais = SetVersionado(self._versao, valor)
+        self._versao.valor += 1
+
     def __str__(self):
         """Retorna uma representação em string do AFND para fácil visualização."""
         transicoes_str = ""
@@ -38,8 +213,15 @@ class AFND:
 {transicoes_str}
         """
 
-    def salvar_automato(self, filepath: str):
-        """Salva o autómato num ficheiro de texto num formato compatível com AFND."""
+    def salvar_automato(self, filepath: str, binario: bool = False):
+        """
+        Salva o autómato num ficheiro de texto num formato compatível com AFND.
+        Com `binario=True` usa o formato binário (ver `automatos.binario`).
+        """
+        if binario:
+            salvar_afnd(self, filepath)
+            logger.info("AFND salvo em %r", filepath)
+            return
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(f"TIPO:AFND\n")
             f.write(f"ESTADOS:{','.join(sorted(list(self.estados)))}\n")
@@ -53,12 +235,17 @@ class AFND:
                         # Junta múltiplos estados de destino com um ponto e vírgula.
                         if dest_states:
                             f.write(f"{origin_state},{symbol},{';'.join(sorted(list(dest_states)))}\n")
-        print(f"✔ AFND salvo com sucesso em '{filepath}'")
+        logger.info("AFND salvo em %r", filepath)
 
     @classmethod
     def from_file(cls, filepath: str) -> AFND:
-        """Cria uma instância de AFND a partir de um ficheiro (método de fábrica)."""
+        """Cria uma instância de AFND a partir de um ficheiro, texto ou binário (método de fábrica)."""
         afnd = cls()
+        if eh_binario(filepath):
+            carregar_afnd(afnd, filepath)
+            logger.info("AFND carregado de %r", filepath)
+            return afnd
+
         with open(filepath, 'r', encoding='utf-8') as f:
             lines = [line.strip() for line in f if line.strip()]
 
@@ -84,16 +271,98 @@ class AFND:
                     # Adiciona o conjunto de estados de destino à transição
                     afnd.transicoes[origin][symbol].update(dest_states)
                 except ValueError:
-                    print(f"Aviso: Linha de transição mal formatada ignorada: '{line}'")
+                    logger.warning("Linha de transição mal formatada ignorada: %r", line)
         
-        print(f"✔ AFND carregado com sucesso de '{filepath}'")
+        logger.info("AFND carregado de %r", filepath)
         return afnd
 
+    def fechos_epsilon(self) -> dict[str, frozenset[str]]:
+        """
+        Devolve o épsilon-fecho de cada estado, calculado uma única vez.
+
+        O grafo das transições épsilon é condensado nas suas componentes
+        fortemente conexas (algoritmo de Tarjan, iterativo). Como o Tarjan
+        emite cada componente depois de todas as que ela alcança, o fecho de
+        uma componente é a união dos seus estados com os fechos já calculados
+        das sucessoras. Estados da mesma componente partilham o mesmo frozenset.
+        O índice é recalculado quando o AFND é modificado.
+        """
+        if self._versao_fechos == self._versao.valor:
+            return self._fechos
+
+        sucessores = {}
+        for origem, transicao in self.transicoes.items():
+            destinos = transicao.get(self.EPSILON)
+            if destinos:
+                sucessores[origem] = tuple(destinos)
+
+        fechos = {}
+        indice = {}
+        minimo = {}
+        pilha_componente = []
+        na_pilha = set()
+        contador = 0
+
+        for raiz in sucessores:
+            if raiz in indice:
+                continue
+            # Cada quadro é (estado, iterador dos sucessores ainda por visitar).
+            quadros = [(raiz, iter(sucessores.get(raiz, ())))]
+            indice[raiz] = minimo[raiz] = contador
+            contador += 1
+            pilha_componente.append(raiz)
+            na_pilha.add(raiz)
+
+            while quadros:
+                estado, pendentes = quadros[-1]
+                avancou = False
+                for destino in pendentes:
+                    if destino not in indice:
+                        indice[destino] = minimo[destino] = contador
+                        contador += 1
+                        pilha_componente.append(destino)
+                        na_pilha.add(destino)
+                        quadros.append((destino, iter(sucessores.get(destino, ()))))
+                        avancou = True
+                        break
+                    if destino in na_pilha:
+                        minimo[estado] = min(minimo[estado], indice[destino])
+                if avancou:
+                    continue
+
+                quadros.pop()
+                if quadros:
+                    pai = quadros[-1][0]
+                    minimo[pai] = min(minimo[pai], minimo[estado])
+
+                if minimo[estado] == indice[estado]:
+                    componente = []
+                    while True:
+                        membro = pilha_componente.pop()
+                        na_pilha.discard(membro)
+                        componente.append(membro)
+                        if membro == estado:
+                            break
+                    fecho = set(componente)
+                    for membro in componente:
+                        for destino in sucessores.get(membro, ()):
+                            if destino not in fecho:
+                                fecho.update(fechos[destino])
+                    fecho = frozenset(fecho)
+                    for membro in componente:
+                        fechos[membro] = fecho
+
+        self._fechos = fechos
+        self._versao_fechos = self._versao.valor
+        return fechos
+
     def e_fecho(self, estados: set[str] | str) -> set[str]:
         """
         Calcula o épsilon-fecho para um estado ou um conjunto de estados.
         O épsilon-fecho de um conjunto de estados S é o conjunto de todos os estados
         alcançáveis a partir de qualquer estado em S, seguindo apenas transições épsilon (ε).
+
+        O resultado é a união dos fechos pré-calculados por `fechos_epsilon`.
         """
         # Garante que a entrada seja um conjunto de estados
         if isinstance(estados, str):
@@ -103,50 +372,164 @@ class AFND:
         else:
             raise TypeError("A entrada para e_fecho deve ser um estado (str) ou um conjunto de estados.")
 
-        fecho = set(estados_set)
-        pilha = list(estados_set) # Pilha para processar os estados
+        fechos = self.fechos_epsilon()
+        fecho = set()
+        for estado in estados_set:
+            # Estados sem transições épsilon são o seu próprio fecho.
+            fecho.update(fechos.get(estado, (estado,)))
 
-        while pilha:
-            estado_atual = pilha.pop()
-            # Obtém os estados alcançáveis via transição épsilon
-            destinos_epsilon = self.transicoes.get(estado_atual, {}).get(self.EPSILON, set())
-            
-            for destino in destinos_epsilon:
-                if destino not in fecho:
-                    fecho.add(destino)
-                    pilha.append(destino)
-        
         return fecho
 
+    def e_fecho_instrumentado(self, estados: set[str] | str) -> set[str]:
+        """Variante de `e_fecho` ativada por `instrumentar()` (ver `automatos.instrumentacao`)."""
+        instrumentacao = self.instrumentacao
+        instrumentacao.contadores['fechos'] += 1
+        if self._versao_fechos != self._versao.valor:
+            with instrumentacao.fase('indice_fechos'):
+                self.fechos_epsilon()
+        with instrumentacao.fase('e_fecho'):
+            return AFND.e_fecho(self, estados)
+
+    def _mover(self, estados_atuais, simbolo: str) -> set[str]:
+        """Conjunto de estados alcançados a partir de `estados_atuais` lendo `simbolo` (com e-fecho)."""
+        proximos_estados = set()
+        # Para cada estado ativo atual, encontra os próximos estados com base no símbolo.
+        for estado in estados_atuais:
+            proximos_estados.update(self.transicoes.get(estado, {}).get(simbolo, set()))
+
+        # O novo conjunto de estados ativos é o épsilon-fecho dos estados alcançados.
+        return self.e_fecho(proximos_estados)
+
+    def _simular_conjuntos(self, estados_atuais, simbolos) -> set[str]:
+        """Simulação direta com conjuntos de estados, sem cache."""
+        for simbolo in simbolos:
+            estados_atuais = self._mover(estados_atuais, simbolo)
+        return estados_atuais
+
+    def cache_determinizacao(self) -> CacheDeterminizacao:
+        """Devolve o cache de determinização, descartando-o se o AFND foi modificado."""
+        if self._versao_cache != self._versao.valor:
+            self._cache = CacheDeterminizacao(self.LIMITE_CACHE)
+            self._versao_cache = self._versao.valor
+        return self._cache
+
+    def compilar(self) -> AFNDCompilado:
+        """Devolve a forma compacta do AFND, reconstruindo-a apenas se ele foi modificado."""
+        if self._versao_compilada != self._versao.valor:
+            self._compilado = AFNDCompilado.de_afnd(self)
+            self._versao_compilada = self._versao.valor
+        return self._compilado
+
+    def compactar(self):
+        """Devolve a representação compacta do AFND (ver `automatos.compacto`)."""
+        from .compacto import AFNDCompacto
+        return AFNDCompacto.de_afnd(self)
+
+    def aceita_lote(self, cadeias, workers: int | None = None, chunksize: int | None = None) -> list[bool]:
+        """
+        Verifica uma lista de cadeias e devolve os resultados pela mesma ordem.
+        Lotes grandes são divididos por um conjunto de processos que recebem a
+        forma compacta do AFND uma única vez; lotes pequenos correm no próprio processo.
+        """
+        return aceita_lote(self.compilar(), cadeias, workers, chunksize)
+
     def aceita(self, cadeia: str) -> bool:
         """
         Simula a execução do AFND para determinar se a cadeia de entrada é aceite.
+
+        A simulação determiniza o AFND de forma preguiçosa: os conjuntos de
+        estados ativos e as transições entre eles ficam no cache e são
+        reaproveitados nas chamadas seguintes. Se o cache encher, é esvaziado;
+        se isso se repetir demasiadas vezes na mesma chamada, o resto da cadeia
+        é processado com a simulação direta por conjuntos.
         """
+        cache = self.cache_determinizacao()
         # Começa com o épsilon-fecho do estado inicial.
-        estados_atuais = self.e_fecho({self.estado_inicial})
+        atual = cache.registrar(frozenset(self.e_fecho({self.estado_inicial})), self.estados_finais)
+        reinicios = 0
 
-        # Processa cada símbolo da cadeia de entrada.
-        for simbolo in cadeia:
-            proximos_estados = set()
-            # Para cada estado ativo atual, encontra os próximos estados com base no símbolo.
-            for estado in estados_atuais:
-                proximos_estados.update(self.transicoes.get(estado, {}).get(simbolo, set()))
-            
-            # O novo conjunto de estados ativos é o épsilon-fecho dos estados alcançados.
-            estados_atuais = self.e_fecho(proximos_estados)
+        simbolos = iter(cadeia)
+        for simbolo in simbolos:
+            proximo = cache.transicoes[atual].get(simbolo)
+            if proximo is None:
+                conjunto = frozenset(self._mover(cache.conjuntos[atual], simbolo))
+                proximo = cache.ids.get(conjunto)
+                if proximo is None:
+                    if cache.cheio():
+                        if reinicios >= self.MAX_REINICIOS_CACHE:
+                            estados_atuais = self._simular_conjuntos(conjunto, simbolos)
+                            return not estados_atuais.isdisjoint(self.estados_finais)
+                        # Esvazia o cache; o id atual deixa de existir.
+                        cache.limpar()
+                        reinicios += 1
+                        atual = None
+                    proximo = cache.registrar(conjunto, self.estados_finais)
+                if atual is not None:
+                    cache.transicoes[atual][simbolo] = proximo
+            atual = proximo
 
-        # Após processar toda a cadeia, a cadeia é aceite se qualquer um dos
-        # estados ativos atuais for um estado final.
-        # A função `isdisjoint` retorna True se os dois conjuntos não tiverem elementos em comum.
-        return not estados_atuais.isdisjoint(self.estados_finais)
+        # A cadeia é aceite se o conjunto final contém algum estado final.
+        return cache.finais[atual]
 
+    def aceita_instrumentado(self, cadeia: str) -> bool:
+        """
+        Variante de `aceita` ativada por `instrumentar()`: separa os passos
+        resolvidos pelo cache de determinização dos que calculam um conjunto
+        novo (fase 'determinizar', que inclui os e_fecho).
+        """
+        instrumentacao = self.instrumentacao
+        contadores = instrumentacao.contadores
+        rastreio = instrumentacao.rastreio
+        cache = self.cache_determinizacao()
+        atual = cache.registrar(frozenset(self.e_fecho({self.estado_inicial})), self.estados_finais)
+        reinicios = 0
 
-class AFNDBuscaPadrao(AFND):
+        with instrumentacao.fase('simular'):
+            simbolos = enumerate(cadeia)
+            for posicao, simbolo in simbolos:
+                contadores['transicoes'] += 1
+                proximo = cache.transicoes[atual].get(simbolo)
+                if proximo is None:
+                    contadores['cache_falhas'] += 1
+                    with instrumentacao.fase('determinizar'):
+                        conjunto = frozenset(self._mover(cache.conjuntos[atual], simbolo))
+                    proximo = cache.ids.get(conjunto)
+                    if proximo is None:
+                        if cache.cheio():
+                            if reinicios >= self.MAX_REINICIOS_CACHE:
+                                contadores['cache_esgotado'] += 1
+                                estados_atuais = conjunto
+                                instrumentacao.ativos(len(estados_atuais))
+                                for posicao, simbolo in simbolos:
+                                    contadores['transicoes'] += 1
+                                    estados_atuais = self._mover(estados_atuais, simbolo)
+                                    instrumentacao.ativos(len(estados_atuais))
+                                    if rastreio is not None:
+                                        rastreio(posicao, simbolo, estados_atuais)
+                                return not estados_atuais.isdisjoint(self.estados_finais)
+                            cache.limpar()
+                            reinicios += 1
+                            atual = None
+                        proximo = cache.registrar(conjunto, self.estados_finais)
+                    if atual is not None:
+                        cache.transicoes[atual][simbolo] = proximo
+                else:
+                    contadores['cache_acertos'] += 1
+                atual = proximo
+                instrumentacao.ativos(len(cache.conjuntos[atual]))
+                if rastreio is not None:
+                    rastreio(posicao, simbolo, cache.conjuntos[atual])
+
+        return cache.finais[atual]
+
+
+class AFNDBuscaPadrao(BuscaEmFluxo, AFND):
     """
     Classe especializada que É um AFND para busca de padrões.
     Esta classe herda de AFND e se autoconfigura no construtor para
     reconhecer qualquer texto que contenha o padrão especificado.
     """
+    METODOS_INSTRUMENTADOS = ('aceita', 'e_fecho', '_varrer_bitparalelo', '_varrer_conjuntos')
 
     def __init__(self, padrao: str):
         if not padrao:
@@ -175,7 +558,7 @@ class AFNDBuscaPadrao(AFND):
               iniciando uma possível correspondência.
         """
         tamanho = len(padrao)
-        print(f"Construindo AFND para o padrão '{padrao}'...")
+        logger.debug("Construindo AFND para o padrão %r", padrao)
 
         # Configura os atributos herdados de AFND
         self.estados = {str(i) for i in range(tamanho + 1)}
@@ -197,18 +580,91 @@ class AFNDBuscaPadrao(AFND):
         # A transição para 1 já foi adicionada no primeiro loop, então o conjunto
         # de transições para d(0, padrao[0]) será {0, 1}.
 
-        print("✔ AFND de busca de padrão construído.")
+        # 3. Máscaras do Shift-And: o bit i de mascaras[c] indica padrao[i] == c.
+        # O bit i do conjunto de estados ativos corresponde ao estado i + 1.
+        self._mascaras = dict.fromkeys(self.alfabeto, 0)
+        for i, char in enumerate(padrao):
+            self._mascaras[char] |= 1 << i
+        self._versao_mascaras = self._versao.valor
 
-    def buscar(self, texto: str) -> list[int]:
+        logger.debug("AFND de busca de padrão construído")
+
+    def bitparalelo_disponivel(self) -> bool:
+        """As máscaras só descrevem o AFND enquanto ele não for modificado."""
+        return (self._versao_mascaras == self._versao.valor
+                and self._mascaras.keys() == self.alfabeto)
+
+    def buscar(self, texto: str, bitparalelo: bool = True) -> list[int]:
         """
         Executa a busca por todas as ocorrências do padrão no texto, simulando o AFND.
+
+        Por omissão usa a simulação bit-paralela (Shift-And), em que o conjunto
+        de estados ativos é um inteiro. Se o AFND tiver sido modificado após a
+        construção, ou com `bitparalelo=False`, simula com conjuntos de estados.
         """
+        if bitparalelo and self.bitparalelo_disponivel():
+            return self._varrer_bitparalelo(texto, 0, 0)[1]
+        return self._varrer_conjuntos(texto, self.e_fecho({self.estado_inicial}), 0)[1]
+
+    def _estado_varredura_inicial(self):
+        """Estado inicial da varredura: um inteiro no modo bit-paralelo, um conjunto no outro."""
+        if self.bitparalelo_disponivel():
+            return 0
+        return self.e_fecho({self.estado_inicial})
+
+    def _varrer(self, texto: str, estado, base: int):
+        """Processa `texto` a partir de `estado`; `base` é a posição absoluta de texto[0]."""
+        if isinstance(estado, int):
+            return self._varrer_bitparalelo(texto, estado, base)
+        return self._varrer_conjuntos(texto, estado, base)
+
+    def _sincronizar(self, texto: str):
+        """
+        No modo bit-paralelo o bit i só depende dos últimos i + 1 caracteres,
+        por isso após `tamanho_padrao` caracteres o estado já não depende do
+        ponto de partida. Com conjuntos de estados não há garantia: devolve None.
+        """
+        if not self.bitparalelo_disponivel() or len(texto) < self.tamanho_padrao:
+            return None
+        p = self.tamanho_padrao
+        return p, self._contar(texto[:p], 0)[0]
+
+    def _contar(self, texto: str, estado):
+        if not isinstance(estado, int):
+            estado, indices_encontrados = self._varrer_conjuntos(texto, estado, 0)
+            return estado, len(indices_encontrados)
+
+        bit_final = 1 << (self.tamanho_padrao - 1)
+        quantidade = 0
+        for mascara in map(self._mascaras.get, texto, repeat(0)):
+            estado = ((estado << 1) | 1) & mascara
+            if estado & bit_final:
+                quantidade += 1
+        return estado, quantidade
+
+    def _varrer_bitparalelo(self, texto: str, ativos: int, base: int) -> tuple[int, list[int]]:
+        """
+        Shift-And: um deslocamento, um OR e um AND por caractere. O estado 0
+        está sempre ativo, por isso entra como o bit 1 acrescentado após o
+        deslocamento. Um símbolo fora do alfabeto tem máscara 0, o que equivale
+        a voltar ao estado inicial.
+        """
+        indices_encontrados = []
+        bit_final = 1 << (self.tamanho_padrao - 1)
+        deslocamento = self.tamanho_padrao - 1 - base
+
+        for i, mascara in enumerate(map(self._mascaras.get, texto, repeat(0))):
+            ativos = ((ativos << 1) | 1) & mascara
+            if ativos & bit_final:
+                indices_encontrados.append(i - deslocamento)
+
+        return ativos, indices_encontrados
+
+    def _varrer_conjuntos(self, texto: str, estados_atuais: set[str], base: int) -> tuple[set[str], list[int]]:
+        """Simulação direta do AFND com conjuntos de estados ativos."""
         indices_encontrados = []
-        # Começamos com o conjunto de estados ativos sendo o e-fecho do estado inicial.
-        # Como este AFND não usa transições épsilon, é apenas o próprio estado inicial.
-        estados_atuais = self.e_fecho({self.estado_inicial})
 
-        for i, simbolo in enumerate(texto):
+        for i, simbolo in enumerate(texto, base):
             # Se o símbolo não pertence ao alfabeto do padrão, ele não pode fazer parte
             # de uma correspondência. Resetamos para o estado inicial.
             if simbolo not in self.alfabeto:
@@ -230,4 +686,78 @@ class AFNDBuscaPadrao(AFND):
                 indice_inicial = i - self.tamanho_padrao + 1
                 indices_encontrados.append(indice_inicial)
 
-        return indices_encontrados
\ No newline at end of file
+        return estados_atuais, indices_encontrados
+
+    def _varrer_bitparalelo_instrumentado(self, texto: str, ativos: int, base: int) -> tuple[int, list[int]]:
+        """Variante de `_varrer_bitparalelo` ativada por `instrumentar()` (ver `automatos.instrumentacao`)."""
+        instrumentacao = self.instrumentacao
+        rastreio = instrumentacao.rastreio
+        mascaras = self._mascaras
+        indices_encontrados = []
+        bit_final = 1 << (self.tamanho_padrao - 1)
+        deslocamento = self.tamanho_padrao - 1 - base
+        ausentes = 0
+        total_ativos = 0
+        max_ativos = 0
+
+        with instrumentacao.fase('varrer'):
+            for i, simbolo in enumerate(texto):
+                mascara = mascaras.get(simbolo)
+                if mascara is None:
+                    ausentes += 1
+                    mascara = 0
+                ativos = ((ativos << 1) | 1) & mascara
+                if ativos & bit_final:
+                    indices_encontrados.append(i - deslocamento)
+                # O estado 0 está sempre ativo e não tem bit.
+                quantidade = bin(ativos).count('1') + 1
+                total_ativos += quantidade
+                if quantidade > max_ativos:
+                    max_ativos = quantidade
+                if rastreio is not None:
+                    rastreio(base + i, simbolo, ativos)
+
+        contadores = instrumentacao.contadores
+        contadores['transicoes'] += len(texto)
+        contadores['ausentes'] += ausentes
+        contadores['ocorrencias'] += len(indices_encontrados)
+        if texto:
+            instrumentacao.ativos(max_ativos)
+            contadores['ativos_total'] += total_ativos - max_ativos
+        return ativos, indices_encontrados
+
+    def _varrer_conjuntos_instrumentado(self, texto: str, estados_atuais: set[str], base: int) -> tuple[set[str], list[int]]:
+        """
+        Variante de `_varrer_conjuntos` ativada por `instrumentar()`: o tempo
+        das uniões de destinos fica na fase 'uniao' e o dos fechos em 'e_fecho'.
+        """
+        instrumentacao = self.instrumentacao
+        contadores = instrumentacao.contadores
+        rastreio = instrumentacao.rastreio
+        indices_encontrados = []
+        tempos = instrumentacao.tempos
+        relogio = time.perf_counter
+
+        with instrumentacao.fase('varrer'):
+            for i, simbolo in enumerate(texto, base):
+                contadores['transicoes'] += 1
+                if simbolo not in self.alfabeto:
+                    contadores['ausentes'] += 1
+                    estados_atuais = self.e_fecho({self.estado_inicial})
+                else:
+                    inicio = relogio()
+                    proximos_estados = set()
+                    for estado in estados_atuais:
+                        proximos_estados.update(self.transicoes.get(estado, {}).get(simbolo, set()))
+                    tempos['uniao'] += relogio() - inicio
+
+                    estados_atuais = self.e_fecho(proximos_estados)
+
+                    if not self.estados_finais.isdisjoint(estados_atuais):
+                        indices_encontrados.append(i - self.tamanho_padrao + 1)
+                instrumentacao.ativos(len(estados_atuais))
+                if rastreio is not None:
+                    rastreio(i, simbolo, estados_atuais)
+
+        contadores['ocorrencias'] += len(indices_encontrados)
+        return estados_atuais, indices_encontrados
@@ -1,9 +1,143 @@
+from __future__ import annotations
+from collections import deque
+import math
+
+from ._versionado import Versao, DictVersionado, SetVersionado, conjunto_versionado
+
+
+class OrcamentoEsgotado(RuntimeError):
+    """A simulação do AP excedeu o número máximo de configurações a explorar."""
+
+
+class _LimitesPilha:
+    """
+    Limites inferiores do número de símbolos que falta ler para o AP aceitar,
+    a partir de um estado e de uma pilha.
+
+    Para cada símbolo X da pilha e estados q, p calcula-se por ponto fixo:
+        desempilhar[X][q][p]  o mínimo lido para ir de q, com X no topo, até p
+                              com X já desempilhado, sem tocar no que está por baixo;
+        aceitar[X][q]         o mínimo lido para chegar a um estado final a partir
+                              de q com X no topo, sem expor o que está por baixo;
+        vazia[q]              o mesmo a partir de q com a pilha vazia.
+    O limite da pilha X·resto, para cada estado q, é então
+        min(aceitar[X][q], min_p desempilhar[X][q][p] + limite(resto)[p]),
+    calculado uma só vez por pilha (ver `acrescentar`, memorizado por símbolo e
+    limite do resto, que se repetem muito). Símbolos que só saem
+    da pilha lendo entrada (como os terminais e as variáveis não anuláveis de
+    uma gramática convertida) contam pelo menos 1 cada.
+    """
+
+    def __init__(self, indice: dict, inicial, finais, epsilon: str):
+        estados = {inicial}
+        simbolos = set()
+        transicoes = []
+        for (origem, topo), movimentos in indice.items():
+            estados.add(origem)
+            if topo != epsilon:
+                simbolos.add(topo)
+            for simbolo, proximo, empilhar in movimentos:
+                estados.add(proximo)
+                simbolos.update(empilhar)
+                # Os símbolos empilhados ficam pela ordem em que serão desempilhados.
+                transicoes.append((origem, None if topo == epsilon else topo,
+                                   0 if simbolo == epsilon else 1, proximo, empilhar[::-1]))
+
+        self.estados = list(estados)
+        self.posicao = {estado: i for i, estado in enumerate(self.estados)}
+        k = len(self.estados)
+        final = [0 if estado in finais else math.inf for estado in self.estados]
+        self.final = final
+        self._acrescentados = {}
+        self.vazia = list(final)
+        self.aceitar = {simbolo: list(final) for simbolo in simbolos}
+        self.desempilhar = {simbolo: [[math.inf] * k for _ in range(k)] for simbolo in simbolos}
+        transicoes = [(self.posicao[origem], topo, custo, self.posicao[proximo], empilhados)
+                      for origem, topo, custo, proximo, empilhados in transicoes]
+
+        mudou = True
+        while mudou:
+            mudou = False
+            for origem, topo, custo, proximo, empilhados in transicoes:
+                percurso, dentro = self._sequencia(proximo, empilhados)
+                if topo is not None:
+                    # Desempilha X = topo e deixa `empilhados` no seu lugar.
+                    mudou |= self._baixar(self.aceitar[topo], origem, custo + min(dentro, self._seguir(percurso, final)))
+                    linha = self.desempilhar[topo][origem]
+                    for destino in range(k):
+                        mudou |= self._baixar(linha, destino, custo + percurso[destino])
+                    continue
+                # Não desempilha: aplica-se por cima de qualquer topo, e também à pilha vazia.
+                mudou |= self._baixar(self.vazia, origem, custo + min(dentro, self._seguir(percurso, self.vazia)))
+                for simbolo in simbolos:
+                    mudou |= self._baixar(self.aceitar[simbolo], origem,
+                                          custo + min(dentro, self._seguir(percurso, self.aceitar[simbolo])))
+                    tabela = self.desempilhar[simbolo]
+                    linha = tabela[origem]
+                    for destino in range(k):
+                        melhor = min(percurso[p] + tabela[p][destino] for p in range(k))
+                        mudou |= self._baixar(linha, destino, custo + melhor)
+        self.vazia = tuple(self.vazia)
+
+    @staticmethod
+    def _baixar(vetor: list, i: int, valor) -> bool:
+        if valor < vetor[i]:
+            vetor[i] = valor
+            return True
+        return False
+
+    @staticmethod
+    def _seguir(percurso: list, vetor: list):
+        return min(custo + valor for custo, valor in zip(percurso, vetor))
+
+    def _sequencia(self, origem: int, simbolos: tuple):
+        """
+        Para a sequência `simbolos` (o topo primeiro) a partir de `origem`, devolve
+        o custo de desempilhá-la toda, por estado de chegada, e o custo mínimo de
+        aceitar antes de a desempilhar toda.
+        """
+        percurso = [math.inf] * len(self.estados)
+        percurso[origem] = 0
+        dentro = math.inf
+        for simbolo in simbolos:
+            dentro = min(dentro, self._seguir(percurso, self.aceitar[simbolo]))
+            tabela = self.desempilhar[simbolo]
+            percurso = [min(percurso[p] + tabela[p][destino] for p in range(len(percurso)))
+                        for destino in range(len(percurso))]
+        return percurso, dentro
+
+    def acrescentar(self, simbolo, limite_resto: tuple) -> tuple:
+        """Limite, por estado, da pilha com `simbolo` no topo de uma pilha de limite `limite_resto`."""
+        chave = (simbolo, limite_resto)
+        limite = self._acrescentados.get(chave)
+        if limite is None:
+            aceitar = self.aceitar[simbolo]
+            tabela = self.desempilhar[simbolo]
+            limite = tuple(min(aceitar[q], self._seguir(tabela[q], limite_resto)) for q in range(len(aceitar)))
+            limite = self._acrescentados.setdefault(chave, limite)
+        return limite
+
+
 class AP:
     """
     Representa um Autômato com Pilha.
+
+    `d` associa (estado, símbolo lido, topo da pilha) a um conjunto de pares
+    (próximo estado, cadeia empilhada). 'ε' como símbolo lido ou como topo
+    indica que nada é lido ou desempilhado; a cadeia empilhada pode ter vários
+    símbolos de `G`, e o primeiro fica no topo (ex.: 'S$' deixa S no topo).
     """
+    EPSILON = 'ε'
+    # Número máximo de configurações exploradas por `aceita`, por omissão.
+    LIMITE_PASSOS = 1_000_000
 
     def __init__(self, Q=None, E=None, G=None, d=None, q0=None, F=None):
+        # Contador de modificações: o índice de transições é reconstruído quando muda.
+        self._versao = Versao()
+        self._indice = None
+        self._versao_indice = -1
+        self._limites = None
+        self._chave_limites = None
         self.Q = Q or set()
         self.E = E or set()
         self.G = G or set()
@@ -11,6 +145,24 @@ class AP:
         self.q0 = q0
         self.F = F or set()
 
+    @property
+    def G(self):
+        return self._G
+
+    @G.setter
+    def G(self, valor):
+        self._G = SetVersionado(self._versao, valor)
+        self._versao.valor += 1
+
+    @property
+    def d(self):
+        return self._d
+
+    @d.setter
+    def d(self, valor):
+        self._d = DictVersionado(self._versao, conjunto_versionado, valor)
+        self._versao.valor += 1
+
     def __str__(self):
         """Retorna uma representação em string do autômato com pilha."""
         transicoes_str = ""
@@ -23,7 +175,157 @@ class AP:
         return (f"AP = (Q, Σ, Γ, δ, q0, F)\n\n"
                 f"Q = {self.Q}\n"
                 f"Σ = {self.E}\n"
-                f"Γ = {self.G}\n"
+                f"Γ = {set(self.G)}\n"
                 f"q0 = {self.q0}\n"
                 f"F = {self.F}\n\n"
-                f"δ (Função de Transição):\n{transicoes_str}")
\ No newline at end of file
+                f"δ (Função de Transição):\n{transicoes_str}")
+
+    def _separar_pilha(self, cadeia: str) -> tuple:
+        """
+        Divide uma cadeia a empilhar nos símbolos de `G` (o maior símbolo que
+        encaixa em cada posição) e devolve-os com o topo no fim do tuplo.
+        """
+        if cadeia == self.EPSILON or not cadeia:
+            return ()
+        if cadeia in self.G:
+            return (cadeia,)
+        tamanhos = sorted({len(s) for s in self.G}, reverse=True)
+        simbolos = []
+        i = 0
+        while i < len(cadeia):
+            for tamanho in tamanhos:
+                if cadeia[i:i + tamanho] in self.G:
+                    break
+            else:
+                tamanho = 1
+            if cadeia[i:i + tamanho] != self.EPSILON:
+                simbolos.append(cadeia[i:i + tamanho])
+            i += tamanho
+        simbolos.reverse()
+        return tuple(simbolos)
+
+    def indice(self) -> dict:
+        """
+        Índice (estado, topo) -> lista de (símbolo lido, próximo estado, símbolos
+        empilhados), reconstruído apenas se o AP foi modificado. As transições
+        que não desempilham ficam sob o topo 'ε'.
+        """
+        if self._versao_indice != self._versao.valor:
+            indice = {}
+            for (estado, simbolo, topo), destinos in self.d.items():
+                movimentos = indice.setdefault((estado, topo), [])
+                for proximo, empilhar in destinos:
+                    movimentos.append((simbolo, proximo, self._separar_pilha(empilhar)))
+            self._indice = indice
+            self._versao_indice = self._versao.valor
+        return self._indice
+
+    def _limites_pilha(self) -> _LimitesPilha:
+        """Limites de `_LimitesPilha`, recalculados se o AP, q0 ou F mudarem."""
+        chave = (self._versao.valor, self.q0, frozenset(self.F))
+        if self._chave_limites != chave:
+            self._limites = _LimitesPilha(self.indice(), self.q0, self.F, self.EPSILON)
+            self._chave_limites = chave
+        return self._limites
+
+    def aceita(self, cadeia, profundidade_maxima: int | None = None, limite_passos: int | None = None) -> bool:
+        """
+        Verifica se o AP aceita a cadeia (por estado final, depois de ler toda a entrada).
+
+        As configurações (estado, posição, pilha) são exploradas em largura e
+        cada uma é visitada no máximo uma vez. As pilhas são internadas como
+        listas ligadas (topo, pilha de baixo), por isso as configurações
+        partilham as partes comuns e cada passo custa O(1).
+
+        Uma configuração é descartada quando o mínimo que ainda teria de ler
+        para aceitar (ver `_LimitesPilha`) excede a entrada que falta. Isto
+        torna finita a busca em APs com ciclos de transições ε que empilham,
+        como os de gramáticas recursivas à esquerda, desde que os símbolos
+        empilhados nesses ciclos não possam sair sem ler entrada. Nos
+        restantes casos, se forem exploradas mais de `limite_passos`
+        configurações sem decisão, é lançado `OrcamentoEsgotado`.
+
+        `profundidade_maxima`, se indicado, descarta as pilhas mais altas do
+        que esse valor. Se alguma configuração foi descartada e a cadeia não
+        foi aceite, a resposta não é conclusiva e também é lançado
+        `OrcamentoEsgotado`, em vez de devolver False.
+        """
+        entrada = list(cadeia)
+        n = len(entrada)
+        if limite_passos is None:
+            limite_passos = self.LIMITE_PASSOS
+        indice = self.indice()
+        epsilon = self.EPSILON
+        finais = self.F
+        limites = self._limites_pilha()
+        posicao_estado = limites.posicao
+
+        # Pilhas internadas: o nó 0 é a pilha vazia e o nó i > 0 é (topo, nó de baixo).
+        nos = [None]
+        internados = {}
+        alturas = [0]
+        minimos = [limites.vazia]
+
+        def localizar(no: int, simbolos: tuple) -> tuple[int, tuple]:
+            """Sobe a partir de `no` pelos nós já internados; devolve o último e os símbolos em falta."""
+            for i, simbolo in enumerate(simbolos):
+                acima = internados.get((simbolo, no))
+                if acima is None:
+                    return no, simbolos[i:]
+                no = acima
+            return no, ()
+
+        def internar(no: int, simbolos: tuple) -> int:
+            for simbolo in simbolos:
+                chave = (simbolo, no)
+                internados[chave] = len(nos)
+                nos.append(chave)
+                alturas.append(alturas[no] + 1)
+                minimos.append(limites.acrescentar(simbolo, minimos[no]))
+                no = len(nos) - 1
+            return no
+
+        if limites.vazia[posicao_estado[self.q0]] > n:
+            return False
+        inicial = (self.q0, 0, 0)
+        descartadas = False
+        visitadas = {inicial}
+        fila = deque([inicial])
+        while fila:
+            estado, posicao, pilha = fila.popleft()
+            if posicao == n and estado in finais:
+                return True
+            if len(visitadas) > limite_passos:
+                raise OrcamentoEsgotado(f"Mais de {limite_passos} configurações exploradas.")
+
+            proximo_simbolo = entrada[posicao] if posicao < n else None
+            candidatos = [(movimento, pilha) for movimento in indice.get((estado, epsilon), ())]
+            if pilha:
+                topo, restante = nos[pilha]
+                candidatos.extend((movimento, restante) for movimento in indice.get((estado, topo), ()))
+            for (simbolo, proximo, empilhar), base in candidatos:
+                if simbolo == epsilon:
+                    nova_posicao = posicao
+                elif simbolo == proximo_simbolo:
+                    nova_posicao = posicao + 1
+                else:
+                    continue
+                # O limite é verificado antes de internar a pilha nova.
+                nova_pilha, em_falta = localizar(base, empilhar)
+                limite = minimos[nova_pilha]
+                for simbolo_pilha in em_falta:
+                    limite = limites.acrescentar(simbolo_pilha, limite)
+                if limite[posicao_estado[proximo]] > n - nova_posicao:
+                    continue
+                if profundidade_maxima is not None and alturas[nova_pilha] + len(em_falta) > profundidade_maxima:
+                    descartadas = True
+                    continue
+                nova_pilha = internar(nova_pilha, em_falta)
+                configuracao = (proximo, nova_posicao, nova_pilha)
+                if configuracao not in visitadas:
+                    visitadas.add(configuracao)
+                    fila.append(configuracao)
+        if descartadas:
+            raise OrcamentoEsgotado(f"Configurações com pilha acima de {profundidade_maxima} descartadas "
+                                    f"sem aceitar a cadeia.")
+        return False
@@ -0,0 +1,87 @@
+"""
+Busca de padrões sobre fluxos assíncronos (asyncio).
+
+`buscar_async` consome um `asyncio.StreamReader` ou qualquer iterador
+assíncrono de blocos (`bytes` ou `str`) e gera as ocorrências à medida que os
+blocos chegam. O estado do autómato é guardado entre um `await` e o seguinte,
+como em `BuscaEmFluxo.buscar_stream`, por isso as ocorrências que atravessam
+a fronteira entre blocos são encontradas. Os blocos com pelo menos
+`LIMITE_EXECUTOR` caracteres são varridos num executor, para que o ciclo de
+eventos continue a atender as outras tarefas durante a varredura.
+"""
+from __future__ import annotations
+import asyncio
+import codecs
+
+
+# Blocos a partir deste tamanho (em caracteres) são varridos fora do ciclo de eventos.
+LIMITE_EXECUTOR = 1 << 16
+
+
+async def ler_blocos_async(fonte, tamanho_bloco: int, encoding: str = 'utf-8'):
+    """
+    Gera a entrada em blocos de texto (`str`). `fonte` é um `asyncio.StreamReader`
+    (lido com `read(tamanho_bloco)`) ou um iterador assíncrono de blocos. Os
+    bytes são descodificados de forma incremental, como em `ler_blocos`.
+    """
+    if tamanho_bloco <= 0:
+        raise ValueError("O tamanho do bloco deve ser positivo.")
+
+    if isinstance(fonte, asyncio.StreamReader):
+        async def blocos():
+            while True:
+                bloco = await fonte.read(tamanho_bloco)
+                if not bloco:
+                    return
+                yield bloco
+        blocos = blocos()
+    else:
+        blocos = fonte
+
+    decodificador = None
+    async for bloco in blocos:
+        if isinstance(bloco, str):
+            if bloco:
+                yield bloco
+            continue
+        if decodificador is None:
+            decodificador = codecs.getincrementaldecoder(encoding)()
+        texto = decodificador.decode(bloco)
+        if texto:
+            yield texto
+    if decodificador is not None:
+        resto = decodificador.decode(b'', final=True)
+        if resto:
+            yield resto
+
+
+async def _processar(funcao, bloco: str, estado, *argumentos, executor=None,
+                     limite_executor: int = LIMITE_EXECUTOR):
+    if len(bloco) >= limite_executor:
+        return await asyncio.get_running_loop().run_in_executor(executor, funcao, bloco, estado, *argumentos)
+    return funcao(bloco, estado, *argumentos)
+
+
+async def buscar_async(busca, fonte, tamanho_bloco: int, encoding: str = 'utf-8', executor=None,
+                       limite_executor: int = LIMITE_EXECUTOR):
+    """Gera as ocorrências de `busca` em `fonte` com posições absolutas (ver `BuscaEmFluxo.buscar_async`)."""
+    estado = busca._estado_varredura_inicial()
+    base = 0
+    async for bloco in ler_blocos_async(fonte, tamanho_bloco, encoding):
+        estado, encontrados = await _processar(busca._varrer, bloco, estado, base, executor=executor,
+                                               limite_executor=limite_executor)
+        base += len(bloco)
+        for ocorrencia in encontrados:
+            yield ocorrencia
+
+
+async def contar_async(busca, fonte, tamanho_bloco: int, encoding: str = 'utf-8', executor=None,
+                       limite_executor: int = LIMITE_EXECUTOR) -> int:
+    """Conta as ocorrências de `busca` em `fonte` sem guardar as posições."""
+    estado = busca._estado_varredura_inicial()
+    total = 0
+    async for bloco in ler_blocos_async(fonte, tamanho_bloco, encoding):
+        estado, quantidade = await _processar(busca._contar, bloco, estado, executor=executor,
+                                              limite_executor=limite_executor)
+        total += quantidade
+    return total
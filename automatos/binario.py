@@ -0,0 +1,360 @@
+"""
+Formato binário, versionado e mapeável em memória para AFD e AFND.
+
+Todos os inteiros são little-endian e cada secção começa alinhada a 4 bytes.
+
+    cabeçalho   '<4sHHIII': MAGICO, VERSAO, tipo, n_estados, n_simbolos, inicial
+    estados     tabela de nomes (ver `_escrever_nomes`)
+    simbolos    tabela de nomes
+    alfabeto    n_simbolos bytes: 1 se o símbolo pertence a `alfabeto`
+    declarados  n_estados bytes: 1 se o estado pertence a `estados`
+    finais      n_estados bytes: 1 se o estado é final
+
+    AFD:  explicitas  ceil(n_estados * n_simbolos / 8) bytes: bit (estado * n_simbolos
+                      + simbolo) ligado se a transição está definida em `transicoes`
+                      (as restantes levam ao estado inicial)
+          tabela      int32[n_estados * (n_simbolos + 1)] exatamente no formato de
+                      `AFDCompilado.tabela` (deslocamentos de linha; última coluna = outros)
+          n_classes   u32 (desde a versão 2)
+          classes     u32[n_simbolos]: classe de cada símbolo (0 = outros)
+          tabela_classes  int32[n_estados * n_classes], no formato de
+                      `AFDCompilado.por_classes`
+    AFND: n_arestas u32, linhas u32[n_estados + 1] (CSR), simbolo u32[n_arestas],
+          destino u32[n_arestas]
+
+Ao carregar, o ficheiro é mapeado com `mmap` (`ArquivoMapeado`) e as duas
+tabelas do AFD (`AFD.compilar` e `AFD.compilar_classes`) são usadas
+diretamente pelo simulador compilado, sem cópia. Num ficheiro da versão 1 a
+tabela por classes não existe e é calculada (copiada) no primeiro uso. O
+mapeamento dura enquanto o autómato o usar, ou até `fechar()`; enquanto
+estiver aberto, o Windows não deixa apagar nem reescrever o ficheiro.
+"""
+from __future__ import annotations
+from array import array
+import mmap
+import struct
+import sys
+
+
+MAGICO = b'AUTB'
+VERSAO = 2
+TIPO_AFD = 1
+TIPO_AFND = 2
+
+_CABECALHO = struct.Struct('<4sHHIII')
+_U32 = struct.Struct('<I')
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def eh_binario(filepath: str) -> bool:
+    """Indica se o ficheiro começa pelo número mágico do formato binário."""
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGICO)) == MAGICO
+
+
+def _alinhar(buffer: bytearray):
+    buffer.extend(b'\0' * (-len(buffer) % 4))
+
+
+def _inteiros(codigo: str, valores) -> bytes:
+    dados = array(codigo, valores)
+    if not _LITTLE_ENDIAN:
+        dados.byteswap()
+    return dados.tobytes()
+
+
+def _escrever_nomes(buffer: bytearray, nomes):
+    """Tabela de nomes: quantidade u32, tamanho u32, deslocamentos u32[quantidade + 1], bytes UTF-8."""
+    codificados = [str(nome).encode('utf-8') for nome in nomes]
+    deslocamentos = [0]
+    for nome in codificados:
+        deslocamentos.append(deslocamentos[-1] + len(nome))
+    buffer += _U32.pack(len(codificados)) + _U32.pack(deslocamentos[-1])
+    buffer += _inteiros('I', deslocamentos)
+    buffer += b''.join(codificados)
+    _alinhar(buffer)
+
+
+def _ler_nomes(visao: memoryview, posicao: int) -> tuple[list[str], int]:
+    quantidade, tamanho = struct.unpack_from('<II', visao, posicao)
+    posicao += 8
+    deslocamentos = _ler_inteiros(visao, posicao, 'I', quantidade + 1)
+    posicao += 4 * (quantidade + 1)
+    bloco = bytes(visao[posicao:posicao + tamanho])
+    nomes = [bloco[deslocamentos[i]:deslocamentos[i + 1]].decode('utf-8') for i in range(quantidade)]
+    posicao += tamanho
+    return nomes, posicao + (-posicao % 4)
+
+
+def _ler_inteiros(visao: memoryview, posicao: int, codigo: str, quantidade: int):
+    """Vista sem cópia de um vetor de inteiros (copiado apenas em máquinas big-endian)."""
+    fatia = visao[posicao:posicao + 4 * quantidade]
+    if _LITTLE_ENDIAN:
+        return fatia.cast(codigo)
+    dados = array(codigo, fatia.tobytes())
+    dados.byteswap()
+    return dados
+
+
+def _cabecalho(tipo, estados, simbolos, inicial, alfabeto, declarados, finais) -> bytearray:
+    buffer = bytearray(_CABECALHO.pack(MAGICO, VERSAO, tipo, len(estados), len(simbolos), inicial))
+    _escrever_nomes(buffer, estados)
+    _escrever_nomes(buffer, simbolos)
+    buffer += bytes(simbolo in alfabeto for simbolo in simbolos)
+    buffer += bytes(estado in declarados for estado in estados)
+    buffer += bytes(estado in finais for estado in estados)
+    _alinhar(buffer)
+    return buffer
+
+
+def salvar_afd(afd, filepath: str):
+    """Escreve o AFD no formato binário a partir da sua forma compilada."""
+    if afd.estado_inicial is None:
+        raise ValueError("Não é possível salvar um AFD sem estado inicial.")
+    compilado = afd.compilar()
+    simbolos = sorted(compilado.simbolos, key=compilado.simbolos.get)
+    buffer = _cabecalho(TIPO_AFD, compilado.estados, simbolos, compilado.inicial // compilado.largura,
+                        afd.alfabeto, afd.estados, afd.estados_finais)
+    indices = {nome: i for i, nome in enumerate(compilado.estados)}
+    explicitas = bytearray(-(-len(compilado.estados) * len(simbolos) // 8))
+    for origem, transicao in afd.transicoes.items():
+        for simbolo in transicao:
+            bit = indices[origem] * len(simbolos) + compilado.simbolos[simbolo]
+            explicitas[bit >> 3] |= 1 << (bit & 7)
+    buffer += explicitas
+    _alinhar(buffer)
+    buffer += _inteiros('i', compilado.tabela)
+    por_classes = afd.compilar_classes()
+    buffer += _U32.pack(por_classes.largura)
+    buffer += _inteiros('I', [por_classes.simbolos.get(simbolo, 0) for simbolo in simbolos])
+    buffer += _inteiros('i', por_classes.tabela)
+    with open(filepath, 'wb') as f:
+        f.write(buffer)
+
+
+def salvar_afnd(afnd, filepath: str):
+    """Escreve o AFND no formato binário, com as transições em formato CSR."""
+    if afnd.estado_inicial is None:
+        raise ValueError("Não é possível salvar um AFND sem estado inicial.")
+    indices = {afnd.estado_inicial: 0}
+    for estado in sorted(afnd.estados | set(afnd.estados_finais)):
+        indices.setdefault(estado, len(indices))
+    simbolos_vistos = set(afnd.alfabeto)
+    for origem, transicao in afnd.transicoes.items():
+        indices.setdefault(origem, len(indices))
+        for simbolo, destinos in transicao.items():
+            if destinos:
+                simbolos_vistos.add(simbolo)
+            for destino in destinos:
+                indices.setdefault(destino, len(indices))
+    simbolos = sorted(simbolos_vistos)
+    indice_simbolo = {simbolo: i for i, simbolo in enumerate(simbolos)}
+
+    linhas = [0]
+    arestas_simbolo = []
+    arestas_destino = []
+    for estado in indices:
+        for simbolo, destinos in sorted(afnd.transicoes.get(estado, {}).items()):
+            for destino in sorted(destinos):
+                arestas_simbolo.append(indice_simbolo[simbolo])
+                arestas_destino.append(indices[destino])
+        linhas.append(len(arestas_destino))
+
+    buffer = _cabecalho(TIPO_AFND, list(indices), simbolos, 0,
+                        afnd.alfabeto, afnd.estados, afnd.estados_finais)
+    buffer += _U32.pack(len(arestas_destino))
+    buffer += _inteiros('I', linhas)
+    buffer += _inteiros('I', arestas_simbolo)
+    buffer += _inteiros('I', arestas_destino)
+    with open(filepath, 'wb') as f:
+        f.write(buffer)
+
+
+class ArquivoMapeado:
+    """
+    Ficheiro binário mapeado em memória, com as vistas de inteiros tiradas
+    dele. `fechar` pede a cada dono registado (com `registar`) que copie as
+    vistas que usa, através do seu método `_desmapear`, e depois liberta as
+    vistas e o mapeamento.
+    """
+    __slots__ = ('mapa', 'visao', '_vistas', '_donos')
+
+    def __init__(self, filepath: str):
+        with open(filepath, 'rb') as f:
+            self.mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.visao = memoryview(self.mapa)
+        self._vistas = []
+        self._donos = []
+
+    def registar(self, dono):
+        self._donos.append(dono)
+
+    def inteiros(self, posicao: int, codigo: str, quantidade: int):
+        dados = _ler_inteiros(self.visao, posicao, codigo, quantidade)
+        if isinstance(dados, memoryview):
+            self._vistas.append(dados)
+        return dados
+
+    def fechar(self):
+        for dono in self._donos:
+            dono._desmapear()
+        self._donos.clear()
+        for vista in self._vistas:
+            vista.release()
+        self._vistas.clear()
+        self.visao.release()
+        self.mapa.close()
+
+
+def copiar_inteiros(dados, codigo: str) -> array:
+    """Copia um vetor (mapeado ou não) para um `array` próprio."""
+    copia = array(codigo)
+    copia.frombytes(memoryview(dados).cast('B'))
+    return copia
+
+
+def _abrir(filepath: str, tipo_esperado: int):
+    arquivo = ArquivoMapeado(filepath)
+    try:
+        return (arquivo,) + _ler_cabecalho(arquivo.visao, filepath, tipo_esperado)
+    except BaseException:
+        arquivo.fechar()
+        raise
+
+
+def _ler_cabecalho(visao: memoryview, filepath: str, tipo_esperado: int):
+    magico, versao, tipo, n_estados, n_simbolos, inicial = _CABECALHO.unpack_from(visao, 0)
+    if magico != MAGICO:
+        raise ValueError(f"'{filepath}' não está no formato binário de autómatos.")
+    if not 1 <= versao <= VERSAO:
+        raise ValueError(f"Versão {versao} do formato binário não suportada.")
+    if tipo != tipo_esperado:
+        raise ValueError(f"'{filepath}' não contém um {'AFD' if tipo_esperado == TIPO_AFD else 'AFND'}.")
+
+    posicao = _CABECALHO.size
+    estados, posicao = _ler_nomes(visao, posicao)
+    simbolos, posicao = _ler_nomes(visao, posicao)
+    no_alfabeto = bytes(visao[posicao:posicao + n_simbolos])
+    posicao += n_simbolos
+    declarados = bytes(visao[posicao:posicao + n_estados])
+    posicao += n_estados
+    finais = bytes(visao[posicao:posicao + n_estados])
+    posicao += n_estados
+    posicao += -posicao % 4
+
+    cabecalho = {
+        'versao': versao,
+        'estados': estados,
+        'simbolos': simbolos,
+        'inicial': inicial,
+        'alfabeto': {s for s, marcado in zip(simbolos, no_alfabeto) if marcado},
+        'declarados': {e for e, marcado in zip(estados, declarados) if marcado},
+        'finais': finais,
+    }
+    return visao, posicao, cabecalho
+
+
+def carregar_afd(afd, filepath: str):
+    """
+    Preenche `afd` a partir do ficheiro; as formas compiladas usam as tabelas
+    mapeadas, sem cópia, e guardam o `ArquivoMapeado` em `arquivo` (ver `AFD.fechar`).
+    """
+    from .afd import AFDCompilado
+    from .classes import ParticaoAlfabeto
+
+    arquivo, visao, posicao, cabecalho = _abrir(filepath, TIPO_AFD)
+    estados = cabecalho['estados']
+    largura = len(cabecalho['simbolos']) + 1
+    tamanho_explicitas = -(-len(estados) * (largura - 1) // 8)
+    explicitas = bytes(visao[posicao:posicao + tamanho_explicitas])
+    posicao += tamanho_explicitas + (-tamanho_explicitas % 4)
+    tabela = arquivo.inteiros(posicao, 'i', len(estados) * largura)
+    posicao += 4 * len(tabela)
+
+    simbolos = {simbolo: i for i, simbolo in enumerate(cabecalho['simbolos'])}
+    compilado = AFDCompilado(estados, simbolos, tabela, cabecalho['inicial'] * largura,
+                             _finais_por_linha(cabecalho['finais'], largura))
+    compilado.mapear(arquivo)
+
+    por_classes = None
+    if cabecalho['versao'] >= 2:
+        n_classes = _U32.unpack_from(visao, posicao)[0]
+        posicao += 4
+        classes = _ler_inteiros(visao, posicao, 'I', largura - 1).tolist()
+        posicao += 4 * len(classes)
+        classe_de = {simbolo: classe for simbolo, classe in zip(cabecalho['simbolos'], classes) if classe}
+        por_classes = AFDCompilado(estados, classe_de, arquivo.inteiros(posicao, 'i', len(estados) * n_classes),
+                                   cabecalho['inicial'] * n_classes,
+                                   _finais_por_linha(cabecalho['finais'], n_classes),
+                                   ParticaoAlfabeto(classe_de, n_classes))
+        por_classes.mapear(arquivo)
+
+    afd._usar_compilado(
+        compilado,
+        estados=cabecalho['declarados'],
+        alfabeto=cabecalho['alfabeto'],
+        estados_finais={e for e, marcado in zip(estados, cabecalho['finais']) if marcado},
+        explicitas=explicitas,
+        por_classes=por_classes,
+    )
+    return afd
+
+
+def _finais_por_linha(finais: bytes, largura: int) -> bytearray:
+    por_linha = bytearray(len(finais) * largura)
+    por_linha[::largura] = finais
+    return por_linha
+
+
+def _ler_afnd(filepath: str):
+    arquivo, visao, posicao, cabecalho = _abrir(filepath, TIPO_AFND)
+    n_arestas = _U32.unpack_from(visao, posicao)[0]
+    posicao += 4
+    linhas = arquivo.inteiros(posicao, 'I', len(cabecalho['estados']) + 1)
+    posicao += 4 * len(linhas)
+    arestas_simbolo = arquivo.inteiros(posicao, 'I', n_arestas)
+    posicao += 4 * n_arestas
+    arestas_destino = arquivo.inteiros(posicao, 'I', n_arestas)
+    return arquivo, cabecalho, linhas, arestas_simbolo, arestas_destino
+
+
+def carregar_afnd_csr(filepath: str):
+    """
+    Lê as listas de adjacência CSR do ficheiro sem as converter. Devolve
+    (estados, simbolos, alfabeto, linhas, arestas_simbolo, arestas_destino,
+    inicial, finais, arquivo), com os vetores mapeados do ficheiro, as arestas
+    de cada estado ordenadas por símbolo e o `ArquivoMapeado` que os contém.
+    """
+    arquivo, cabecalho, linhas, arestas_simbolo, arestas_destino = _ler_afnd(filepath)
+    return (cabecalho['estados'], cabecalho['simbolos'], cabecalho['alfabeto'], linhas,
+            arestas_simbolo, arestas_destino, cabecalho['inicial'], bytearray(cabecalho['finais']),
+            arquivo)
+
+
+def carregar_afnd(afnd, filepath: str):
+    """
+    Preenche `afnd` a partir das listas de adjacência CSR do ficheiro. As
+    transições são copiadas para dicionários e o ficheiro é fechado logo.
+    """
+    arquivo, cabecalho, linhas, arestas_simbolo, arestas_destino = _ler_afnd(filepath)
+    estados = cabecalho['estados']
+    simbolos = cabecalho['simbolos']
+
+    transicoes = {}
+    try:
+        for indice, origem in enumerate(estados):
+            inicio, fim = linhas[indice], linhas[indice + 1]
+            if inicio == fim:
+                continue
+            linha = transicoes[origem] = {}
+            for aresta in range(inicio, fim):
+                linha.setdefault(simbolos[arestas_simbolo[aresta]], set()).add(estados[arestas_destino[aresta]])
+    finally:
+        arquivo.fechar()
+
+    afnd.estados = cabecalho['declarados']
+    afnd.alfabeto = cabecalho['alfabeto']
+    afnd.transicoes = transicoes
+    afnd.estado_inicial = estados[cabecalho['inicial']]
+    afnd.estados_finais = {e for e, marcado in zip(estados, cabecalho['finais']) if marcado}
+    return afnd
@@ -0,0 +1,115 @@
+"""
+Compressão do alfabeto em classes de equivalência de símbolos.
+
+Dois símbolos com a mesma coluna na tabela de um AFD (o mesmo destino a
+partir de todos os estados) são indistinguíveis para o autómato, e podem
+partilhar uma única coluna. A classe 0 é sempre a dos símbolos "outros":
+todos os caracteres fora do alfabeto e os símbolos do alfabeto que se
+comportam como eles. A tabela compilada passa a ter uma coluna por classe,
+em vez de uma por símbolo.
+
+Para cadeias `str` a conversão carácter -> classe é feita em C, sem uma
+pesquisa em dicionário por carácter: `str.translate` com uma tabela indexada
+pelo ponto de código (cobre pelo menos o BMP) e depois `encode('latin-1')`,
+que transforma as classes em bytes e envia os caracteres fora da tabela para
+a classe 0. Para `bytes` (símbolos inteiros 0-255) basta `bytes.translate`.
+"""
+from __future__ import annotations
+import codecs
+from itertools import chain, repeat
+
+
+# Caracteres que a tabela de tradução não cobre vão para a classe 0 ("outros").
+_ERRO_OUTROS = 'automatos.classes.outros'
+codecs.register_error(_ERRO_OUTROS, lambda erro: ('\0' * (erro.end - erro.start), erro.end))
+
+# Tamanho mínimo da tabela de tradução de caracteres (o plano multilingue básico).
+TAMANHO_TABELA = 0x10000
+
+# Tamanho das fatias em que as cadeias longas são traduzidas.
+BLOCO = 1 << 16
+
+
+class ParticaoAlfabeto:
+    """
+    Classes de equivalência dos símbolos de um AFD compilado.
+
+    `classe_de` só contém os símbolos fora da classe 0; `n_classes` inclui a
+    classe 0. As tabelas de tradução só existem quando todas as classes cabem
+    num byte e os símbolos são caracteres (ou inteiros 0-255, para `bytes`).
+    A de caracteres (64 KiB) só é montada na primeira tradução de um `str`.
+    """
+    __slots__ = ('classe_de', 'n_classes', 'tabela_caracteres', 'tabela_bytes', '_caracteres')
+
+    def __init__(self, classe_de: dict, n_classes: int):
+        self.classe_de = classe_de
+        self.n_classes = n_classes
+        self.tabela_caracteres = None
+        self.tabela_bytes = None
+        self._caracteres = False
+        if n_classes > 256:
+            return
+
+        self._caracteres = all(isinstance(s, str) and len(s) == 1 for s in classe_de)
+        if all(isinstance(s, int) and 0 <= s < 256 for s in classe_de):
+            tabela = bytearray(256)
+            for simbolo, classe in classe_de.items():
+                tabela[simbolo] = classe
+            self.tabela_bytes = bytes(tabela)
+
+    def _montar_tabela_caracteres(self) -> str:
+        tamanho = max(TAMANHO_TABELA, max(map(ord, self.classe_de), default=0) + 1)
+        tabela = bytearray(tamanho)
+        for caractere, classe in self.classe_de.items():
+            tabela[ord(caractere)] = classe
+        # Um `str` latin-1 serve de sequência para `str.translate`: um byte por entrada.
+        self.tabela_caracteres = tabela.decode('latin-1')
+        return self.tabela_caracteres
+
+    @classmethod
+    def de_tabela(cls, simbolos: dict, tabela, largura: int) -> tuple[ParticaoAlfabeto, list[int]]:
+        """
+        Agrupa as colunas de `tabela` (uma por símbolo, mais a coluna "outros"
+        no fim) pelo seu conteúdo. Devolve a partição e a lista com a coluna
+        original representante de cada classe.
+        """
+        outros = largura - 1
+        assinaturas = {bytes(tabela[outros::largura]): 0}
+        representantes = [outros]
+        classe_de = {}
+        for simbolo, coluna in simbolos.items():
+            assinatura = bytes(tabela[coluna::largura])
+            classe = assinaturas.get(assinatura)
+            if classe is None:
+                classe = assinaturas[assinatura] = len(representantes)
+                representantes.append(coluna)
+            if classe:
+                classe_de[simbolo] = classe
+        return cls(classe_de, len(representantes)), representantes
+
+    def _traduzir(self, cadeia: str) -> bytes:
+        return cadeia.translate(self.tabela_caracteres).encode('latin-1', _ERRO_OUTROS)
+
+    def classes(self, cadeia):
+        """
+        Sequência das classes dos símbolos de `cadeia` (inteiros). Cadeias
+        longas são traduzidas em fatias de `BLOCO` caracteres, para que a
+        memória adicional não cresça com o texto.
+        """
+        if isinstance(cadeia, str) and self._caracteres:
+            if self.tabela_caracteres is None:
+                self._montar_tabela_caracteres()
+            if len(cadeia) <= BLOCO:
+                return self._traduzir(cadeia)
+            fatias = (cadeia[inicio:inicio + BLOCO] for inicio in range(0, len(cadeia), BLOCO))
+            return chain.from_iterable(map(self._traduzir, fatias))
+        if isinstance(cadeia, (bytes, bytearray)) and self.tabela_bytes is not None:
+            return cadeia.translate(self.tabela_bytes)
+        return map(self.classe_de.get, cadeia, repeat(0))
+
+    def __getstate__(self):
+        # As tabelas de tradução são reconstruídas no destino.
+        return (None, {'classe_de': self.classe_de, 'n_classes': self.n_classes})
+
+    def __setstate__(self, estado):
+        self.__init__(estado[1]['classe_de'], estado[1]['n_classes'])
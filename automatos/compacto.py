@@ -0,0 +1,483 @@
+"""
+Representação compacta de AFD e AFND muito grandes.
+
+Os estados e os símbolos são internados como inteiros e as transições ficam
+em vetores `array`, em vez de dicionários aninhados com um `set` por par
+(estado, símbolo):
+
+    AFDCompacto   a tabela plana de `AFDCompilado` e um mapa de bits com as
+                  transições definidas explicitamente
+    AFNDCompacto  listas de adjacência no formato CSR: as arestas do estado i
+                  são as posições linhas[i]:linhas[i + 1] de `arestas_simbolo`
+                  e `arestas_destino`, ordenadas pelo símbolo
+
+Cada aresta de um AFND custa assim 8 bytes. Para compatibilidade, `estados`,
+`transicoes`, `estados_finais` e `estado_inicial` continuam disponíveis como
+vistas só de leitura, montadas linha a linha quando consultadas.
+
+Carregados do formato binário, os vetores são vistas do ficheiro mapeado;
+`fechar()` (ou um bloco `with`) copia-os e fecha o ficheiro.
+"""
+from __future__ import annotations
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+import logging
+
+from .afd import AFD, AFDCompilado
+from .afnd import AFND
+from .binario import eh_binario, carregar_afnd_csr, copiar_inteiros
+from .lote import aceita_lote
+
+
+logger = logging.getLogger(__name__)
+
+
+def _arestas_de_texto(linhas):
+    """Arestas (origem, simbolo, destino) das linhas de transição do formato de texto do AFND."""
+    for linha in linhas:
+        linha = linha.strip()
+        if not linha:
+            continue
+        try:
+            origem, simbolo, destinos = linha.split(',', 2)
+        except ValueError:
+            logger.warning("Linha de transição mal formatada ignorada: %r", linha)
+            continue
+        for destino in destinos.split(';'):
+            yield origem, simbolo, destino
+
+
+def _internar(indices: dict, nomes: list, nome) -> int:
+    indice = indices.get(nome)
+    if indice is None:
+        indice = indices[nome] = len(nomes)
+        nomes.append(nome)
+    return indice
+
+
+class _VisaoTransicoes(Mapping):
+    """Vista só de leitura `estado -> {simbolo: destino(s)}` sobre um autómato compacto."""
+    __slots__ = ('_automato',)
+
+    def __init__(self, automato):
+        self._automato = automato
+
+    def __getitem__(self, estado):
+        linha = self._automato._linha(self._automato.indices[estado])
+        if not linha:
+            raise KeyError(estado)
+        return linha
+
+    def __iter__(self):
+        automato = self._automato
+        for indice, nome in enumerate(automato.nomes):
+            if automato._tem_transicoes(indice):
+                yield nome
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class AFDCompacto:
+    """
+    AFD guardado apenas na forma compilada (`AFDCompilado`).
+
+    As transições ausentes seguem, como num `AFD`, a coluna "outros" (o estado
+    inicial); `explicitas` marca as transições definidas, para que a vista
+    `transicoes` mostre exatamente as do autómato original.
+    """
+    __slots__ = ('compilado', 'indices', 'alfabeto', 'explicitas')
+
+    def __init__(self, compilado: AFDCompilado, alfabeto, explicitas: bytes | None = None):
+        self.compilado = compilado
+        self.indices = {nome: i for i, nome in enumerate(compilado.estados)}
+        self.alfabeto = frozenset(alfabeto)
+        self.explicitas = explicitas
+
+    @classmethod
+    def de_afd(cls, afd: AFD) -> AFDCompacto:
+        compilado = afd.compilar()
+        if afd._transicoes is None:
+            # Carregado de um ficheiro binário: o mapa de bits já existe.
+            explicitas = afd._explicitas
+        else:
+            n_simbolos = compilado.largura - 1
+            indices = {nome: i for i, nome in enumerate(compilado.estados)}
+            explicitas = bytearray(-(-len(compilado.estados) * n_simbolos // 8))
+            for origem, transicao in afd.transicoes.items():
+                for simbolo in transicao:
+                    bit = indices[origem] * n_simbolos + compilado.simbolos[simbolo]
+                    explicitas[bit >> 3] |= 1 << (bit & 7)
+        return cls(compilado, afd.alfabeto, explicitas)
+
+    @classmethod
+    def de_arestas(cls, arestas, estado_inicial, estados_finais, alfabeto=()) -> AFDCompacto:
+        """
+        Monta o AFD diretamente a partir de um iterável de (origem, simbolo, destino),
+        sem passar por dicionários de transições.
+        """
+        indices = {estado_inicial: 0}
+        nomes = [estado_inicial]
+        simbolos = {}
+        lista_simbolos = []
+        origens, colunas, destinos = array('I'), array('I'), array('I')
+        for origem, simbolo, destino in arestas:
+            origens.append(_internar(indices, nomes, origem))
+            colunas.append(_internar(simbolos, lista_simbolos, simbolo))
+            destinos.append(_internar(indices, nomes, destino))
+        for estado in estados_finais:
+            _internar(indices, nomes, estado)
+        for simbolo in alfabeto:
+            _internar(simbolos, lista_simbolos, simbolo)
+
+        largura = len(simbolos) + 1
+        tabela = array('i', [0]) * (len(nomes) * largura)
+        explicitas = bytearray(-(-len(nomes) * (largura - 1) // 8))
+        for origem, coluna, destino in zip(origens, colunas, destinos):
+            tabela[origem * largura + coluna] = destino * largura
+            bit = origem * (largura - 1) + coluna
+            explicitas[bit >> 3] |= 1 << (bit & 7)
+        finais = bytearray(len(tabela))
+        for estado in estados_finais:
+            finais[indices[estado] * largura] = 1
+        compilado = AFDCompilado(nomes, simbolos, tabela, 0, finais)
+        return cls(compilado, set(alfabeto) | set(simbolos), explicitas)
+
+    @classmethod
+    def abrir_arquivo(cls, filepath: str) -> AFDCompacto:
+        """
+        Lê um AFD de um ficheiro. No formato binário a tabela mapeada é usada
+        diretamente e o dicionário de transições nunca é montado.
+        """
+        return cls.de_afd(AFD.abrir_arquivo(filepath))
+
+    @property
+    def nomes(self) -> list:
+        return self.compilado.estados
+
+    @property
+    def estados(self):
+        return self.indices.keys()
+
+    @property
+    def estado_inicial(self):
+        return self.compilado.nome_estado(self.compilado.inicial)
+
+    @property
+    def estados_finais(self) -> frozenset:
+        compilado = self.compilado
+        return frozenset(nome for i, nome in enumerate(compilado.estados)
+                         if compilado.finais[i * compilado.largura])
+
+    @property
+    def transicoes(self) -> _VisaoTransicoes:
+        return _VisaoTransicoes(self)
+
+    def _explicita(self, indice: int, coluna: int) -> bool:
+        if self.explicitas is None:
+            return True
+        bit = indice * (self.compilado.largura - 1) + coluna
+        return bool(self.explicitas[bit >> 3] >> (bit & 7) & 1)
+
+    def _tem_transicoes(self, indice: int) -> bool:
+        return any(self._explicita(indice, coluna) for coluna in range(self.compilado.outros))
+
+    def _linha(self, indice: int) -> dict:
+        compilado = self.compilado
+        linha = indice * compilado.largura
+        return {
+            simbolo: compilado.estados[compilado.tabela[linha + coluna] // compilado.largura]
+            for simbolo, coluna in compilado.simbolos.items()
+            if self._explicita(indice, coluna)
+        }
+
+    def compilar(self) -> AFDCompilado:
+        return self.compilado
+
+    def fechar(self):
+        """Fecha o ficheiro binário de onde a tabela foi mapeada (ver `AFDCompilado.fechar`)."""
+        self.compilado.fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def aceita(self, cadeia) -> bool:
+        return self.compilado.aceita(cadeia)
+
+    def aceita_lote(self, cadeias, workers: int | None = None, chunksize: int | None = None) -> list[bool]:
+        return aceita_lote(self.compilado, cadeias, workers, chunksize)
+
+    def para_afd(self) -> AFD:
+        """Volta à representação com dicionários."""
+        afd = AFD()
+        afd._usar_compilado(self.compilado, set(self.nomes), set(self.alfabeto),
+                            set(self.estados_finais), self.explicitas)
+        return afd
+
+
+class AFNDCompacto:
+    """
+    AFND com as transições em listas de adjacência CSR.
+
+    A simulação trabalha com frozensets de inteiros; os épsilon-fechos de cada
+    estado e os passos (conjunto, símbolo) já calculados são memorizados, cada
+    um até `LIMITE_CACHE` entradas.
+    """
+    __slots__ = ('nomes', 'indices', 'simbolos', 'indice_simbolo', 'alfabeto', 'linhas',
+                 'arestas_simbolo', 'arestas_destino', 'inicial', 'finais',
+                 'arquivo', '_epsilon', '_fechos', '_passos')
+    EPSILON = AFND.EPSILON
+    LIMITE_CACHE = AFND.LIMITE_CACHE
+
+    def __init__(self, nomes, simbolos, alfabeto, linhas, arestas_simbolo, arestas_destino, inicial, finais,
+                 arquivo=None):
+        self.nomes = nomes
+        self.indices = {nome: i for i, nome in enumerate(nomes)}
+        self.simbolos = simbolos
+        self.indice_simbolo = {simbolo: i for i, simbolo in enumerate(simbolos)}
+        self.alfabeto = frozenset(alfabeto)
+        self.linhas = linhas
+        self.arestas_simbolo = arestas_simbolo
+        self.arestas_destino = arestas_destino
+        self.inicial = inicial
+        self.finais = finais
+        self.arquivo = arquivo
+        if arquivo is not None:
+            arquivo.registar(self)
+        self._epsilon = self.indice_simbolo.get(self.EPSILON)
+        self._fechos = {}
+        self._passos = {}
+
+    @classmethod
+    def de_arestas(cls, arestas, estado_inicial, estados_finais, alfabeto=()) -> AFNDCompacto:
+        """
+        Monta o AFND diretamente a partir de um iterável de (origem, simbolo, destino),
+        com `AFND.EPSILON` como símbolo das transições épsilon. As arestas são
+        ordenadas por origem com uma contagem (sem listas intermédias de tuplos)
+        e, dentro de cada estado, por símbolo; as repetidas são descartadas.
+        """
+        indices = {estado_inicial: 0}
+        nomes = [estado_inicial]
+        indice_simbolo = {}
+        simbolos = []
+        origens, colunas, destinos = array('I'), array('I'), array('I')
+        for origem, simbolo, destino in arestas:
+            origens.append(_internar(indices, nomes, origem))
+            colunas.append(_internar(indice_simbolo, simbolos, simbolo))
+            destinos.append(_internar(indices, nomes, destino))
+        for estado in estados_finais:
+            _internar(indices, nomes, estado)
+
+        # Ordenação por contagem das arestas pela origem.
+        linhas = array('I', [0]) * (len(nomes) + 1)
+        for origem in origens:
+            linhas[origem + 1] += 1
+        for i in range(len(nomes)):
+            linhas[i + 1] += linhas[i]
+        proxima = array('I', linhas)
+        arestas_simbolo = array('I', [0]) * len(origens)
+        arestas_destino = array('I', [0]) * len(origens)
+        for origem, coluna, destino in zip(origens, colunas, destinos):
+            posicao = proxima[origem]
+            arestas_simbolo[posicao] = coluna
+            arestas_destino[posicao] = destino
+            proxima[origem] = posicao + 1
+        del origens, colunas, destinos, proxima
+
+        # Dentro de cada linha: ordena por símbolo e remove as repetidas.
+        escrita = 0
+        inicio = 0
+        for i in range(len(nomes)):
+            fim = linhas[i + 1]
+            pares = sorted(set(zip(arestas_simbolo[inicio:fim], arestas_destino[inicio:fim])))
+            linhas[i] = escrita
+            for coluna, destino in pares:
+                arestas_simbolo[escrita] = coluna
+                arestas_destino[escrita] = destino
+                escrita += 1
+            inicio = fim
+        linhas[len(nomes)] = escrita
+        del arestas_simbolo[escrita:], arestas_destino[escrita:]
+
+        finais = bytearray(len(nomes))
+        for estado in estados_finais:
+            finais[indices[estado]] = 1
+        alfabeto = (set(alfabeto) | set(simbolos)) - {cls.EPSILON}
+        return cls(nomes, simbolos, alfabeto, linhas, arestas_simbolo, arestas_destino, 0, finais)
+
+    @classmethod
+    def de_afnd(cls, afnd: AFND) -> AFNDCompacto:
+        arestas = ((origem, simbolo, destino)
+                   for origem, transicao in afnd.transicoes.items()
+                   for simbolo, destinos in transicao.items()
+                   for destino in destinos)
+        compacto = cls.de_arestas(arestas, afnd.estado_inicial, afnd.estados_finais, afnd.alfabeto)
+        compacto._acrescentar_estados(afnd.estados)
+        return compacto
+
+    def _acrescentar_estados(self, estados):
+        """Acrescenta os estados isolados (sem arestas) que ainda não foram internados."""
+        for estado in estados:
+            if estado not in self.indices:
+                self.indices[estado] = len(self.nomes)
+                self.nomes.append(estado)
+                self.linhas.append(self.linhas[-1])
+                self.finais.append(0)
+
+    @classmethod
+    def abrir_arquivo(cls, filepath: str) -> AFNDCompacto:
+        """
+        Lê um AFND de um ficheiro. No formato binário as listas CSR do ficheiro
+        são usadas diretamente (mapeadas, sem cópia); no formato de texto as
+        linhas são convertidas em arestas sem montar o dicionário de transições.
+        """
+        if eh_binario(filepath):
+            return cls(*carregar_afnd_csr(filepath))
+
+        cabecalho = {}
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for linha in f:
+                linha = linha.strip()
+                if linha.startswith("TRANSICOES:"):
+                    break
+                if ':' in linha:
+                    chave, valor = linha.split(':', 1)
+                    cabecalho[chave] = valor.split(',') if valor else []
+            compacto = cls.de_arestas(_arestas_de_texto(f), cabecalho.get('INICIAL', [None])[0],
+                                      cabecalho.get('FINAIS', []), cabecalho.get('ALFABETO', []))
+        compacto._acrescentar_estados(cabecalho.get('ESTADOS', []))
+        return compacto
+
+    def fechar(self):
+        """
+        Copia os vetores CSR mapeados para memória própria e fecha o ficheiro
+        binário de onde foram carregados. Sem ficheiro associado, não faz nada.
+        """
+        if self.arquivo is not None:
+            self.arquivo.fechar()
+
+    def _desmapear(self):
+        for nome in ('linhas', 'arestas_simbolo', 'arestas_destino'):
+            setattr(self, nome, copiar_inteiros(getattr(self, nome), 'I'))
+        self.arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    @property
+    def estados(self):
+        return self.indices.keys()
+
+    @property
+    def estado_inicial(self):
+        return self.nomes[self.inicial]
+
+    @property
+    def estados_finais(self) -> frozenset:
+        return frozenset(nome for nome, final in zip(self.nomes, self.finais) if final)
+
+    @property
+    def transicoes(self) -> _VisaoTransicoes:
+        return _VisaoTransicoes(self)
+
+    def _tem_transicoes(self, indice: int) -> bool:
+        return self.linhas[indice] != self.linhas[indice + 1]
+
+    def _linha(self, indice: int) -> dict:
+        linha = {}
+        for aresta in range(self.linhas[indice], self.linhas[indice + 1]):
+            linha.setdefault(self.simbolos[self.arestas_simbolo[aresta]], set()).add(
+                self.nomes[self.arestas_destino[aresta]])
+        return {simbolo: frozenset(destinos) for simbolo, destinos in linha.items()}
+
+    def _destinos(self, estado: int, coluna: int):
+        """Destinos das arestas (estado, coluna), por pesquisa binária na linha do estado."""
+        simbolos = self.arestas_simbolo
+        fim = self.linhas[estado + 1]
+        aresta = bisect_left(simbolos, coluna, self.linhas[estado], fim)
+        while aresta < fim and simbolos[aresta] == coluna:
+            yield self.arestas_destino[aresta]
+            aresta += 1
+
+    def _fecho_estado(self, estado: int) -> frozenset:
+        fecho = self._fechos.get(estado)
+        if fecho is None:
+            visitados = {estado}
+            if self._epsilon is not None:
+                pendentes = [estado]
+                while pendentes:
+                    for destino in self._destinos(pendentes.pop(), self._epsilon):
+                        if destino not in visitados:
+                            visitados.add(destino)
+                            pendentes.append(destino)
+            fecho = frozenset(visitados)
+            if len(self._fechos) >= self.LIMITE_CACHE:
+                self._fechos.clear()
+            self._fechos[estado] = fecho
+        return fecho
+
+    def e_fecho(self, estados: set | str) -> set:
+        """Épsilon-fecho com nomes de estados, como `AFND.e_fecho`."""
+        if isinstance(estados, str):
+            estados = {estados}
+        fecho = set()
+        for estado in estados:
+            fecho |= self._fecho_estado(self.indices[estado])
+        return {self.nomes[estado] for estado in fecho}
+
+    def passo(self, ativos: frozenset, simbolo) -> frozenset:
+        chave = (ativos, simbolo)
+        proximos = self._passos.get(chave)
+        if proximos is None:
+            coluna = self.indice_simbolo.get(simbolo)
+            alcancados = set()
+            if coluna is not None and simbolo != self.EPSILON:
+                for estado in ativos:
+                    for destino in self._destinos(estado, coluna):
+                        alcancados |= self._fecho_estado(destino)
+            proximos = frozenset(alcancados)
+            if len(self._passos) >= self.LIMITE_CACHE:
+                self._passos.clear()
+            self._passos[chave] = proximos
+        return proximos
+
+    def aceita(self, cadeia) -> bool:
+        ativos = self._fecho_estado(self.inicial)
+        for simbolo in cadeia:
+            if not ativos:
+                return False
+            ativos = self.passo(ativos, simbolo)
+        finais = self.finais
+        return any(finais[estado] for estado in ativos)
+
+    def aceita_lote(self, cadeias, workers: int | None = None, chunksize: int | None = None) -> list[bool]:
+        return aceita_lote(self, cadeias, workers, chunksize)
+
+    def para_afnd(self) -> AFND:
+        """Volta à representação com dicionários."""
+        transicoes = {self.nomes[i]: {s: set(d) for s, d in self._linha(i).items()}
+                      for i in range(len(self.nomes)) if self._tem_transicoes(i)}
+        return AFND(set(self.nomes), set(self.alfabeto), transicoes,
+                    self.estado_inicial, set(self.estados_finais))
+
+    def __getstate__(self):
+        # Vetores mapeados de um ficheiro (memoryview) são copiados; as memórias não são enviadas.
+        estado = {nome: getattr(self, nome) for nome in self.__slots__ if nome not in ('_fechos', '_passos')}
+        estado['arquivo'] = None
+        for nome in ('linhas', 'arestas_simbolo', 'arestas_destino'):
+            if isinstance(estado[nome], memoryview):
+                estado[nome] = array('I', estado[nome])
+        return (None, estado)
+
+    def __setstate__(self, estado):
+        for nome, valor in estado[1].items():
+            setattr(self, nome, valor)
+        self._fechos = {}
+        self._passos = {}
@@ -0,0 +1,87 @@
+"""
+Instrumentação opcional dos simuladores.
+
+`instrumentar()` troca, só nessa instância, os métodos de simulação pelas
+suas variantes `*_instrumentado`, que contam transições, fechos, tamanhos
+dos conjuntos ativos e ocorrências, medem o tempo de cada fase e chamam um
+callback de rastreio em cada passo. As classes não são tocadas: um objeto
+não instrumentado corre exatamente o mesmo código de antes, sem nenhum
+teste adicional por passo.
+
+Contadores usados:
+    transicoes          passos da simulação (um por símbolo lido)
+    ausentes            símbolos sem transição (ida ao estado padrão/reinício)
+    fechos              chamadas a e_fecho
+    ativos_total        soma dos tamanhos do conjunto de estados ativos
+    ativos_max          maior conjunto de estados ativos
+    ocorrencias         ocorrências encontradas pelas buscas
+    cache_acertos       passos resolvidos pelo cache de determinização
+    cache_falhas        passos que tiveram de calcular um novo conjunto
+"""
+from __future__ import annotations
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import time
+
+
+class Instrumentacao:
+    """
+    Contadores, tempos por fase e callback de rastreio de um objeto instrumentado.
+
+    `rastreio`, se definido, é chamado como rastreio(posicao, simbolo, estado)
+    depois de cada passo, com o estado na representação do simulador (nome do
+    estado, conjunto de estados ou máscara de bits).
+    """
+
+    def __init__(self, rastreio=None):
+        self.rastreio = rastreio
+        self.contadores = Counter()
+        self.tempos = defaultdict(float)
+
+    @contextmanager
+    def fase(self, nome: str):
+        """Acumula em `tempos[nome]` o tempo passado dentro do bloco."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos[nome] += time.perf_counter() - inicio
+
+    def ativos(self, tamanho: int):
+        """Regista o tamanho do conjunto de estados ativos num passo."""
+        contadores = self.contadores
+        contadores['ativos_total'] += tamanho
+        if tamanho > contadores['ativos_max']:
+            contadores['ativos_max'] = tamanho
+
+    def reiniciar(self):
+        self.contadores.clear()
+        self.tempos.clear()
+
+    def resumo(self) -> dict:
+        """Contadores e tempos num dicionário simples, com a média de estados ativos."""
+        contadores = dict(self.contadores)
+        if contadores.get('transicoes'):
+            contadores['ativos_medio'] = contadores.get('ativos_total', 0) / contadores['transicoes']
+        return {'contadores': contadores, 'tempos_s': dict(self.tempos)}
+
+
+class Instrumentavel:
+    """
+    Mixin das classes com simulação instrumentável. Cada classe lista em
+    `METODOS_INSTRUMENTADOS` os métodos que têm uma variante `<nome>_instrumentado`.
+    """
+    METODOS_INSTRUMENTADOS = ()
+
+    def instrumentar(self, rastreio=None) -> Instrumentacao:
+        """Ativa a instrumentação nesta instância e devolve o objeto com as medições."""
+        self.instrumentacao = Instrumentacao(rastreio)
+        for nome in self.METODOS_INSTRUMENTADOS:
+            setattr(self, nome, getattr(self, f"{nome}_instrumentado"))
+        return self.instrumentacao
+
+    def desinstrumentar(self) -> Instrumentacao | None:
+        """Volta aos métodos originais e devolve as medições recolhidas."""
+        for nome in self.METODOS_INSTRUMENTADOS:
+            self.__dict__.pop(nome, None)
+        return self.__dict__.pop('instrumentacao', None)
@@ -0,0 +1,49 @@
+"""
+Verificação de lotes de cadeias com um conjunto de processos.
+
+O autómato é enviado na sua forma compilada (`AFDCompilado` ou `AFNDCompilado`)
+uma única vez para cada processo, através do inicializador do conjunto; depois
+disso só circulam as cadeias e os resultados.
+"""
+from __future__ import annotations
+
+from ._processos import conjunto_processos, planear
+
+
+# Número mínimo de cadeias para usar processos (ver `_processos.planear`).
+LIMITE_LOCAL = 50_000
+
+# Autómato compilado recebido por cada processo do conjunto.
+_automato_do_processo = None
+
+
+def _inicializar_processo(compilado):
+    global _automato_do_processo
+    _automato_do_processo = compilado
+
+
+def _aceita_bloco(cadeias: list) -> list[bool]:
+    aceita = _automato_do_processo.aceita
+    return [aceita(cadeia) for cadeia in cadeias]
+
+
+def aceita_lote(compilado, cadeias, workers: int | None = None, chunksize: int | None = None,
+                limite_local: int = LIMITE_LOCAL) -> list[bool]:
+    """
+    Aplica `compilado.aceita` a cada cadeia e devolve a lista de resultados
+    pela ordem de entrada. Com `workers=1` ou menos de `limite_local` cadeias
+    tudo corre no processo atual.
+    """
+    cadeias = cadeias if isinstance(cadeias, list) else list(cadeias)
+    plano = planear(len(cadeias), workers, chunksize, limite_local)
+    if plano is None:
+        aceita = compilado.aceita
+        return [aceita(cadeia) for cadeia in cadeias]
+
+    workers, chunksize = plano
+    blocos = [cadeias[i:i + chunksize] for i in range(0, len(cadeias), chunksize)]
+    resultados = []
+    with conjunto_processos(workers, _inicializar_processo, compilado) as executor:
+        for parcial in executor.map(_aceita_bloco, blocos):
+            resultados.extend(parcial)
+    return resultados
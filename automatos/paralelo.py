@@ -0,0 +1,72 @@
+"""
+Busca de padrões num único texto grande com um conjunto de processos.
+
+O texto é dividido em blocos contíguos e cada processo varre o seu bloco sem
+conhecer o estado em que o autómato estaria no início dele. Para isso a classe
+de busca implementa `_sincronizar(bloco)`: devolve `(p, estado)` se, partindo
+de *qualquer* estado, o autómato está em `estado` após ler `bloco[:p]` (ou
+None se isso não acontecer dentro do bloco). O processo varre então
+`bloco[p:]` a partir desse estado, de forma especulativa.
+
+Ao juntar os resultados, pela ordem dos blocos, o processo principal conhece o
+estado real no início de cada bloco e só volta a varrer o prefixo `bloco[:p]`,
+que nos autómatos de busca tem no máximo o tamanho do padrão. As ocorrências
+devolvidas são exatamente as da busca sequencial, pela mesma ordem.
+"""
+from __future__ import annotations
+
+from ._processos import conjunto_processos, planear
+
+
+# Tamanho mínimo do texto para usar processos (ver `_processos.planear`).
+LIMITE_LOCAL = 1 << 20
+
+# Objeto de busca recebido por cada processo do conjunto.
+_busca_do_processo = None
+
+
+def _inicializar_processo(busca):
+    global _busca_do_processo
+    _busca_do_processo = busca
+
+
+def _varrer_bloco(tarefa: tuple[str, int]):
+    """Varre um bloco a partir do ponto de sincronização; None se ele não existir."""
+    bloco, base = tarefa
+    sincronizado = _busca_do_processo._sincronizar(bloco)
+    if sincronizado is None:
+        return None
+    p, estado = sincronizado
+    estado, ocorrencias = _busca_do_processo._varrer(bloco[p:], estado, base + p)
+    return p, estado, ocorrencias
+
+
+def buscar_paralelo(busca, texto: str, workers: int | None = None, chunk_size: int | None = None,
+                    limite_local: int = LIMITE_LOCAL) -> list:
+    """
+    Equivalente a `busca.buscar(texto)`, dividindo o texto por `workers`
+    processos. Com `workers=1` ou um texto menor que `limite_local` tudo corre
+    no processo atual. Um bloco que não sincroniza é varrido de novo no
+    processo principal, o que mantém o resultado exato.
+    """
+    estado = busca._estado_varredura_inicial()
+    plano = planear(len(texto), workers, chunk_size, limite_local)
+    if plano is None:
+        return busca._varrer(texto, estado, 0)[1]
+
+    workers, chunk_size = plano
+    bases = range(0, len(texto), chunk_size)
+    ocorrencias = []
+    with conjunto_processos(workers, _inicializar_processo, busca) as executor:
+        tarefas = ((texto[base:base + chunk_size], base) for base in bases)
+        for base, resultado in zip(bases, executor.map(_varrer_bloco, tarefas)):
+            bloco = texto[base:base + chunk_size]
+            if resultado is None:
+                estado, encontrados = busca._varrer(bloco, estado, base)
+                ocorrencias.extend(encontrados)
+                continue
+            p, estado_final, encontrados = resultado
+            ocorrencias.extend(busca._varrer(bloco[:p], estado, base)[1])
+            ocorrencias.extend(encontrados)
+            estado = estado_final
+    return ocorrencias
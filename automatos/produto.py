@@ -0,0 +1,184 @@
+"""
+Produto preguiçoso de AFDs para avaliar filtros booleanos numa só passagem.
+
+`a & b`, `a | b`, `a - b` e `~a` (com `a` e `b` do tipo `AFD` ou `AFDProduto`)
+devolvem um `AFDProduto`. Um estado do produto é o tuplo dos estados de cada
+AFD operando (as "folhas" da expressão), e só os estados que as simulações
+efetivamente visitam são criados: cada um recebe um id inteiro, e as
+transições (id, simbolo) -> id e o valor de aceitação são memorizados. Uma
+expressão com k AFDs corre assim numa única leitura da cadeia, sem montar a
+tabela completa de |Q1|·...·|Qk| estados.
+
+As operações usam as formas compiladas dos operandos, que são totais (os
+símbolos sem transição seguem a coluna "outros"), por isso o complemento é
+simplesmente a troca dos estados finais.
+"""
+from __future__ import annotations
+from array import array
+
+from .afd import AFD, AFDCompilado
+
+
+class AFDProduto:
+    """
+    Expressão booleana sobre AFDs, simulada pelo produto preguiçoso dos operandos.
+
+    Se algum dos AFDs for modificado, os estados memorizados são descartados
+    na próxima simulação.
+    """
+    # Número máximo de estados do produto memorizados; ao ser atingido, a
+    # memória é esvaziada e a simulação continua a partir do estado atual.
+    LIMITE_ESTADOS = 65536
+
+    def __init__(self, operacao: str, *operandos):
+        self.operacao = operacao
+        self.operandos = operandos
+        self.folhas = []
+        self.expressao = self._registar_folhas(self)
+        self._versoes = None
+
+    def _registar_folhas(self, no):
+        """Converte a árvore de operações em tuplos com índices das folhas."""
+        if isinstance(no, AFD):
+            for indice, folha in enumerate(self.folhas):
+                if folha is no:
+                    return ('folha', indice)
+            self.folhas.append(no)
+            return ('folha', len(self.folhas) - 1)
+        if not isinstance(no, AFDProduto):
+            raise TypeError(f"Operando inválido para um produto de AFDs: {type(no).__name__}")
+        return (no.operacao,) + tuple(self._registar_folhas(operando) for operando in no.operandos)
+
+    def __and__(self, outro) -> AFDProduto:
+        return AFDProduto('e', self, outro)
+
+    def __or__(self, outro) -> AFDProduto:
+        return AFDProduto('ou', self, outro)
+
+    def __sub__(self, outro) -> AFDProduto:
+        return AFDProduto('menos', self, outro)
+
+    def __invert__(self) -> AFDProduto:
+        return AFDProduto('nao', self)
+
+    def _avaliar(self, no, finais) -> bool:
+        operacao = no[0]
+        if operacao == 'folha':
+            return finais[no[1]]
+        if operacao == 'nao':
+            return not self._avaliar(no[1], finais)
+        esquerda = self._avaliar(no[1], finais)
+        direita = self._avaliar(no[2], finais)
+        if operacao == 'e':
+            return esquerda and direita
+        if operacao == 'ou':
+            return esquerda or direita
+        return esquerda and not direita
+
+    def _preparar(self):
+        """Recompila as folhas e esvazia a memória se alguma delas mudou."""
+        versoes = [folha._versao.valor for folha in self.folhas]
+        if versoes != self._versoes:
+            self._compilados = [folha.compilar() for folha in self.folhas]
+            self._versoes = versoes
+            self._limpar()
+        return self._compilados
+
+    def _limpar(self):
+        self._ids = {}
+        self._tuplos = []
+        self._transicoes = []
+        self._finais = []
+
+    def _registar(self, tuplo: tuple) -> int:
+        """Devolve o id do estado do produto, criando-o se ainda não existir."""
+        id_estado = self._ids.get(tuplo)
+        if id_estado is None:
+            if len(self._tuplos) >= self.LIMITE_ESTADOS:
+                self._limpar()
+            id_estado = len(self._tuplos)
+            self._ids[tuplo] = id_estado
+            self._tuplos.append(tuplo)
+            self._transicoes.append({})
+            finais = [compilado.finais[estado] for compilado, estado in zip(self._compilados, tuplo)]
+            self._finais.append(bool(self._avaliar(self.expressao, finais)))
+        return id_estado
+
+    def _passo(self, tuplo: tuple, simbolo) -> tuple:
+        return tuple(
+            compilado.tabela[estado + compilado.simbolos.get(simbolo, compilado.outros)]
+            for compilado, estado in zip(self._compilados, tuplo)
+        )
+
+    def _executar(self, cadeia) -> int:
+        compilados = self._preparar()
+        atual = self._registar(tuple(compilado.inicial for compilado in compilados))
+        transicoes = self._transicoes
+        for simbolo in cadeia:
+            proximo = transicoes[atual].get(simbolo)
+            if proximo is None:
+                destino = self._passo(self._tuplos[atual], simbolo)
+                memoria = self._transicoes
+                proximo = self._registar(destino)
+                if self._transicoes is not memoria:
+                    # A memória foi esvaziada: o estado atual já não existe nela.
+                    transicoes = self._transicoes
+                else:
+                    transicoes[atual][simbolo] = proximo
+            atual = proximo
+        return atual
+
+    def aceita(self, cadeia) -> bool:
+        """Avalia a expressão para a cadeia numa única passagem."""
+        estado = self._executar(cadeia)
+        return self._finais[estado]
+
+    @property
+    def estados_materializados(self) -> int:
+        """Quantos estados do produto estão memorizados neste momento."""
+        return len(self._tuplos) if self._versoes is not None else 0
+
+    def para_afd(self) -> AFD:
+        """
+        Constrói explicitamente o AFD com todos os estados alcançáveis do produto.
+
+        Os símbolos são a união dos alfabetos das folhas; a coluna "outros"
+        do resultado segue a coluna "outros" de cada folha.
+        """
+        compilados = self._preparar()
+        simbolos = {}
+        for compilado in compilados:
+            for simbolo in compilado.simbolos:
+                simbolos.setdefault(simbolo, None)
+        simbolos = {simbolo: i for i, simbolo in enumerate(sorted(simbolos))}
+        largura = len(simbolos) + 1
+
+        inicial = tuple(compilado.inicial for compilado in compilados)
+        ids = {inicial: 0}
+        tuplos = [inicial]
+        tabela = array('i')
+        # colunas[i][c]: coluna da folha i correspondente à coluna c do produto.
+        colunas = [[compilado.simbolos.get(simbolo, compilado.outros) for simbolo in simbolos]
+                   + [compilado.outros] for compilado in compilados]
+        for tuplo in tuplos:
+            for coluna in range(largura):
+                destino = tuple(compilado.tabela[estado + colunas_folha[coluna]]
+                                for compilado, estado, colunas_folha in zip(compilados, tuplo, colunas))
+                id_destino = ids.get(destino)
+                if id_destino is None:
+                    id_destino = ids[destino] = len(tuplos)
+                    tuplos.append(destino)
+                tabela.append(id_destino * largura)
+
+        nomes = [f"p{i}" for i in range(len(tuplos))]
+        finais = bytearray(len(tabela))
+        estados_finais = set()
+        for i, tuplo in enumerate(tuplos):
+            if self._avaliar(self.expressao, [c.finais[e] for c, e in zip(compilados, tuplo)]):
+                finais[i * largura] = 1
+                estados_finais.add(nomes[i])
+
+        afd = AFD()
+        afd._usar_compilado(AFDCompilado(nomes, simbolos, tabela, 0, finais),
+                            set(nomes), set(simbolos), estados_finais)
+        return afd
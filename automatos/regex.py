@@ -0,0 +1,351 @@
+"""
+Expressões regulares compiladas para AFND (Thompson) e AFD (subconjuntos).
+
+Sintaxe aceite:
+    ab          concatenação
+    a|b         união
+    a* a+ a?    repetição
+    (a)         agrupamento; () é a cadeia vazia
+    .           qualquer símbolo
+    [abc] [a-z] classe de símbolos; [^...] é o complemento
+    \\d \\w \\s    dígitos, letras/dígitos/_ e espaços (ASCII); \\D \\W \\S, os complementos
+    \\x          o símbolo x literal (por exemplo \\* ou \\\\)
+
+O símbolo '&' é reservado para a transição épsilon do AFND (`AFND.EPSILON`)
+e não pode aparecer como literal; os intervalos que o contêm omitem-no.
+Continua, porém, a ser aceite por '.' e pelas classes complementadas.
+
+`compilar_regex` devolve um AFD que reconhece a expressão inteira (não uma
+busca). Os AFD compilados ficam num cache LRU limitado a `LIMITE_CACHE`
+entradas, indexado pela expressão e pelas opções.
+"""
+from __future__ import annotations
+from array import array
+from collections import OrderedDict
+
+from .afd import AFD, AFDCompilado
+from .afnd import AFND
+
+
+# Número máximo de expressões compiladas guardadas em cache.
+LIMITE_CACHE = 256
+
+_DIGITOS = frozenset('0123456789')
+_PALAVRA = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_')
+_ESPACOS = frozenset(' \t\n\r\f\v')
+_CLASSES = {'d': _DIGITOS, 'w': _PALAVRA, 's': _ESPACOS}
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v'}
+
+
+class ErroRegex(ValueError):
+    """Expressão regular mal formada."""
+
+    def __init__(self, mensagem: str, expressao: str, posicao: int):
+        super().__init__(f"{mensagem} na posição {posicao} de {expressao!r}")
+        self.expressao = expressao
+        self.posicao = posicao
+
+
+class _Analisador:
+    """
+    Analisador descendente recursivo da expressão. Produz uma árvore de tuplos:
+        ('simbolos', conjunto, negado)   um símbolo de `conjunto` (ou fora dele, se negado)
+        ('vazio',)                       a cadeia vazia
+        ('concat', a, b) | ('uniao', a, b)
+        ('*', a) | ('+', a) | ('?', a)
+    """
+
+    def __init__(self, expressao: str, ignorar_maiusculas: bool):
+        self.expressao = expressao
+        self.posicao = 0
+        self.ignorar_maiusculas = ignorar_maiusculas
+
+    def erro(self, mensagem: str, posicao: int | None = None):
+        raise ErroRegex(mensagem, self.expressao, self.posicao if posicao is None else posicao)
+
+    def espiar(self) -> str | None:
+        if self.posicao < len(self.expressao):
+            return self.expressao[self.posicao]
+        return None
+
+    def avancar(self) -> str:
+        caractere = self.espiar()
+        if caractere is None:
+            self.erro("Fim inesperado da expressão")
+        self.posicao += 1
+        return caractere
+
+    def analisar(self):
+        arvore = self.uniao()
+        if self.posicao < len(self.expressao):
+            self.erro("Parêntese ')' sem abertura")
+        return arvore
+
+    def uniao(self):
+        arvore = self.concatenacao()
+        while self.espiar() == '|':
+            self.posicao += 1
+            arvore = ('uniao', arvore, self.concatenacao())
+        return arvore
+
+    def concatenacao(self):
+        arvore = None
+        while self.espiar() not in (None, '|', ')'):
+            fator = self.repeticao()
+            arvore = fator if arvore is None else ('concat', arvore, fator)
+        return ('vazio',) if arvore is None else arvore
+
+    def repeticao(self):
+        arvore = self.atomo()
+        while self.espiar() in ('*', '+', '?'):
+            arvore = (self.avancar(), arvore)
+        return arvore
+
+    def atomo(self):
+        inicio = self.posicao
+        caractere = self.avancar()
+        if caractere == '(':
+            arvore = self.uniao()
+            if self.espiar() != ')':
+                self.erro("Parêntese '(' sem fecho", inicio)
+            self.posicao += 1
+            return arvore
+        if caractere == '[':
+            return self.classe(inicio)
+        if caractere == '.':
+            return ('simbolos', frozenset(), True)
+        if caractere in ('*', '+', '?'):
+            self.erro(f"'{caractere}' sem operando", inicio)
+        if caractere == '\\':
+            classe = self.escape()
+            if isinstance(classe, tuple):
+                return ('simbolos',) + classe
+            caractere = classe
+        return ('simbolos', self.literal(caractere, inicio), False)
+
+    def escape(self):
+        """Lê o símbolo depois de '\\': devolve um caractere ou (conjunto, negado)."""
+        caractere = self.avancar()
+        if caractere.lower() in _CLASSES:
+            return _CLASSES[caractere.lower()], caractere.isupper()
+        return _ESCAPES.get(caractere, caractere)
+
+    def literal(self, caractere: str, posicao: int) -> frozenset:
+        if caractere == AFND.EPSILON:
+            self.erro(f"O símbolo {AFND.EPSILON!r} é reservado para épsilon", posicao)
+        if self.ignorar_maiusculas:
+            return frozenset((caractere, caractere.lower(), caractere.upper()))
+        return frozenset(caractere)
+
+    def classe(self, inicio: int):
+        negado = self.espiar() == '^'
+        if negado:
+            self.posicao += 1
+        simbolos = set()
+        primeiro = True
+        while True:
+            if self.espiar() is None:
+                self.erro("Classe '[' sem fecho", inicio)
+            caractere = self.avancar()
+            if caractere == ']' and not primeiro:
+                break
+            primeiro = False
+            posicao = self.posicao - 1
+            if caractere == '\\':
+                caractere = self.escape()
+                if isinstance(caractere, tuple):
+                    conjunto, complemento = caractere
+                    if complemento:
+                        self.erro("Classe complementada dentro de '[...]'", posicao)
+                    simbolos |= conjunto
+                    continue
+            if self.espiar() == '-' and self.posicao + 1 < len(self.expressao) \
+                    and self.expressao[self.posicao + 1] != ']':
+                self.posicao += 1
+                fim = self.avancar()
+                if fim == '\\':
+                    fim = self.escape()
+                    if isinstance(fim, tuple):
+                        self.erro("Classe como limite de intervalo", posicao)
+                if fim < caractere:
+                    self.erro(f"Intervalo invertido {caractere}-{fim}", posicao)
+                for codigo in range(ord(caractere), ord(fim) + 1):
+                    if chr(codigo) != AFND.EPSILON:
+                        simbolos |= self.literal(chr(codigo), posicao)
+            else:
+                simbolos |= self.literal(caractere, posicao)
+        return ('simbolos', frozenset(simbolos), negado)
+
+
+def _alfabeto(arvore, simbolos: set):
+    pendentes = [arvore]
+    while pendentes:
+        no = pendentes.pop()
+        if no[0] == 'simbolos':
+            simbolos |= no[1]
+        else:
+            pendentes.extend(no[1:])
+    return simbolos
+
+
+def _thompson(expressao: str, ignorar_maiusculas: bool) -> tuple[AFND, dict]:
+    """
+    Constrói o AFND de Thompson e devolve-o com as transições "outros":
+    estado -> destinos para os símbolos fora do alfabeto da expressão
+    (gerados por '.' e pelas classes complementadas).
+    """
+    arvore = _Analisador(expressao, ignorar_maiusculas).analisar()
+    alfabeto = _alfabeto(arvore, set())
+    afnd = AFND(alfabeto=set(alfabeto))
+    transicoes = afnd.transicoes
+    outros = {}
+    contador = 0
+
+    def novo_estado() -> str:
+        nonlocal contador
+        contador += 1
+        return f"q{contador - 1}"
+
+    # Construção iterativa em pós-ordem: cada nó devolve o fragmento (inicio, fim).
+    fragmentos = []
+    pendentes = [(arvore, False)]
+    while pendentes:
+        no, visitado = pendentes.pop()
+        tipo = no[0]
+        if not visitado and tipo not in ('simbolos', 'vazio'):
+            pendentes.append((no, True))
+            pendentes.extend((filho, False) for filho in reversed(no[1:]))
+            continue
+
+        inicio, fim = novo_estado(), novo_estado()
+        if tipo == 'simbolos':
+            _, conjunto, negado = no
+            for simbolo in (alfabeto - conjunto if negado else conjunto):
+                transicoes[inicio][simbolo].add(fim)
+            if negado:
+                outros[inicio] = {fim}
+        elif tipo == 'vazio':
+            transicoes[inicio][AFND.EPSILON].add(fim)
+        elif tipo in ('concat', 'uniao'):
+            (inicio_b, fim_b), (inicio_a, fim_a) = fragmentos.pop(), fragmentos.pop()
+            if tipo == 'concat':
+                transicoes[inicio][AFND.EPSILON].add(inicio_a)
+                transicoes[fim_a][AFND.EPSILON].add(inicio_b)
+                transicoes[fim_b][AFND.EPSILON].add(fim)
+            else:
+                transicoes[inicio][AFND.EPSILON].update((inicio_a, inicio_b))
+                transicoes[fim_a][AFND.EPSILON].add(fim)
+                transicoes[fim_b][AFND.EPSILON].add(fim)
+        else:
+            inicio_a, fim_a = fragmentos.pop()
+            transicoes[inicio][AFND.EPSILON].add(inicio_a)
+            transicoes[fim_a][AFND.EPSILON].add(fim)
+            if tipo in ('*', '?'):
+                transicoes[inicio][AFND.EPSILON].add(fim)
+            if tipo in ('*', '+'):
+                transicoes[fim_a][AFND.EPSILON].add(inicio_a)
+        fragmentos.append((inicio, fim))
+
+    afnd.estados = {f"q{i}" for i in range(contador)}
+    afnd.estado_inicial, final = fragmentos.pop()
+    afnd.estados_finais = {final}
+    return afnd, outros
+
+
+def thompson(expressao: str, ignorar_maiusculas: bool = False) -> AFND:
+    """
+    Constrói o AFND de Thompson da expressão, com transições épsilon '&'.
+
+    O AFND só tem transições para os símbolos que aparecem na expressão: '.'
+    e as classes complementadas reconhecem apenas esses símbolos. O AFD de
+    `compilar_regex` trata também os restantes.
+    """
+    return _thompson(expressao, ignorar_maiusculas)[0]
+
+
+def _determinizar(afnd: AFND, outros: dict) -> AFD:
+    """
+    Construção de subconjuntos diretamente para a tabela de `AFDCompilado`.
+
+    A coluna "outros" da tabela, que num AFD comum leva ao estado inicial,
+    recebe aqui os destinos das transições "outros" do AFND, e o conjunto
+    vazio é um estado morto explícito. O AFD resultante reconhece assim a
+    expressão para qualquer símbolo de entrada.
+    """
+    fechos = afnd.fechos_epsilon()
+    transicoes = afnd.transicoes
+    simbolos = {simbolo: i for i, simbolo in enumerate(sorted(afnd.alfabeto))}
+    largura = len(simbolos) + 1
+
+    def fecho(estados) -> frozenset:
+        resultado = set()
+        for estado in estados:
+            resultado.update(fechos.get(estado, (estado,)))
+        return frozenset(resultado)
+
+    inicial = fecho((afnd.estado_inicial,))
+    ids = {inicial: 0}
+    conjuntos = [inicial]
+    tabela = array('i')
+    for conjunto in conjuntos:
+        linha = [set() for _ in range(largura)]
+        for estado in conjunto:
+            for simbolo, destinos in transicoes.get(estado, {}).items():
+                coluna = simbolos.get(simbolo)
+                if coluna is not None:
+                    linha[coluna] |= destinos
+            linha[-1].update(outros.get(estado, ()))
+        for destinos in linha:
+            destino = fecho(destinos)
+            id_destino = ids.get(destino)
+            if id_destino is None:
+                id_destino = ids[destino] = len(conjuntos)
+                conjuntos.append(destino)
+            tabela.append(id_destino * largura)
+
+    nomes = [f"q{i}" for i in range(len(conjuntos))]
+    finais = bytearray(len(tabela))
+    estados_finais = set()
+    for i, conjunto in enumerate(conjuntos):
+        if not conjunto.isdisjoint(afnd.estados_finais):
+            finais[i * largura] = 1
+            estados_finais.add(nomes[i])
+
+    compilado = AFDCompilado(nomes, simbolos, tabela, 0, finais)
+    afd = AFD()
+    afd._usar_compilado(compilado, set(nomes), set(simbolos), estados_finais)
+    return afd
+
+
+_cache = OrderedDict()
+
+
+def compilar_regex(expressao: str, ignorar_maiusculas: bool = False) -> AFD:
+    """
+    Compila a expressão num AFD que aceita exatamente as cadeias que ela descreve.
+
+    O resultado é partilhado através do cache: se o AFD devolvido for
+    modificado, a entrada é descartada e reconstruída na próxima chamada.
+    Depois de modificado, o AFD volta às regras de um AFD comum (símbolos
+    sem transição levam ao estado inicial). Pela mesma razão, só pode ser
+    guardado no formato binário (`salvar_automato(..., binario=True)`).
+    """
+    chave = (expressao, ignorar_maiusculas)
+    entrada = _cache.get(chave)
+    if entrada is not None:
+        afd, versao = entrada
+        if afd._versao.valor == versao:
+            _cache.move_to_end(chave)
+            return afd
+
+    afd = _determinizar(*_thompson(expressao, ignorar_maiusculas))
+    _cache[chave] = (afd, afd._versao.valor)
+    _cache.move_to_end(chave)
+    while len(_cache) > LIMITE_CACHE:
+        _cache.popitem(last=False)
+    return afd
+
+
+def limpar_cache_regex():
+    """Descarta todas as expressões compiladas."""
+    _cache.clear()
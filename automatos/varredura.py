@@ -0,0 +1,231 @@
+"""
+Busca de padrões em fluxos de texto (ficheiros, mmap, objetos de ficheiro).
+
+As classes de busca implementam uma varredura retomável: `_varrer` processa um
+bloco a partir de um estado do autómato e devolve o estado em que terminou,
+junto com as ocorrências encontradas. `BuscaEmFluxo` usa essa varredura para
+percorrer a entrada bloco a bloco sem a carregar inteira em memória.
+A versão assíncrona, para fluxos asyncio, está em `automatos.assincrono`.
+"""
+from __future__ import annotations
+import codecs
+import mmap
+import os
+
+from .paralelo import buscar_paralelo
+
+
+def ler_blocos(fonte, tamanho_bloco: int, encoding: str = 'utf-8'):
+    """
+    Gera a entrada em blocos de texto (`str`).
+
+    `fonte` pode ser um caminho (aberto e mapeado em memória com `mmap`), um
+    objeto `mmap`/`bytes`, ou um objeto de ficheiro em modo texto ou binário.
+    Os bytes são descodificados de forma incremental, de modo que um carácter
+    multibyte partido entre dois blocos é reconstruído corretamente.
+    """
+    if tamanho_bloco <= 0:
+        raise ValueError("O tamanho do bloco deve ser positivo.")
+
+    if isinstance(fonte, (str, os.PathLike)):
+        with open(fonte, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                yield from _blocos_de_bytes(mapa, tamanho_bloco, encoding)
+        return
+
+    if isinstance(fonte, (mmap.mmap, bytes, bytearray, memoryview)):
+        yield from _blocos_de_bytes(fonte, tamanho_bloco, encoding)
+        return
+
+    decodificador = None
+    while True:
+        bloco = fonte.read(tamanho_bloco)
+        if not bloco:
+            break
+        if isinstance(bloco, str):
+            yield bloco
+            continue
+        if decodificador is None:
+            decodificador = codecs.getincrementaldecoder(encoding)()
+        texto = decodificador.decode(bloco)
+        if texto:
+            yield texto
+    if decodificador is not None:
+        resto = decodificador.decode(b'', final=True)
+        if resto:
+            yield resto
+
+
+def _blocos_de_bytes(dados, tamanho_bloco: int, encoding: str):
+    """Fatia um buffer de bytes (sem copiá-lo inteiro) e descodifica cada fatia."""
+    decodificador = codecs.getincrementaldecoder(encoding)()
+    visao = memoryview(dados)
+    try:
+        for inicio in range(0, len(visao), tamanho_bloco):
+            texto = decodificador.decode(visao[inicio:inicio + tamanho_bloco])
+            if texto:
+                yield texto
+        resto = decodificador.decode(b'', final=True)
+        if resto:
+            yield resto
+    finally:
+        visao.release()
+
+
+class BuscaEmFluxo:
+    """
+    Mixin que acrescenta a busca em fluxo às classes de busca de padrões.
+
+    A varredura usa os métodos:
+        _estado_varredura_inicial() -> estado
+        _varrer(bloco, estado, base) -> (estado, lista de ocorrências)
+        _contar(bloco, estado) -> (estado, número de ocorrências)
+        _sincronizar(bloco) -> (p, estado) ou None  (ver `automatos.paralelo`)
+    onde `base` é a posição absoluta do primeiro carácter do bloco.
+
+    As implementações abaixo servem as buscas baseadas num AFD: percorrem a
+    tabela de `compilar_classes()` e obtêm de `_saidas_do_estado(nome)`, que a
+    classe implementa, as ocorrências que terminam num estado final, como
+    pares (rótulo, deslocamento do início). Com rótulo None a ocorrência é só a posição
+    inicial; senão é o par (rótulo, posição inicial). Os simuladores de AFND
+    substituem estes métodos.
+    """
+
+    # Tamanho padrão dos blocos lidos (em caracteres ou bytes, conforme a fonte).
+    TAMANHO_BLOCO = 1 << 20
+
+    def _saidas_varredura(self, compilado) -> dict:
+        """Associa cada estado final de `compilado` (deslocamento de linha) às suas saídas."""
+        cache = self.__dict__.get('_saidas_compiladas')
+        if cache is None or cache[0] is not compilado:
+            saidas = {}
+            for linha in range(0, len(compilado.tabela), compilado.largura):
+                if compilado.finais[linha]:
+                    saidas[linha] = self._saidas_do_estado(compilado.nome_estado(linha))
+            cache = self._saidas_compiladas = (compilado, saidas)
+        return cache[1]
+
+    def _estado_varredura_inicial(self) -> int:
+        return self.compilar_classes().inicial
+
+    def _sincronizar(self, texto: str):
+        return self.compilar_classes().sincronizar(texto)
+
+    def _varrer(self, texto: str, estado_atual: int, base: int) -> tuple[int, list]:
+        """Processa `texto` a partir de `estado_atual`; `base` é a posição absoluta de texto[0]."""
+        compilado = self.compilar_classes()
+        saidas = self._saidas_varredura(compilado)
+        tabela = compilado.tabela
+        finais = compilado.finais
+        ocorrencias = []
+
+        # Símbolos sem transição usam a coluna "outros" (classe 0).
+        for i, coluna in enumerate(compilado.colunas(texto), base):
+            estado_atual = tabela[estado_atual + coluna]
+
+            if finais[estado_atual]:
+                for rotulo, deslocamento in saidas[estado_atual]:
+                    ocorrencias.append(i - deslocamento if rotulo is None else (rotulo, i - deslocamento))
+
+        return estado_atual, ocorrencias
+
+    def _varrer_instrumentado(self, texto: str, estado_atual: int, base: int) -> tuple[int, list]:
+        """Variante de `_varrer` ativada por `instrumentar()` (ver `automatos.instrumentacao`)."""
+        instrumentacao = self.instrumentacao
+        with instrumentacao.fase('compilar'):
+            compilado = self.compilar_classes()
+            saidas = self._saidas_varredura(compilado)
+            # O mapa de classes omite os símbolos da classe 0, por isso os
+            # símbolos fora do alfabeto são os que a tabela simples não tem.
+            alfabeto = self.compilar().simbolos
+        tabela = compilado.tabela
+        finais = compilado.finais
+        classes = compilado.simbolos
+        rastreio = instrumentacao.rastreio
+        ocorrencias = []
+        ausentes = 0
+
+        with instrumentacao.fase('varrer'):
+            for i, simbolo in enumerate(texto, base):
+                if simbolo not in alfabeto:
+                    ausentes += 1
+                estado_atual = tabela[estado_atual + classes.get(simbolo, compilado.outros)]
+
+                if finais[estado_atual]:
+                    for rotulo, deslocamento in saidas[estado_atual]:
+                        ocorrencias.append(i - deslocamento if rotulo is None else (rotulo, i - deslocamento))
+                if rastreio is not None:
+                    rastreio(i, simbolo, compilado.nome_estado(estado_atual))
+
+        contadores = instrumentacao.contadores
+        contadores['transicoes'] += len(texto)
+        contadores['ausentes'] += ausentes
+        contadores['ocorrencias'] += len(ocorrencias)
+        if texto:
+            instrumentacao.ativos(1)
+            contadores['ativos_total'] += len(texto) - 1
+        return estado_atual, ocorrencias
+
+    def _contar(self, texto: str, estado_atual: int) -> tuple[int, int]:
+        compilado = self.compilar_classes()
+        saidas = self._saidas_varredura(compilado)
+        tabela = compilado.tabela
+        finais = compilado.finais
+        quantidade = 0
+
+        for coluna in compilado.colunas(texto):
+            estado_atual = tabela[estado_atual + coluna]
+            if finais[estado_atual]:
+                quantidade += len(saidas[estado_atual])
+
+        return estado_atual, quantidade
+
+    def buscar_stream(self, fonte, chunk_size: int | None = None, encoding: str = 'utf-8'):
+        """
+        Gera as ocorrências do padrão em `fonte` com posições absolutas,
+        lendo um bloco de cada vez. O estado do autómato passa de um bloco
+        para o seguinte, por isso as ocorrências que atravessam a fronteira
+        entre blocos são encontradas. As posições contam caracteres do texto
+        descodificado, como em `buscar`.
+        """
+        estado = self._estado_varredura_inicial()
+        base = 0
+        for bloco in ler_blocos(fonte, chunk_size or self.TAMANHO_BLOCO, encoding):
+            estado, encontrados = self._varrer(bloco, estado, base)
+            yield from encontrados
+            base += len(bloco)
+
+    def contar_stream(self, fonte, chunk_size: int | None = None, encoding: str = 'utf-8') -> int:
+        """Conta as ocorrências em `fonte` sem guardar as posições."""
+        estado = self._estado_varredura_inicial()
+        total = 0
+        for bloco in ler_blocos(fonte, chunk_size or self.TAMANHO_BLOCO, encoding):
+            estado, quantidade = self._contar(bloco, estado)
+            total += quantidade
+        return total
+
+    def buscar_async(self, fonte, chunk_size: int | None = None, encoding: str = 'utf-8', executor=None):
+        """
+        Versão assíncrona de `buscar_stream`, para usar com `async for`.
+        `fonte` é um `asyncio.StreamReader` ou um iterador assíncrono de blocos
+        (`bytes` ou `str`). Os blocos grandes são varridos em `executor` (por
+        omissão, o do ciclo de eventos) para não bloquear o ciclo.
+        """
+        # Importado só aqui: o asyncio é caro de carregar e só é preciso nesta API.
+        from .assincrono import buscar_async
+        return buscar_async(self, fonte, chunk_size or self.TAMANHO_BLOCO, encoding, executor)
+
+    async def contar_async(self, fonte, chunk_size: int | None = None, encoding: str = 'utf-8',
+                           executor=None) -> int:
+        """Versão assíncrona de `contar_stream`."""
+        from .assincrono import contar_async
+        return await contar_async(self, fonte, chunk_size or self.TAMANHO_BLOCO, encoding, executor)
+
+    def buscar_paralelo(self, texto: str, workers: int | None = None, chunk_size: int | None = None) -> list:
+        """
+        Mesmo resultado que `buscar(texto)`, com o texto dividido em blocos
+        varridos em paralelo por um conjunto de processos.
+        """
+        return buscar_paralelo(self, texto, workers, chunk_size)
@@ -0,0 +1,85 @@
+"""
+Simulação vetorizada de um AFD sobre muitas cadeias em simultâneo (NumPy).
+
+O NumPy é uma dependência opcional: este módulo só o exige quando
+`aceita_vetorizado` é chamado.
+"""
+from __future__ import annotations
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional
+    np = None
+
+
+def _exigir_numpy():
+    if np is None:
+        raise ImportError("A simulação vetorizada requer o NumPy (pip install numpy).")
+
+
+def codificar_cadeias(compilado, cadeias: list[str]):
+    """
+    Converte as cadeias numa matriz de índices de coluna da tabela compilada,
+    com uma linha por posição e uma coluna por cadeia (transposta, para que
+    cada passo leia memória contígua). Devolve (matriz, tamanhos).
+    Caracteres sem coluna própria recebem a coluna `outros`.
+    """
+    _exigir_numpy()
+    tamanhos = np.fromiter(map(len, cadeias), dtype=np.int64, count=len(cadeias))
+    total = int(tamanhos.sum())
+    maior = int(tamanhos.max()) if len(cadeias) else 0
+    matriz = np.full((maior, len(cadeias)), compilado.outros, dtype=np.intc)
+    if total == 0:
+        return matriz, tamanhos
+
+    pontos = np.frombuffer(''.join(cadeias).encode('utf-32-le'), dtype=np.uint32)
+
+    # Só símbolos de um carácter podem coincidir com um carácter da cadeia.
+    simbolos = sorted((ord(s), coluna) for s, coluna in compilado.simbolos.items()
+                      if isinstance(s, str) and len(s) == 1)
+    colunas = np.full(total, compilado.outros, dtype=np.intc)
+    if simbolos:
+        chaves = np.array([cp for cp, _ in simbolos], dtype=np.uint32)
+        valores = np.array([coluna for _, coluna in simbolos], dtype=np.intc)
+        posicao = np.minimum(np.searchsorted(chaves, pontos), len(chaves) - 1)
+        encontrado = chaves[posicao] == pontos
+        colunas[encontrado] = valores[posicao[encontrado]]
+
+    inicios = np.cumsum(tamanhos) - tamanhos
+    cadeia_de = np.repeat(np.arange(len(cadeias)), tamanhos)
+    posicao_na_cadeia = np.arange(total) - np.repeat(inicios, tamanhos)
+    matriz[posicao_na_cadeia, cadeia_de] = colunas
+    return matriz, tamanhos
+
+
+def aceita_vetorizado(compilado, cadeias) -> np.ndarray:
+    """
+    Simula o AFD compilado sobre todas as cadeias de uma vez e devolve um
+    array booleano com o mesmo significado de `aceita` para cada uma.
+
+    As cadeias são ordenadas por tamanho decrescente, de modo que as que
+    ainda estão ativas na coluna j formam um prefixo; cada passo é uma única
+    indexação `estados[:k] = tabela[estados[:k] + simbolos[j, :k]]`.
+    """
+    _exigir_numpy()
+    cadeias = cadeias if isinstance(cadeias, list) else list(cadeias)
+    if not cadeias:
+        return np.zeros(0, dtype=bool)
+
+    tabela = np.frombuffer(compilado.tabela, dtype=np.intc)
+    finais = np.frombuffer(compilado.finais, dtype=np.uint8)
+
+    matriz, tamanhos = codificar_cadeias(compilado, cadeias)
+    ordem = np.argsort(-tamanhos, kind='stable')
+    matriz = np.ascontiguousarray(matriz[:, ordem])
+    # ativas[j] = número de cadeias com tamanho > j
+    ativas = len(cadeias) - np.cumsum(np.bincount(tamanhos, minlength=matriz.shape[0] + 1))
+
+    estados = np.full(len(cadeias), compilado.inicial, dtype=np.intc)
+    for j in range(matriz.shape[0]):
+        k = int(ativas[j])
+        estados[:k] = tabela[estados[:k] + matriz[j, :k]]
+
+    resultado = np.empty(len(cadeias), dtype=bool)
+    resultado[ordem] = finais[estados].astype(bool)
+    return resultado
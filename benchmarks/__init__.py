@@ -0,0 +1,8 @@
+"""
+benchmarks: cargas reprodutíveis e medição de desempenho dos pacotes
+`automatos` e `gramatica_livre_contexto`.
+
+    python -m benchmarks.executar -o antes.json
+    python -m benchmarks.executar -o depois.json
+    python -m benchmarks.comparar antes.json depois.json
+"""
@@ -0,0 +1,313 @@
+"""
+Cargas de trabalho reprodutíveis para os benchmarks.
+
+Cada `Carga` separa a preparação (gerar textos, autómatos, ficheiros), que
+não é medida, da operação medida. Todos os dados são gerados com sementes
+fixas, e `escala` multiplica os tamanhos para correr versões rápidas ou
+pesadas do mesmo conjunto.
+"""
+from __future__ import annotations
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+from automatos import (AFD, AFND, AFDBuscaPadrao, AFDBuscaMultiPadrao, AFNDBuscaPadrao, AFNDCompacto,
+                       compilar_regex)
+from automatos.regex import limpar_cache_regex
+from gramatica_livre_contexto import GLC, conversao_AFD_para_GLC, conversao_GLC_para_AP
+
+
+class Carga:
+    """
+    Uma operação a medir.
+
+    `preparar(escala)` devolve os dados da carga e `executar(dados)` é a
+    operação medida. `unidades(dados)` diz quantas unidades (`unidade`) cada
+    execução processa, para calcular a vazão. `finalizar(dados)`, se existir,
+    liberta o que a preparação criou (ficheiros temporários).
+    """
+    __slots__ = ('nome', 'unidade', 'preparar', 'executar', 'unidades', 'finalizar')
+
+    def __init__(self, nome: str, unidade: str, preparar, executar, unidades, finalizar=None):
+        self.nome = nome
+        self.unidade = unidade
+        self.preparar = preparar
+        self.executar = executar
+        self.unidades = unidades
+        self.finalizar = finalizar
+
+
+def texto_aleatorio(tamanho: int, alfabeto: str, semente: int = 0) -> str:
+    aleatorio = random.Random(semente)
+    return ''.join(aleatorio.choices(alfabeto, k=tamanho))
+
+
+def afd_aleatorio(estados: int, alfabeto: str, semente: int = 0) -> AFD:
+    aleatorio = random.Random(semente)
+    nomes = [f"q{i}" for i in range(estados)]
+    return AFD(
+        estados=set(nomes),
+        alfabeto=set(alfabeto),
+        transicoes={q: {s: aleatorio.choice(nomes) for s in alfabeto} for q in nomes},
+        estado_inicial=nomes[0],
+        estados_finais={q for q in nomes if aleatorio.random() < 0.3},
+    )
+
+
+def afnd_cadeia_epsilon(profundidade: int, ramos: int = 3) -> AFND:
+    """
+    AFND com uma cadeia q0 -&-> q1 -&-> ... de `profundidade` estados, em que
+    cada estado tem ainda `ramos` transições & para estados anteriores (ciclos)
+    e uma transição 'a' para o seguinte.
+    """
+    afnd = AFND(alfabeto={'a'}, estado_inicial='q0', estados_finais={f"q{profundidade - 1}"})
+    afnd.estados = {f"q{i}" for i in range(profundidade)}
+    aleatorio = random.Random(profundidade)
+    for i in range(profundidade - 1):
+        afnd.transicoes[f"q{i}"][AFND.EPSILON].add(f"q{i + 1}")
+        afnd.transicoes[f"q{i}"]['a'].add(f"q{i + 1}")
+        for _ in range(ramos):
+            afnd.transicoes[f"q{i}"][AFND.EPSILON].add(f"q{aleatorio.randrange(i + 1)}")
+    return afnd
+
+
+def glc_aritmetica(profundidade: int) -> GLC:
+    """
+    Gramática de expressões com `profundidade` níveis de precedência:
+    E0 -> E0 op0 E1 | E1, ..., En -> ( E0 ) | n.
+    """
+    regras = {}
+    for nivel in range(profundidade):
+        atual, seguinte = f"E{nivel}", f"E{nivel + 1}"
+        regras[atual] = [[atual, f"o{nivel}", seguinte], [seguinte]]
+    regras[f"E{profundidade}"] = [['(', 'E0', ')'], ['n']]
+    return GLC(
+        V=set(regras),
+        E={'(', ')', 'n'} | {f"o{nivel}" for nivel in range(profundidade)},
+        R=regras,
+        S='E0',
+    )
+
+
+def expressao(tamanho: int, profundidade: int, semente: int = 0) -> list[str]:
+    """Sequência de tokens válida para `glc_aritmetica(profundidade)`."""
+    aleatorio = random.Random(semente)
+    tokens = ['n']
+    while len(tokens) < tamanho:
+        tokens += [f"o{aleatorio.randrange(profundidade)}", 'n']
+    return tokens
+
+
+def _ficheiro_temporario(sufixo: str) -> str:
+    descritor, caminho = tempfile.mkstemp(suffix=sufixo)
+    os.close(descritor)
+    return caminho
+
+
+# --- Busca de padrões ---
+
+def _preparar_busca_aleatoria(escala):
+    return AFDBuscaPadrao("gattaca"), texto_aleatorio(int(1_000_000 * escala), "acgt")
+
+
+def _preparar_busca_unicode(escala):
+    # Texto com a maioria dos caracteres fora do alfabeto do padrão.
+    return AFDBuscaPadrao("gattaca"), texto_aleatorio(int(1_000_000 * escala), "gatcáéõ€中文字😀 ", semente=9)
+
+
+def _preparar_busca_adversaria(escala):
+    # Quase-ocorrências sobrepostas: o pior caso das buscas ingénuas.
+    padrao = 'a' * 63 + 'b'
+    return padrao, ('a' * 63 + 'c') * int(15_000 * escala)
+
+
+def _preparar_busca_afnd(escala):
+    return AFNDBuscaPadrao("gattaca"), texto_aleatorio(int(1_000_000 * escala), "acgt", semente=1)
+
+
+def _preparar_multipadrao(escala):
+    aleatorio = random.Random(2)
+    padroes = {texto_aleatorio(aleatorio.randint(4, 12), "acgt", semente=i) for i in range(200)}
+    return AFDBuscaMultiPadrao(sorted(padroes)), texto_aleatorio(int(500_000 * escala), "acgt", semente=3)
+
+
+def _preparar_padrao_longo(escala):
+    return texto_aleatorio(int(20_000 * escala), "abcdefghijklmnopqrstuvwxyz", semente=4)
+
+
+def _preparar_padroes_curtos(escala):
+    return [texto_aleatorio(8, "abcdefgh", semente=i) for i in range(int(5_000 * escala))]
+
+
+def _construir_buscas(padroes):
+    for padrao in padroes:
+        AFDBuscaPadrao(padrao)
+
+
+# --- Expressões regulares ---
+
+def _preparar_regex(escala):
+    aleatorio = random.Random(7)
+    return [f"({texto_aleatorio(4, 'abc', semente=i)}|[a-c]{aleatorio.choice('*+?')})*"
+            f"{texto_aleatorio(3, 'abc', semente=-i)}" for i in range(int(500 * escala))]
+
+
+def _compilar_regex(expressoes):
+    # Sem cache: mede Thompson + construção de subconjuntos.
+    limpar_cache_regex()
+    for expressao in expressoes:
+        compilar_regex(expressao)
+
+
+def _preparar_filtro_produto(escala):
+    registos = [texto_aleatorio(40, "abAB", semente=i) for i in range(int(20_000 * escala))]
+    filtro = (compilar_regex(".*b") & AFDBuscaPadrao("AB")) - compilar_regex(".*aa.*")
+    return filtro, registos
+
+
+def _filtrar(dados):
+    filtro, registos = dados
+    for registo in registos:
+        filtro.aceita(registo)
+
+
+# --- Importação ---
+
+def _preparar_importacao(escala):
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    codigo = "from automatos import AFDBuscaPadrao; from gramatica_livre_contexto import GLC"
+    return [sys.executable, '-c', codigo], dict(os.environ, PYTHONPATH=raiz)
+
+
+def _executar_importacao(dados):
+    # Um interpretador novo em cada execução: o tempo inclui o arranque do Python.
+    comando, ambiente = dados
+    subprocess.run(comando, env=ambiente, check=True, stdout=subprocess.DEVNULL)
+
+
+# --- ε-fechos ---
+
+def _preparar_e_fecho(escala):
+    afnd = afnd_cadeia_epsilon(int(5_000 * escala))
+    return {
+        'estados': set(afnd.estados),
+        'transicoes': {q: {s: set(d) for s, d in t.items()} for q, t in afnd.transicoes.items()},
+        'finais': set(afnd.estados_finais),
+    }
+
+
+def _executar_e_fecho(dados):
+    # Um AFND novo em cada execução: mede-se o cálculo dos fechos, não o cache.
+    afnd = AFND(dados['estados'], {'a'}, dados['transicoes'], 'q0', dados['finais'])
+    afnd.e_fecho('q0')
+
+
+# --- Ficheiros ---
+
+def _preparar_arquivo_afd(escala, binario: bool):
+    afd = afd_aleatorio(int(20_000 * escala), "abcd", semente=5)
+    caminho = _ficheiro_temporario('.dfa')
+    afd.salvar_automato(caminho, binario=binario)
+    return caminho, len(afd.estados)
+
+
+def _abrir_arquivo_afd(dados):
+    # Fecha logo o AFD: o ficheiro binário fica mapeado até `fechar()`, e o
+    # ficheiro é apagado na limpeza.
+    with AFD.abrir_arquivo(dados[0]):
+        pass
+
+
+def _remover_ficheiro(dados):
+    os.remove(dados[0])
+
+
+def _preparar_arquivo_afnd(escala):
+    afnd = afnd_cadeia_epsilon(int(20_000 * escala))
+    caminho = _ficheiro_temporario('.nfa')
+    afnd.salvar_automato(caminho)
+    return caminho, len(afnd.estados)
+
+
+# --- Representação compacta ---
+
+def _preparar_arestas_afnd(escala):
+    estados = int(100_000 * escala)
+    aleatorio = random.Random(8)
+    arestas = []
+    for i in range(estados):
+        for simbolo in 'ab':
+            arestas.append((f"q{i}", simbolo, f"q{aleatorio.randrange(estados)}"))
+        arestas.append((f"q{i}", AFND.EPSILON, f"q{(i + 1) % estados}"))
+    return arestas
+
+
+# --- Gramáticas ---
+
+def _preparar_afd_para_glc(escala):
+    return afd_aleatorio(int(20_000 * escala), "abcd", semente=6)
+
+
+def _preparar_glc(escala):
+    return glc_aritmetica(max(1, int(40 * escala)))
+
+
+def _preparar_parse(escala, tamanho: int):
+    profundidade = 6
+    return glc_aritmetica(profundidade), expressao(int(tamanho * escala), profundidade)
+
+
+def _executar_cyk(dados):
+    glc, tokens = dados
+    glc.reconhecedor_cyk().aceita(tokens)
+
+
+CARGAS = [
+    Carga("buscar_afd_aleatorio", "caracteres", _preparar_busca_aleatoria,
+          lambda dados: dados[0].buscar(dados[1]), lambda dados: len(dados[1])),
+    Carga("buscar_afd_unicode", "caracteres", _preparar_busca_unicode,
+          lambda dados: dados[0].buscar(dados[1]), lambda dados: len(dados[1])),
+    Carga("buscar_afd_adversario", "caracteres", _preparar_busca_adversaria,
+          lambda dados: AFDBuscaPadrao(dados[0]).buscar(dados[1]), lambda dados: len(dados[1])),
+    Carga("buscar_afnd_aleatorio", "caracteres", _preparar_busca_afnd,
+          lambda dados: dados[0].buscar(dados[1]), lambda dados: len(dados[1])),
+    Carga("buscar_afnd_conjuntos", "caracteres", lambda escala: _preparar_busca_afnd(escala / 10),
+          lambda dados: dados[0].buscar(dados[1], bitparalelo=False), lambda dados: len(dados[1])),
+    Carga("buscar_multipadrao", "caracteres", _preparar_multipadrao,
+          lambda dados: dados[0].buscar(dados[1]), lambda dados: len(dados[1])),
+    Carga("construir_padrao_longo", "caracteres do padrão", _preparar_padrao_longo,
+          AFDBuscaPadrao, len),
+    Carga("construir_buscas_curtas", "construções", _preparar_padroes_curtos,
+          _construir_buscas, len),
+    Carga("compilar_regex", "expressões", _preparar_regex,
+          _compilar_regex, len),
+    Carga("filtro_produto", "registos", _preparar_filtro_produto,
+          _filtrar, lambda dados: len(dados[1])),
+    Carga("importar_pacotes", "importações", _preparar_importacao,
+          _executar_importacao, lambda dados: 1),
+    Carga("e_fecho_cadeia_profunda", "estados", _preparar_e_fecho,
+          _executar_e_fecho, lambda dados: len(dados['estados'])),
+    Carga("abrir_arquivo_afd_texto", "estados", lambda escala: _preparar_arquivo_afd(escala, False),
+          _abrir_arquivo_afd, lambda dados: dados[1], _remover_ficheiro),
+    Carga("abrir_arquivo_afd_binario", "estados", lambda escala: _preparar_arquivo_afd(escala, True),
+          _abrir_arquivo_afd, lambda dados: dados[1], _remover_ficheiro),
+    Carga("from_file_afnd_texto", "estados", _preparar_arquivo_afnd,
+          lambda dados: AFND.from_file(dados[0]), lambda dados: dados[1], _remover_ficheiro),
+    Carga("construir_afnd_compacto", "arestas", _preparar_arestas_afnd,
+          lambda arestas: AFNDCompacto.de_arestas(arestas, 'q0', {'q1'}), len),
+    Carga("conversao_afd_para_glc", "estados", _preparar_afd_para_glc,
+          conversao_AFD_para_GLC, lambda afd: len(afd.estados)),
+    Carga("conversao_glc_para_ap", "produções", _preparar_glc,
+          conversao_GLC_para_AP, lambda glc: sum(map(len, glc.R.values()))),
+    Carga("glc_para_fnc", "produções", _preparar_glc,
+          lambda glc: glc.para_FNC(), lambda glc: sum(map(len, glc.R.values()))),
+    Carga("earley_expressao", "tokens", lambda escala: _preparar_parse(escala, 2_000),
+          lambda dados: dados[0].parser_earley().aceita(dados[1]), lambda dados: len(dados[1])),
+    Carga("cyk_expressao", "tokens", lambda escala: _preparar_parse(escala, 120),
+          _executar_cyk, lambda dados: len(dados[1])),
+    Carga("lalr_expressao", "tokens", lambda escala: _preparar_parse(escala, 20_000),
+          lambda dados: dados[0].tabela_lr().aceita(dados[1]), lambda dados: len(dados[1])),
+]
+
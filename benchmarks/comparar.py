@@ -0,0 +1,56 @@
+"""
+Compara dois relatórios de `benchmarks.executar` (por exemplo, de dois commits).
+
+Uso:
+    python -m benchmarks.comparar antes.json depois.json [--limiar 10]
+
+Para cada carga presente nos dois relatórios mostra a razão entre as
+latências p50 e entre os picos de memória. Cargas mais lentas do que o
+limiar (em %) são marcadas, e o código de saída é 1 se houver alguma.
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+
+
+def comparar(antes: dict, depois: dict, limiar: float = 10.0) -> list[str]:
+    """Imprime a comparação e devolve os nomes das cargas que regrediram."""
+    regressoes = []
+    print(f"{'carga':<28} {'p50 antes':>12} {'p50 depois':>12} {'razão':>8} {'memória':>8}")
+    for nome, novo in depois['resultados'].items():
+        antigo = antes['resultados'].get(nome)
+        if antigo is None:
+            print(f"{nome:<28} (nova)")
+            continue
+        p50_antes = antigo['latencia_s']['p50']
+        p50_depois = novo['latencia_s']['p50']
+        razao = p50_depois / p50_antes if p50_antes else float('inf')
+        memoria = (novo['pico_memoria_bytes'] / antigo['pico_memoria_bytes']
+                   if antigo['pico_memoria_bytes'] else float('inf'))
+        marca = ""
+        if razao > 1 + limiar / 100:
+            marca = "  <-- regressão"
+            regressoes.append(nome)
+        print(f"{nome:<28} {p50_antes * 1e3:>10.2f}ms {p50_depois * 1e3:>10.2f}ms "
+              f"{razao:>7.2f}x {memoria:>7.2f}x{marca}")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('antes')
+    parser.add_argument('depois')
+    parser.add_argument('--limiar', type=float, default=10.0, help="tolerância de abrandamento, em %%")
+    argumentos = parser.parse_args(argv)
+
+    with open(argumentos.antes, encoding='utf-8') as f:
+        antes = json.load(f)
+    with open(argumentos.depois, encoding='utf-8') as f:
+        depois = json.load(f)
+    if comparar(antes, depois, argumentos.limiar):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
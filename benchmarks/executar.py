@@ -0,0 +1,123 @@
+"""
+Executa as cargas de `benchmarks.cargas` e escreve os resultados em JSON.
+
+Uso:
+    python -m benchmarks.executar [-o resultados.json] [-r 7] [--escala 0.1] [-f buscar]
+
+Para cada carga são medidas `repeticoes` execuções (depois de uma de
+aquecimento): latência mínima, média, máxima e percentis 50/90/99, vazão
+(unidades por segundo, pela mediana) e o pico de memória alocada durante
+uma execução adicional com `tracemalloc`, que não entra nos tempos.
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from .cargas import CARGAS, Carga
+
+
+def percentil(valores: list[float], p: float) -> float:
+    """Percentil `p` (0-100) por interpolação linear entre os valores ordenados."""
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+def medir(carga: Carga, repeticoes: int, escala: float) -> dict:
+    dados = carga.preparar(escala)
+    try:
+        unidades = carga.unidades(dados)
+        carga.executar(dados)
+
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            carga.executar(dados)
+            tempos.append(time.perf_counter() - inicio)
+
+        tracemalloc.start()
+        try:
+            carga.executar(dados)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        if carga.finalizar is not None:
+            carga.finalizar(dados)
+
+    mediana = percentil(tempos, 50)
+    return {
+        'unidade': carga.unidade,
+        'unidades': unidades,
+        'repeticoes': repeticoes,
+        'latencia_s': {
+            'min': min(tempos),
+            'media': sum(tempos) / len(tempos),
+            'p50': mediana,
+            'p90': percentil(tempos, 90),
+            'p99': percentil(tempos, 99),
+            'max': max(tempos),
+        },
+        'vazao_por_s': unidades / mediana if mediana > 0 else None,
+        'pico_memoria_bytes': pico,
+    }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar(filtro: str | None = None, repeticoes: int = 7, escala: float = 1.0) -> dict:
+    """Mede as cargas cujo nome contém `filtro` (todas, se None) e devolve o relatório."""
+    resultados = {}
+    for carga in CARGAS:
+        if filtro and filtro not in carga.nome:
+            continue
+        resultados[carga.nome] = resultado = medir(carga, repeticoes, escala)
+        latencia = resultado['latencia_s']
+        print(f"{carga.nome:<28} p50 {latencia['p50'] * 1e3:>10.2f} ms | p99 {latencia['p99'] * 1e3:>10.2f} ms | "
+              f"{resultado['vazao_por_s']:>14,.0f} {carga.unidade}/s | "
+              f"pico {resultado['pico_memoria_bytes'] / 2**20:>8.2f} MiB", file=sys.stderr)
+    return {
+        'meta': {
+            'commit': _commit(),
+            'data': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'escala': escala,
+        },
+        'resultados': resultados,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-o', '--saida', help="ficheiro JSON de saída (por omissão, o stdout)")
+    parser.add_argument('-r', '--repeticoes', type=int, default=7)
+    parser.add_argument('--escala', type=float, default=1.0, help="multiplica o tamanho das cargas")
+    parser.add_argument('-f', '--filtro', help="só as cargas cujo nome contém este texto")
+    argumentos = parser.parse_args(argv)
+
+    relatorio = executar(argumentos.filtro, argumentos.repeticoes, argumentos.escala)
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if argumentos.saida:
+        with open(argumentos.saida, 'w', encoding='utf-8') as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
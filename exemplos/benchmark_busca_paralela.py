@@ -0,0 +1,33 @@
+from __future__ import annotations
+import random
+import sys
+import os
+import time
+
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from automatos import AFDBuscaPadrao
+
+
+def gerar_texto(tamanho: int, alfabeto: str, semente: int = 0) -> str:
+    aleatorio = random.Random(semente)
+    return ''.join(aleatorio.choices(alfabeto, k=tamanho))
+
+
+if __name__ == "__main__":
+    texto = gerar_texto(20_000_000, "acgt")
+    busca = AFDBuscaPadrao("gattaca")
+
+    inicio = time.perf_counter()
+    esperado = busca.buscar(texto)
+    tempo_sequencial = time.perf_counter() - inicio
+    print(f"sequencial | {tempo_sequencial:.3f}s | {len(esperado)} ocorrências")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        inicio = time.perf_counter()
+        ocorrencias = busca.buscar_paralelo(texto, workers=workers)
+        tempo = time.perf_counter() - inicio
+        assert ocorrencias == esperado
+        print(f"{workers:>3} processos | {tempo:.3f}s | aceleração {tempo_sequencial / tempo:.2f}x")
+        workers *= 2
@@ -0,0 +1,46 @@
+from __future__ import annotations
+import random
+import sys
+import os
+import time
+
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from gramatica_livre_contexto import GLC
+
+
+def gramatica_expressoes() -> GLC:
+    """Gramática ambígua de expressões: E -> E + E | E * E | ( E ) | n."""
+    return GLC(
+        V={'E'},
+        E={'+', '*', '(', ')', 'n'},
+        R={'E': [['E', '+', 'E'], ['E', '*', 'E'], ['(', 'E', ')'], ['n']]},
+        S='E',
+    )
+
+
+def gerar_expressao(tamanho: int, semente: int = 0) -> str:
+    """Gera uma expressão válida com cerca de `tamanho` símbolos."""
+    aleatorio = random.Random(semente)
+    partes = ['n']
+    while len(partes) < tamanho:
+        partes.append(aleatorio.choice('+*'))
+        partes.append('n')
+    return ''.join(partes)
+
+
+if __name__ == "__main__":
+    glc = gramatica_expressoes()
+    fnc = glc.para_FNC()
+    regras = sum(len(producoes) for producoes in fnc.R.values())
+    print(f"FNC: {len(fnc.V)} variáveis, {regras} produções")
+
+    cyk = glc.reconhecedor_cyk()
+    for n in [25, 50, 100, 200, 400]:
+        cadeia = gerar_expressao(n)
+        inicio = time.perf_counter()
+        aceita = cyk.aceita(cadeia)
+        tempo = time.perf_counter() - inicio
+        # Se o custo for O(n³·|R|), a última coluna fica aproximadamente constante.
+        print(f"n = {len(cadeia):>4} | aceita = {aceita} | {tempo:.4f}s | "
+              f"tempo/(n³·|R|) = {tempo / (len(cadeia) ** 3 * regras) * 1e9:.2f} ns")
@@ -0,0 +1,52 @@
+from __future__ import annotations
+import random
+import sys
+import os
+import time
+
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from automatos import AFD
+
+
+def gerar_afd_redundante(estados_minimos: int, copias: int, alfabeto: str, semente: int = 0) -> AFD:
+    """
+    Gera um AFD com estados_minimos * copias estados: cada estado de um AFD
+    aleatório é replicado `copias` vezes e cada transição aponta para uma cópia
+    qualquer do destino, de modo que todas as cópias são equivalentes.
+    """
+    aleatorio = random.Random(semente)
+    destinos = [{s: aleatorio.randrange(estados_minimos) for s in alfabeto} for _ in range(estados_minimos)]
+    finais = {q for q in range(estados_minimos) if aleatorio.random() < 0.3}
+
+    transicoes = {}
+    for q in range(estados_minimos):
+        for c in range(copias):
+            transicoes[f"q{q}_{c}"] = {
+                s: f"q{destinos[q][s]}_{aleatorio.randrange(copias)}" for s in alfabeto
+            }
+
+    return AFD(
+        estados=set(transicoes),
+        alfabeto=set(alfabeto),
+        transicoes=transicoes,
+        estado_inicial="q0_0",
+        estados_finais={f"q{q}_{c}" for q in finais for c in range(copias)},
+    )
+
+
+if __name__ == "__main__":
+    alfabeto = "abcd"
+    for estados_minimos, copias in [(1_000, 10), (10_000, 10), (25_000, 8)]:
+        afd = gerar_afd_redundante(estados_minimos, copias, alfabeto)
+
+        inicio = time.perf_counter()
+        afd.compilar()
+        tempo_compilacao = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        minimo = afd.minimizar()
+        tempo_minimizacao = time.perf_counter() - inicio
+
+        print(f"{len(afd.estados):>7} estados -> {len(minimo.estados):>6} estados | "
+              f"compilação {tempo_compilacao:.3f}s | minimização {tempo_minimizacao:.3f}s")
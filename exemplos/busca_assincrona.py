@@ -0,0 +1,39 @@
+from __future__ import annotations
+import asyncio
+import random
+import sys
+import os
+
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from automatos import AFDBuscaPadrao
+
+
+def gerar_texto(tamanho: int, alfabeto: str, semente: int = 0) -> str:
+    aleatorio = random.Random(semente)
+    return ''.join(aleatorio.choices(alfabeto, k=tamanho))
+
+
+async def alimentar(leitor: asyncio.StreamReader, dados: bytes, tamanho_pacote: int):
+    """Simula uma ligação: entrega os dados ao leitor em pacotes, cedendo o ciclo entre eles."""
+    for inicio in range(0, len(dados), tamanho_pacote):
+        leitor.feed_data(dados[inicio:inicio + tamanho_pacote])
+        await asyncio.sleep(0)
+    leitor.feed_eof()
+
+
+async def main():
+    texto = gerar_texto(2_000_000, "acgt")
+    busca = AFDBuscaPadrao("gattaca")
+
+    leitor = asyncio.StreamReader()
+    produtor = asyncio.create_task(alimentar(leitor, texto.encode(), 1500))
+    ocorrencias = [posicao async for posicao in busca.buscar_async(leitor)]
+    await produtor
+
+    assert ocorrencias == busca.buscar(texto)
+    print(f"{len(ocorrencias)} ocorrências de {busca.padrao!r} em {len(texto)} caracteres recebidos em pacotes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
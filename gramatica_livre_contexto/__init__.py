@@ -1,8 +1,32 @@
-# Expõe as classes principais para que possam ser importadas diretamente
-from .glc import GLC
-from .conversao import conversao_AFD_para_GLC, conversao_GLC_para_AP
+"""
+gramatica_livre_contexto: Gramáticas Livres-do-Contexto e conversões.
+
+Os submódulos só são importados quando um dos nomes abaixo é usado pela
+primeira vez.
+"""
+from importlib import import_module
 
 
+# Expõe as classes principais para que possam ser importadas diretamente
+_EXPORTACOES = {
+    'GLC': '.glc',
+    'conversao_AFD_para_GLC': '.conversao',
+    'conversao_GLC_para_AP': '.conversao',
+    'ConflitoGramatica': '.tabelas',
+}
+
+__all__ = list(_EXPORTACOES)
 __version__ = "1.0.0"
 
-print("Pacote 'gramatica_livre_contexto' carregado.")
\ No newline at end of file
+
+def __getattr__(nome):
+    modulo = _EXPORTACOES.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(import_module(modulo, __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTACOES))
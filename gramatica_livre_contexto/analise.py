@@ -0,0 +1,185 @@
+"""
+Conjuntos de análise de uma GLC: anuláveis, produtivas, alcançáveis, úteis,
+FIRST e FOLLOW.
+
+Todos são calculados com listas de trabalho, sem repetir voltas completas
+sobre a gramática: anuláveis e produtivas com contadores de símbolos em falta
+por produção, alcançáveis e úteis com uma busca a partir da variável inicial,
+e FIRST/FOLLOW propagando apenas os terminais novos pelas arestas de inclusão
+entre variáveis.
+"""
+from __future__ import annotations
+
+from .earley import normalizar_producao
+
+
+# Marcador de fim de entrada nos conjuntos FOLLOW.
+FIM = '$'
+
+
+def _fecho_por_contagem(regras, variaveis, conta) -> set:
+    """
+    Ponto fixo do tipo "a variável entra quando todos os símbolos relevantes
+    de alguma produção já entraram". `conta(simbolo)` diz se um símbolo tem de
+    entrar no conjunto para a produção ficar satisfeita; devolve None se o
+    símbolo torna a produção impossível.
+    """
+    conjunto = set()
+    dependentes = {}
+    faltam = []
+    pendentes = []
+    for indice, (variavel, simbolos) in enumerate(regras):
+        total = 0
+        for simbolo in simbolos:
+            relevante = conta(simbolo)
+            if relevante is None:
+                total = None
+                break
+            if relevante:
+                total += 1
+                dependentes.setdefault(simbolo, []).append(indice)
+        faltam.append(total)
+        if total == 0:
+            pendentes.append(variavel)
+    while pendentes:
+        variavel = pendentes.pop()
+        if variavel in conjunto:
+            continue
+        conjunto.add(variavel)
+        for indice in dependentes.get(variavel, ()):
+            if faltam[indice] is not None:
+                faltam[indice] -= 1
+                if faltam[indice] == 0:
+                    pendentes.append(regras[indice][0])
+    return conjunto
+
+
+def _alcancaveis(regras_de, inicial, regras) -> set:
+    alcancaveis = {inicial}
+    pilha = [inicial]
+    while pilha:
+        variavel = pilha.pop()
+        for indice in regras_de.get(variavel, ()):
+            for simbolo in regras[indice][1]:
+                if simbolo in regras_de and simbolo not in alcancaveis:
+                    alcancaveis.add(simbolo)
+                    pilha.append(simbolo)
+    return alcancaveis
+
+
+def _propagar(diretos: dict, arestas: dict) -> dict:
+    """
+    Resolve o sistema conjunto[B] ⊇ diretos[B] ∪ conjunto[A] para cada aresta
+    A -> B, enviando por cada aresta só os elementos que ainda não passaram.
+    """
+    conjuntos = {variavel: set(elementos) for variavel, elementos in diretos.items()}
+    pendentes = {variavel: set(elementos) for variavel, elementos in diretos.items() if elementos}
+    while pendentes:
+        variavel, novos = pendentes.popitem()
+        for destino in arestas.get(variavel, ()):
+            acrescentar = novos - conjuntos[destino]
+            if acrescentar:
+                conjuntos[destino] |= acrescentar
+                pendentes.setdefault(destino, set()).update(acrescentar)
+    return conjuntos
+
+
+class AnaliseGramatica:
+    """
+    Conjuntos de análise de uma gramática no formato de `GLC.R`.
+
+    `primeiros[A]` não inclui 'ε' (a anulabilidade está em `anulaveis`) e
+    `seguintes[A]` usa `FIM` para o fim da entrada. `uteis` são as variáveis
+    produtivas alcançáveis a partir da inicial só através de produções cujos
+    símbolos são todos produtivos.
+    """
+
+    def __init__(self, R: dict, S, V=()):
+        self.inicial = S
+        self.variaveis = set(R) | set(V) | {S}
+        regras = []
+        regras_de = {variavel: [] for variavel in self.variaveis}
+        for variavel, producoes in R.items():
+            for producao in producoes:
+                regras_de[variavel].append(len(regras))
+                regras.append((variavel, normalizar_producao(producao)))
+        self.regras = regras
+        self.regras_de = regras_de
+        variaveis = self.variaveis
+        self.terminais = {s for _, simbolos in regras for s in simbolos if s not in variaveis}
+
+        self.anulaveis = _fecho_por_contagem(
+            regras, variaveis, lambda s: True if s in variaveis else None)
+        self.produtivas = _fecho_por_contagem(
+            regras, variaveis, lambda s: s in variaveis)
+        self.alcancaveis = _alcancaveis(regras_de, S, regras)
+
+        produtivas = self.produtivas
+        regras_produtivas = {
+            variavel: [i for i in indices if all(s in produtivas or s not in variaveis for s in regras[i][1])]
+            for variavel, indices in regras_de.items() if variavel in produtivas
+        }
+        self.uteis = _alcancaveis(regras_produtivas, S, regras) if S in produtivas else set()
+
+        self.primeiros = self._calcular_primeiros()
+        self.seguintes = self._calcular_seguintes()
+
+    def _calcular_primeiros(self) -> dict:
+        diretos = {variavel: set() for variavel in self.variaveis}
+        # arestas[B] = variáveis A com FIRST(A) ⊇ FIRST(B)
+        arestas = {}
+        for variavel, simbolos in self.regras:
+            for simbolo in simbolos:
+                if simbolo in self.variaveis:
+                    arestas.setdefault(simbolo, set()).add(variavel)
+                    if simbolo in self.anulaveis:
+                        continue
+                else:
+                    diretos[variavel].add(simbolo)
+                break
+        return _propagar(diretos, arestas)
+
+    def _calcular_seguintes(self) -> dict:
+        diretos = {variavel: set() for variavel in self.variaveis}
+        diretos[self.inicial].add(FIM)
+        # arestas[A] = variáveis B com FOLLOW(B) ⊇ FOLLOW(A)
+        arestas = {}
+        for variavel, simbolos in self.regras:
+            # Percorre a produção da direita para a esquerda com FIRST do sufixo.
+            sufixo = set()
+            sufixo_anulavel = True
+            for simbolo in reversed(simbolos):
+                if simbolo in self.variaveis:
+                    diretos[simbolo] |= sufixo
+                    if sufixo_anulavel:
+                        arestas.setdefault(variavel, set()).add(simbolo)
+                    if simbolo in self.anulaveis:
+                        sufixo = sufixo | self.primeiros[simbolo]
+                    else:
+                        sufixo = set(self.primeiros[simbolo])
+                        sufixo_anulavel = False
+                else:
+                    sufixo = {simbolo}
+                    sufixo_anulavel = False
+        return _propagar(diretos, arestas)
+
+    def primeiros_de(self, simbolos) -> tuple[set, bool]:
+        """FIRST de uma sequência de símbolos e se ela é anulável."""
+        resultado = set()
+        for simbolo in normalizar_producao(simbolos):
+            if simbolo not in self.variaveis:
+                resultado.add(simbolo)
+                return resultado, False
+            resultado |= self.primeiros[simbolo]
+            if simbolo not in self.anulaveis:
+                return resultado, False
+        return resultado, True
+
+    def regras_uteis(self, R: dict) -> dict:
+        """As produções de `R` que só usam variáveis úteis, restritas às variáveis úteis."""
+        uteis = self.uteis
+        variaveis = self.variaveis
+        return {
+            variavel: [p for p in producoes if all(s in uteis or s not in variaveis for s in p)]
+            for variavel, producoes in R.items() if variavel in uteis
+        }
@@ -62,9 +62,12 @@ def conversao_GLC_para_AP(glc: GLC) -> AP:
     simbolo_inicial_pilha = glc.S + '$'
     funcao_de_transicao[('q_inicio', 'ε', 'ε')] = {('q_loop', simbolo_inicial_pilha)}
 
-    # Regra 2: Transições para as regras de produção da gramática
-    for variavel in glc.R:
-        producoes = glc.R[variavel]
+    # Regra 2: Transições para as regras de produção da gramática. Só as
+    # produções úteis geram transições: as variáveis improdutivas ou
+    # inalcançáveis nunca levam à aceitação.
+    regras_uteis = glc.analise().regras_uteis(glc.R)
+    for variavel in regras_uteis:
+        producoes = regras_uteis[variavel]
         for producao in producoes:
             
             chave_transicao = ('q_loop', 'ε', variavel)
@@ -72,10 +75,11 @@ def conversao_GLC_para_AP(glc: GLC) -> AP:
             if chave_transicao not in funcao_de_transicao:
                 funcao_de_transicao[chave_transicao] = set()
 
+            # O primeiro símbolo da cadeia empilhada fica no topo da pilha,
+            # como em 'S$' acima, por isso a produção é empilhada tal como está.
             producao_para_empilhar = ""
             if producao: 
-                producao_invertida_lista = list(reversed(producao))
-                producao_para_empilhar = "".join(producao_invertida_lista)
+                producao_para_empilhar = "".join(producao)
             else: 
                 producao_para_empilhar = 'ε' 
             funcao_de_transicao[chave_transicao].add(('q_loop', producao_para_empilhar))
@@ -0,0 +1,316 @@
+"""
+Reconhecimento e análise sintática de GLCs com o algoritmo de Earley.
+
+O reconhecedor trata produções vazias (`['ε']`) com a correção de Aycock e
+Horspool: ao prever uma variável anulável, o item também avança sobre ela. O
+custo é O(n³) no pior caso, O(n²) em gramáticas não ambíguas e quase linear
+na maioria das gramáticas práticas.
+
+A análise devolve uma floresta sintática partilhada e compactada (SPPF): cada
+nó (símbolo, início, fim) aparece uma única vez e guarda todas as suas
+derivações alternativas. As produções são binarizadas através de nós
+intermédios (regra, ponto, início, fim), o que mantém a floresta com tamanho
+cúbico mesmo em gramáticas muito ambíguas.
+"""
+from __future__ import annotations
+
+
+EPSILON = 'ε'
+
+
+def normalizar_producao(producao) -> tuple:
+    """Converte uma produção do dicionário `R` num tuplo de símbolos, sem 'ε'."""
+    return tuple(simbolo for simbolo in producao if simbolo != EPSILON)
+
+
+def calcular_anulaveis(regras, variaveis) -> set:
+    """Variáveis que derivam a cadeia vazia (ponto fixo com lista de trabalho)."""
+    anulaveis = set()
+    dependentes = {}
+    faltam = []
+    pendentes = []
+    for indice, (variavel, simbolos) in enumerate(regras):
+        faltam.append(len(simbolos))
+        if not simbolos:
+            pendentes.append(variavel)
+        for simbolo in simbolos:
+            if simbolo in variaveis:
+                dependentes.setdefault(simbolo, []).append(indice)
+    while pendentes:
+        variavel = pendentes.pop()
+        if variavel in anulaveis:
+            continue
+        anulaveis.add(variavel)
+        for indice in dependentes.get(variavel, ()):
+            faltam[indice] -= 1
+            if faltam[indice] == 0:
+                pendentes.append(regras[indice][0])
+    return anulaveis
+
+
+class NoFloresta:
+    """
+    Nó da floresta sintática.
+
+    `simbolo` é uma variável ou um terminal; nos nós intermédios é o par
+    (variável, prefixo da produção já reconhecido). `alternativas` é a lista
+    de derivações empacotadas: pares (esquerda, direita), em que `direita` é o
+    nó do último símbolo e `esquerda` o nó intermédio do resto do prefixo (ou
+    None), e o tuplo vazio para uma produção ε. Os terminais não têm alternativas.
+    """
+    __slots__ = ('simbolo', 'inicio', 'fim', '_analise', '_chave', '_alternativas')
+
+    def __init__(self, simbolo, inicio: int, fim: int, analise=None, chave=None):
+        self.simbolo = simbolo
+        self.inicio = inicio
+        self.fim = fim
+        self._analise = analise
+        self._chave = chave
+        self._alternativas = None if analise is not None else []
+
+    @property
+    def alternativas(self) -> list[tuple]:
+        # Calculadas a pedido: só a parte visitada da floresta é construída.
+        if self._alternativas is None:
+            self._alternativas = self._analise._alternativas(self._chave)
+        return self._alternativas
+
+    @property
+    def terminal(self) -> bool:
+        return self._analise is None
+
+    @property
+    def intermedio(self) -> bool:
+        return self._chave is not None and len(self._chave) == 4
+
+    def ambiguo(self) -> bool:
+        return len(self.alternativas) > 1
+
+    def filhos(self, alternativa: tuple) -> list[NoFloresta]:
+        """Nós dos símbolos da produção usada em `alternativa` (primeira escolha nos nós intermédios)."""
+        filhos = []
+        while alternativa:
+            esquerda, direita = alternativa
+            filhos.append(direita)
+            alternativa = esquerda.alternativas[0] if esquerda is not None else ()
+        filhos.reverse()
+        return filhos
+
+    def arvore(self):
+        """
+        Extrai uma árvore de derivação finita. Em cada nó escolhe-se uma
+        alternativa cujos filhos já derivam uma árvore finita (ponto fixo
+        sobre a parte alcançável da floresta), o que evita os ciclos das
+        gramáticas com produções unitárias ou anuláveis recursivas. As
+        variáveis viram `(variavel, [filhos])` e os terminais ficam como texto.
+        """
+        escolha = self._escolher_alternativas()
+
+        def construir(no):
+            if no.terminal:
+                return no.simbolo
+            filhos = []
+            alternativa = escolha[no]
+            while alternativa:
+                esquerda, direita = alternativa
+                filhos.append(direita)
+                alternativa = escolha[esquerda] if esquerda is not None else ()
+            filhos.reverse()
+            return (no.simbolo, [construir(filho) for filho in filhos])
+
+        return construir(self)
+
+    def _escolher_alternativas(self) -> dict:
+        alcancaveis = []
+        vistos = {self}
+        pilha = [self]
+        while pilha:
+            no = pilha.pop()
+            if no.terminal:
+                continue
+            alcancaveis.append(no)
+            for alternativa in no.alternativas:
+                for filho in alternativa:
+                    if filho is not None and filho not in vistos:
+                        vistos.add(filho)
+                        pilha.append(filho)
+
+        def finito(no):
+            return no is None or no.terminal or no in escolha
+
+        escolha = {}
+        mudou = True
+        while mudou:
+            mudou = False
+            for no in alcancaveis:
+                if no in escolha:
+                    continue
+                for alternativa in no.alternativas:
+                    if all(finito(filho) for filho in alternativa):
+                        escolha[no] = alternativa
+                        mudou = True
+                        break
+        return escolha
+
+    def __repr__(self):
+        return f"NoFloresta({self.simbolo!r}, {self.inicio}, {self.fim})"
+
+
+class AnaliseEarley:
+    """Resultado de `ParserEarley.analisar`: os conjuntos de Earley e a floresta."""
+
+    def __init__(self, parser: ParserEarley, tokens: list, conjuntos: list[set]):
+        self.parser = parser
+        self.tokens = tokens
+        self.conjuntos = conjuntos
+        self._nos = {}
+        # completos[j][variavel] = origens dos itens completos dessa variável no conjunto j
+        self.completos = []
+        for conjunto in conjuntos:
+            completos = {}
+            for regra, ponto, origem in conjunto:
+                variavel, simbolos = parser.regras[regra]
+                if ponto == len(simbolos):
+                    completos.setdefault(variavel, set()).add(origem)
+            self.completos.append(completos)
+
+    @property
+    def aceita(self) -> bool:
+        return 0 in self.completos[-1].get(self.parser.inicial, ())
+
+    def raiz(self) -> NoFloresta | None:
+        """Nó (S, 0, n) da floresta, ou None se a cadeia não for aceita."""
+        if not self.aceita:
+            return None
+        return self._no((self.parser.inicial, 0, len(self.tokens)))
+
+    def _no(self, chave: tuple) -> NoFloresta:
+        no = self._nos.get(chave)
+        if no is None:
+            if len(chave) == 4:
+                regra, ponto, inicio, fim = chave
+                variavel, simbolos = self.parser.regras[regra]
+                no = NoFloresta((variavel, simbolos[:ponto]), inicio, fim, self, chave)
+            else:
+                no = NoFloresta(chave[0], chave[1], chave[2], self, chave)
+            self._nos[chave] = no
+        return no
+
+    def _folha(self, posicao: int) -> NoFloresta:
+        no = self._nos.get(posicao)
+        if no is None:
+            no = self._nos[posicao] = NoFloresta(self.tokens[posicao], posicao, posicao + 1)
+        return no
+
+    def _alternativas(self, chave: tuple) -> list[tuple]:
+        regras = self.parser.regras
+        if len(chave) == 3:
+            # Nó de variável: uma alternativa por produção completa (e por divisão).
+            variavel, inicio, fim = chave
+            conjunto = self.conjuntos[fim]
+            alternativas = []
+            for regra in self.parser.regras_de[variavel]:
+                tamanho = len(regras[regra][1])
+                if (regra, tamanho, inicio) not in conjunto:
+                    continue
+                if tamanho == 0:
+                    alternativas.append(())
+                else:
+                    alternativas.extend(self._alternativas((regra, tamanho, inicio, fim)))
+            return alternativas
+
+        # Nó intermédio: o último símbolo do prefixo cobre tokens[k:fim] e o
+        # resto cobre tokens[inicio:k], o que exige o item (regra, ponto - 1, inicio) em k.
+        regra, ponto, inicio, fim = chave
+        simbolo = regras[regra][1][ponto - 1]
+        if simbolo in self.parser.regras_de:
+            divisoes = sorted(k for k in self.completos[fim].get(simbolo, ()) if k >= inicio)
+            direitas = [self._no((simbolo, k, fim)) for k in divisoes]
+        elif fim > inicio and self.tokens[fim - 1] == simbolo:
+            divisoes = [fim - 1]
+            direitas = [self._folha(fim - 1)]
+        else:
+            return []
+
+        alternativas = []
+        for k, direita in zip(divisoes, direitas):
+            if ponto == 1:
+                if k == inicio:
+                    alternativas.append((None, direita))
+            elif (regra, ponto - 1, inicio) in self.conjuntos[k]:
+                alternativas.append((self._no((regra, ponto - 1, inicio, k)), direita))
+        return alternativas
+
+
+class ParserEarley:
+    """
+    Parser de Earley para uma gramática no formato de `GLC.R`.
+
+    As produções são internadas como (variável, tuplo de símbolos). São
+    variáveis as chaves de `R`, `S` e as de `variaveis` (o `V` da gramática),
+    mesmo sem produções; só os restantes símbolos são terminais e podem ler um
+    token da entrada. As variáveis anuláveis podem ser passadas já calculadas
+    (ver `GLC.analise`).
+    """
+
+    def __init__(self, R: dict, S, anulaveis=None, variaveis=()):
+        self.inicial = S
+        self.regras = []
+        self.regras_de = {variavel: [] for variavel in (*R, *variaveis)}
+        for variavel, producoes in R.items():
+            for producao in producoes:
+                self.regras_de[variavel].append(len(self.regras))
+                self.regras.append((variavel, normalizar_producao(producao)))
+        self.regras_de.setdefault(S, [])
+        if anulaveis is None:
+            anulaveis = calcular_anulaveis(self.regras, self.regras_de)
+        self.anulaveis = anulaveis
+
+    def analisar(self, cadeia) -> AnaliseEarley:
+        """Constrói os conjuntos de Earley para `cadeia` (texto ou sequência de tokens)."""
+        tokens = list(cadeia)
+        regras = self.regras
+        regras_de = self.regras_de
+        anulaveis = self.anulaveis
+        n = len(tokens)
+
+        conjuntos = [set() for _ in range(n + 1)]
+        # esperando[j][variavel] = itens de j com o ponto antes de `variavel`
+        esperando = [{} for _ in range(n + 1)]
+        for regra in regras_de[self.inicial]:
+            conjuntos[0].add((regra, 0, 0))
+
+        for j in range(n + 1):
+            conjunto = conjuntos[j]
+            fila = list(conjunto)
+            token = tokens[j] if j < n else None
+
+            def adicionar(item):
+                if item not in conjunto:
+                    conjunto.add(item)
+                    fila.append(item)
+
+            for item in fila:
+                regra, ponto, origem = item
+                variavel, simbolos = regras[regra]
+                if ponto < len(simbolos):
+                    simbolo = simbolos[ponto]
+                    if simbolo in regras_de:
+                        # Previsão
+                        esperando[j].setdefault(simbolo, []).append(item)
+                        for prevista in regras_de[simbolo]:
+                            adicionar((prevista, 0, j))
+                        if simbolo in anulaveis:
+                            adicionar((regra, ponto + 1, origem))
+                    elif simbolo == token:
+                        # Leitura
+                        conjuntos[j + 1].add((regra, ponto + 1, origem))
+                else:
+                    # Conclusão (com origem == j, o avanço sobre anuláveis já o cobriu)
+                    for pai, ponto_pai, origem_pai in esperando[origem].get(variavel, ()):
+                        adicionar((pai, ponto_pai + 1, origem_pai))
+
+        return AnaliseEarley(self, tokens, conjuntos)
+
+    def aceita(self, cadeia) -> bool:
+        return self.analisar(cadeia).aceita
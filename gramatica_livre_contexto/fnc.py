@@ -0,0 +1,254 @@
+"""
+Forma Normal de Chomsky (FNC) e reconhecimento com o algoritmo CYK.
+
+A conversão segue os passos clássicos START, TERM, BIN, DEL e UNIT, por esta
+ordem: binarizar antes de remover as produções vazias mantém o crescimento da
+gramática linear. O resultado conserva o formato de `GLC.R` (dicionário de
+listas de produções), com `['ε']` apenas na variável inicial.
+
+No reconhecedor CYK cada célula da tabela é um inteiro usado como conjunto de
+bits sobre as variáveis, de modo que juntar duas células é uma sequência de
+operações AND/OR em vez de construir conjuntos. O custo é O(n³·|R|).
+"""
+from __future__ import annotations
+
+from .earley import EPSILON, normalizar_producao
+
+
+def _nome_livre(base: str, usados: set) -> str:
+    """Devolve `base`, ou `base` seguido de um número, que ainda não esteja em `usados`."""
+    nome = base
+    contador = 1
+    while nome in usados:
+        nome = f"{base}{contador}"
+        contador += 1
+    usados.add(nome)
+    return nome
+
+
+def _sem_repetidos(producoes) -> list[tuple]:
+    vistas = set()
+    resultado = []
+    for producao in producoes:
+        if producao not in vistas:
+            vistas.add(producao)
+            resultado.append(producao)
+    return resultado
+
+
+def para_FNC(glc):
+    """Devolve uma nova gramática, equivalente a `glc`, na Forma Normal de Chomsky."""
+    variaveis = set(glc.R) | set(glc.V)
+    variaveis.add(glc.S)
+    regras = {v: [normalizar_producao(p) for p in glc.R.get(v, ())] for v in variaveis}
+    terminais = set(glc.E)
+    for producoes in regras.values():
+        for producao in producoes:
+            terminais.update(s for s in producao if s not in variaveis)
+    usados = variaveis | terminais
+
+    # START: nova variável inicial, que nunca aparece do lado direito.
+    inicial = _nome_livre(f"{glc.S}0", usados)
+    regras[inicial] = [(glc.S,)]
+    variaveis.add(inicial)
+
+    # TERM: terminais em produções longas passam a ter uma variável própria.
+    variavel_do_terminal = {}
+    for variavel in list(regras):
+        novas = []
+        for producao in regras[variavel]:
+            if len(producao) >= 2:
+                substituida = []
+                for simbolo in producao:
+                    if simbolo not in variaveis:
+                        if simbolo not in variavel_do_terminal:
+                            nova = _nome_livre(f"T_{simbolo}", usados)
+                            variavel_do_terminal[simbolo] = nova
+                            regras[nova] = [(simbolo,)]
+                            variaveis.add(nova)
+                        simbolo = variavel_do_terminal[simbolo]
+                    substituida.append(simbolo)
+                producao = tuple(substituida)
+            novas.append(producao)
+        regras[variavel] = novas
+
+    # BIN: A -> X1 X2 ... Xk vira A -> X1 A_1, A_1 -> X2 A_2, ..., A_k-2 -> Xk-1 Xk.
+    for variavel in list(regras):
+        novas = []
+        for producao in regras[variavel]:
+            atual = variavel
+            while len(producao) > 2:
+                auxiliar = _nome_livre(f"{variavel}_", usados)
+                variaveis.add(auxiliar)
+                destino = novas if atual == variavel else regras[atual]
+                destino.append((producao[0], auxiliar))
+                regras[auxiliar] = []
+                atual = auxiliar
+                producao = producao[1:]
+            (novas if atual == variavel else regras[atual]).append(producao)
+        regras[variavel] = novas
+
+    # DEL: remove as produções vazias, acrescentando as variantes sem os símbolos anuláveis.
+    anulaveis = set()
+    mudou = True
+    while mudou:
+        mudou = False
+        for variavel, producoes in regras.items():
+            if variavel not in anulaveis and any(all(s in anulaveis for s in p) for p in producoes):
+                anulaveis.add(variavel)
+                mudou = True
+    for variavel, producoes in regras.items():
+        novas = []
+        for producao in producoes:
+            if len(producao) == 2:
+                a, b = producao
+                novas.append(producao)
+                if a in anulaveis:
+                    novas.append((b,))
+                if b in anulaveis:
+                    novas.append((a,))
+            elif producao:
+                novas.append(producao)
+        regras[variavel] = novas
+
+    # UNIT: cada variável herda as produções não unitárias do seu fecho unitário.
+    fnc = {}
+    for variavel in regras:
+        fecho = [variavel]
+        vistos = {variavel}
+        for atual in fecho:
+            for producao in regras[atual]:
+                if len(producao) == 1 and producao[0] in variaveis and producao[0] not in vistos:
+                    vistos.add(producao[0])
+                    fecho.append(producao[0])
+        fnc[variavel] = _sem_repetidos(
+            p for atual in fecho for p in regras[atual]
+            if not (len(p) == 1 and p[0] in variaveis)
+        )
+    if inicial in anulaveis:
+        fnc[inicial].append((EPSILON,))
+
+    # Só as variáveis alcançáveis a partir da inicial fazem parte do resultado.
+    alcancaveis = [inicial]
+    vistos = {inicial}
+    for variavel in alcancaveis:
+        for producao in fnc[variavel]:
+            for simbolo in producao:
+                if simbolo in variaveis and simbolo not in vistos:
+                    vistos.add(simbolo)
+                    alcancaveis.append(simbolo)
+
+    return type(glc)(
+        V=set(alcancaveis),
+        E={s for v in alcancaveis for p in fnc[v] for s in p if s not in variaveis and s != EPSILON},
+        R={v: [list(p) for p in fnc[v]] for v in alcancaveis},
+        S=inicial,
+    )
+
+
+class ReconhecedorCYK:
+    """
+    Reconhecedor CYK para uma gramática já na Forma Normal de Chomsky.
+
+    As variáveis são internadas como posições de bits. `por_terminal` dá a
+    máscara das variáveis com uma produção A -> a; para as produções A -> B C,
+    `pares[B]` guarda os pares (bit de C, máscara dos A) e `direitas[B]` a
+    união dos bits de C, para descartar rapidamente as combinações inúteis.
+    O reconhecedor pode ser reutilizado em muitas cadeias (`aceita_lote`).
+    """
+    LIMITE_MEMO = 1 << 16
+
+    def __init__(self, fnc):
+        variaveis = list(fnc.R)
+        bits = {variavel: 1 << i for i, variavel in enumerate(variaveis)}
+        self.variaveis = variaveis
+        self.inicial = bits.get(fnc.S, 0)
+        self.aceita_vazia = False
+        self.por_terminal = {}
+        self.pares = [[] for _ in variaveis]
+        self.direitas = [0] * len(variaveis)
+        self.esquerdas = 0
+
+        for variavel, producoes in fnc.R.items():
+            bit = bits[variavel]
+            for producao in producoes:
+                producao = normalizar_producao(producao)
+                if not producao:
+                    if variavel == fnc.S:
+                        self.aceita_vazia = True
+                elif len(producao) == 1 and producao[0] not in bits:
+                    terminal = producao[0]
+                    self.por_terminal[terminal] = self.por_terminal.get(terminal, 0) | bit
+                elif len(producao) == 2 and producao[0] in bits and producao[1] in bits:
+                    b, c = bits[producao[0]], bits[producao[1]]
+                    indice = b.bit_length() - 1
+                    self.pares[indice].append((c, bit))
+                    self.direitas[indice] |= c
+                    self.esquerdas |= b
+                else:
+                    raise ValueError(f"Produção fora da FNC: {variavel} -> {' '.join(producao)}")
+
+        # Junta os pares com o mesmo C para que cada teste acrescente todos os A de uma vez.
+        for indice, pares in enumerate(self.pares):
+            agrupados = {}
+            for c, a in pares:
+                agrupados[c] = agrupados.get(c, 0) | a
+            self.pares[indice] = list(agrupados.items())
+        self._memo = {}
+
+    def _combinar(self, esquerda: int, direita: int) -> int:
+        """Máscara dos A tais que A -> B C, com B em `esquerda` e C em `direita`."""
+        chave = (esquerda, direita)
+        resultado = self._memo.get(chave)
+        if resultado is not None:
+            return resultado
+        resultado = 0
+        pares = self.pares
+        direitas = self.direitas
+        restantes = esquerda & self.esquerdas
+        while restantes:
+            bit = restantes & -restantes
+            restantes ^= bit
+            indice = bit.bit_length() - 1
+            if direita & direitas[indice]:
+                for c, a in pares[indice]:
+                    if direita & c:
+                        resultado |= a
+        if len(self._memo) >= self.LIMITE_MEMO:
+            self._memo.clear()
+        self._memo[chave] = resultado
+        return resultado
+
+    def tabela(self, cadeia) -> list[list[int]]:
+        """
+        Preenche a tabela CYK: `tabela[c][i]` é a máscara das variáveis que
+        derivam os `c` símbolos da cadeia a partir da posição `i` (c >= 1).
+        """
+        tokens = list(cadeia)
+        n = len(tokens)
+        por_terminal = self.por_terminal
+        tabela = [[], [por_terminal.get(token, 0) for token in tokens]]
+        combinar = self._combinar
+        for comprimento in range(2, n + 1):
+            linha = []
+            for inicio in range(n - comprimento + 1):
+                celula = 0
+                for k in range(1, comprimento):
+                    esquerda = tabela[k][inicio]
+                    if not esquerda:
+                        continue
+                    direita = tabela[comprimento - k][inicio + k]
+                    if direita:
+                        celula |= combinar(esquerda, direita)
+                linha.append(celula)
+            tabela.append(linha)
+        return tabela
+
+    def aceita(self, cadeia) -> bool:
+        tokens = list(cadeia)
+        if not tokens:
+            return self.aceita_vazia
+        return bool(self.tabela(tokens)[len(tokens)][0] & self.inicial)
+
+    def aceita_lote(self, cadeias) -> list[bool]:
+        return [self.aceita(cadeia) for cadeia in cadeias]
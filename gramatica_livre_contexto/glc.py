@@ -1,3 +1,10 @@
+from __future__ import annotations
+from .analise import AnaliseGramatica
+from .earley import ParserEarley
+from .fnc import para_FNC, ReconhecedorCYK
+from .tabelas import ConflitoGramatica, TabelaLL1, TabelaLR
+
+
 class GLC:
     """
     Representa uma Gramática Livre-do-Contexto (GLC).
@@ -17,6 +24,10 @@ class GLC:
         self.E = E or set()
         self.R = R or dict()
         self.S = S
+        # Resultados derivados da gramática (conjuntos de análise, parsers),
+        # descartados quando a assinatura de V, R e S muda.
+        self._cache = {}
+        self._assinatura_cache = None
 
     def __str__(self):
         """
@@ -34,6 +45,110 @@ class GLC:
 
         return f"G = (V, E, R, S)\n\n{v_str}\n{e_str}\n{s_str}\n\n{regras_str}"
 
+    def _assinatura(self) -> tuple:
+        return (
+            self.S,
+            frozenset(self.V),
+            tuple((variavel, tuple(map(tuple, producoes))) for variavel, producoes in self.R.items()),
+        )
+
+    def _em_cache(self, nome: str, construir):
+        """
+        Devolve o valor `nome` do cache, calculando-o com `construir()` se ainda
+        não existir. `R` é um dicionário de listas que pode ser alterado no
+        lugar, por isso o cache é validado comparando a assinatura da gramática.
+        """
+        assinatura = self._assinatura()
+        if assinatura != self._assinatura_cache:
+            self._cache = {}
+            self._assinatura_cache = assinatura
+        if nome not in self._cache:
+            self._cache[nome] = construir()
+        return self._cache[nome]
+
+    def analise(self) -> AnaliseGramatica:
+        """
+        Conjuntos de análise da gramática (anuláveis, produtivas, alcançáveis,
+        úteis, FIRST e FOLLOW), guardados até `V`, `R` ou `S` mudarem.
+        """
+        return self._em_cache('analise', lambda: AnaliseGramatica(self.R, self.S, self.V))
+
+    def limpar(self) -> GLC:
+        """
+        Devolve uma gramática equivalente sem variáveis improdutivas nem
+        inalcançáveis (e sem as produções que as usam).
+        """
+        analise = self.analise()
+        regras = analise.regras_uteis(self.R)
+        if self.S not in regras:
+            regras[self.S] = []
+        terminais = {s for producoes in regras.values() for p in producoes for s in p
+                     if s not in analise.variaveis and s != 'ε'}
+        return GLC(
+            V=set(regras),
+            E=terminais,
+            R=regras,
+            S=self.S,
+        )
+
+    def parser_earley(self) -> ParserEarley:
+        """Parser de Earley da gramática, reutilizado enquanto ela não mudar."""
+        return self._em_cache('earley', lambda: ParserEarley(self.R, self.S, self.analise().anulaveis,
+                                                             self.analise().variaveis))
+
+    def aceita(self, cadeia) -> bool:
+        """
+        Verifica se a cadeia (texto ou sequência de terminais) pertence à
+        linguagem da gramática, com o algoritmo de Earley.
+        """
+        return self.parser_earley().aceita(cadeia)
+
+    def analisar(self, cadeia):
+        """
+        Analisa a cadeia com o algoritmo de Earley e devolve a raiz da floresta
+        sintática partilhada (`NoFloresta`), ou None se a cadeia não for aceita.
+        Use `raiz.arvore()` para extrair uma árvore de derivação.
+        """
+        return self.parser_earley().analisar(cadeia).raiz()
+
+    def para_FNC(self) -> GLC:
+        """
+        Devolve uma gramática equivalente na Forma Normal de Chomsky, no mesmo
+        formato de `R` (passos START, TERM, BIN, DEL e UNIT).
+        """
+        return para_FNC(self)
+
+    def reconhecedor_cyk(self) -> ReconhecedorCYK:
+        """
+        Converte a gramática para a FNC e devolve um reconhecedor CYK com
+        células em conjuntos de bits, reutilizável para testar lotes de cadeias.
+        O reconhecedor é guardado até a gramática mudar.
+        """
+        return self._em_cache('cyk', lambda: ReconhecedorCYK(self.para_FNC()))
+
+    def tabela_ll1(self) -> TabelaLL1:
+        """Tabela preditiva LL(1) da gramática; os conflitos ficam em `tabela.conflitos`."""
+        return self._em_cache('ll1', lambda: TabelaLL1.gerar(self.analise()))
+
+    def tabela_lr(self, lalr: bool = True) -> TabelaLR:
+        """
+        Tabela de ações/desvios LALR(1) (ou LR(1) canónica, com `lalr=False`);
+        os conflitos ficam em `tabela.conflitos`.
+        """
+        return self._em_cache('lalr' if lalr else 'lr1', lambda: TabelaLR.gerar(self.analise(), lalr))
+
+    def tabela_analise(self) -> TabelaLL1 | TabelaLR:
+        """
+        Escolhe a tabela determinística mais simples sem conflitos: LL(1),
+        depois LALR(1) e por fim LR(1). Se nenhuma servir, lança
+        `ConflitoGramatica` com os conflitos LR(1).
+        """
+        for gerar in (self.tabela_ll1, self.tabela_lr, lambda: self.tabela_lr(lalr=False)):
+            tabela = gerar()
+            if not tabela.conflitos:
+                return tabela
+        raise ConflitoGramatica(tabela.TIPO, tabela.conflitos)
+
     def derivar(self, forma_setencial: str):
         """Executa um passo de derivação."""
         print(f"Analisando a setença: {forma_setencial}...")
@@ -0,0 +1,310 @@
+"""
+Tabelas de análise sintática determinística: LL(1) e LR(1)/LALR(1).
+
+As tabelas são geradas a partir de `AnaliseGramatica` (FIRST e FOLLOW) e
+executadas por parsers guiados por tabela, em tempo linear no tamanho da
+entrada. Os conflitos não impedem a geração: ficam registados em
+`conflitos` (com a primeira ação mantida na tabela), e o parser recusa-se a
+correr uma tabela com conflitos (`ConflitoGramatica`).
+
+As tabelas podem ser guardadas em JSON (`salvar`/`carregar`) e usadas sem a
+gramática original.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import json
+
+from .analise import FIM
+
+
+class ConflitoGramatica(ValueError):
+    """A gramática não é da classe pedida; `conflitos` descreve as entradas em conflito."""
+
+    def __init__(self, tipo: str, conflitos: list[str]):
+        self.tipo = tipo
+        self.conflitos = conflitos
+        super().__init__(f"A gramática não é {tipo}: {len(conflitos)} conflito(s).\n" + "\n".join(conflitos))
+
+
+def _formatar_regra(regra) -> str:
+    variavel, simbolos = regra
+    return f"{variavel} -> {' '.join(simbolos) if simbolos else 'ε'}"
+
+
+class TabelaAnalise(ABC):
+    """Base das tabelas: regras internadas, conflitos e serialização em JSON."""
+    TIPO = None
+
+    def __init__(self, regras, inicial, tabela: dict, conflitos: list[str]):
+        self.regras = [(variavel, tuple(simbolos)) for variavel, simbolos in regras]
+        self.inicial = inicial
+        self.tabela = tabela
+        self.conflitos = conflitos
+
+    def _registrar(self, chave, valor, descrever):
+        """Preenche uma entrada da tabela, registando um conflito se já tiver outro valor."""
+        atual = self.tabela.get(chave)
+        if atual is None:
+            self.tabela[chave] = valor
+        elif atual != valor:
+            self.conflitos.append(f"{self.TIPO}: {chave}: {descrever(atual)} / {descrever(valor)}")
+
+    def _verificar(self):
+        if self.conflitos:
+            raise ConflitoGramatica(self.TIPO, self.conflitos)
+
+    def aceita(self, tokens) -> bool:
+        return self.analisar(tokens) is not None
+
+    @abstractmethod
+    def analisar(self, tokens):
+        """Árvore de derivação `(variavel, [filhos])` dos tokens, ou None se forem rejeitados."""
+
+    # --- Serialização ---
+
+    def _tabela_para_lista(self) -> list:
+        return [[*chave, valor] for chave, valor in self.tabela.items()]
+
+    @staticmethod
+    def _tabela_de_lista(linhas) -> dict:
+        return {(a, b): valor for a, b, valor in linhas}
+
+    def para_dict(self) -> dict:
+        return {
+            'tipo': self.TIPO,
+            'inicial': self.inicial,
+            'regras': [[variavel, list(simbolos)] for variavel, simbolos in self.regras],
+            'tabela': self._tabela_para_lista(),
+            'conflitos': self.conflitos,
+        }
+
+    @classmethod
+    def de_dict(cls, dados: dict) -> TabelaAnalise:
+        for subclasse in (TabelaLL1, TabelaLR):
+            if dados['tipo'] in subclasse.TIPOS:
+                return subclasse._de_dict(dados)
+        raise ValueError(f"Tipo de tabela desconhecido: {dados['tipo']!r}")
+
+    def salvar(self, filepath: str):
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.para_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def carregar(cls, filepath: str) -> TabelaAnalise:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return TabelaAnalise.de_dict(json.load(f))
+
+
+class TabelaLL1(TabelaAnalise):
+    """
+    Tabela preditiva LL(1): `tabela[(variavel, terminal)]` é o índice da
+    produção a expandir. `FIM` representa o fim da entrada.
+    """
+    TIPO = 'LL(1)'
+    TIPOS = ('LL(1)',)
+
+    @classmethod
+    def gerar(cls, analise) -> TabelaLL1:
+        tabela = cls(analise.regras, analise.inicial, {}, [])
+        descrever = lambda regra: _formatar_regra(tabela.regras[regra])
+        for indice, (variavel, simbolos) in enumerate(tabela.regras):
+            primeiros, anulavel = analise.primeiros_de(simbolos)
+            for terminal in sorted(primeiros):
+                tabela._registrar((variavel, terminal), indice, descrever)
+            if anulavel:
+                for terminal in sorted(analise.seguintes[variavel]):
+                    tabela._registrar((variavel, terminal), indice, descrever)
+        return tabela
+
+    @classmethod
+    def _de_dict(cls, dados) -> TabelaLL1:
+        return cls(dados['regras'], dados['inicial'], cls._tabela_de_lista(dados['tabela']), dados['conflitos'])
+
+    def analisar(self, tokens):
+        """
+        Analisa a sequência de tokens e devolve a árvore de derivação
+        `(variavel, [filhos])`, ou None se a entrada for rejeitada.
+        """
+        self._verificar()
+        tabela = self.tabela
+        regras = self.regras
+        variaveis = {variavel for variavel, _ in regras} | {self.inicial}
+        entrada = iter(tokens)
+        atual = next(entrada, FIM)
+
+        raiz = []
+        pilha = [(self.inicial, raiz)]
+        while pilha:
+            simbolo, destino = pilha.pop()
+            if simbolo in variaveis:
+                regra = tabela.get((simbolo, atual))
+                if regra is None:
+                    return None
+                filhos = []
+                destino.append((simbolo, filhos))
+                for filho in reversed(regras[regra][1]):
+                    pilha.append((filho, filhos))
+            elif simbolo == atual and atual != FIM:
+                destino.append(atual)
+                atual = next(entrada, FIM)
+            else:
+                return None
+        return raiz[0] if atual == FIM else None
+
+
+class TabelaLR(TabelaAnalise):
+    """
+    Tabela LR: `tabela[(estado, terminal)]` é a ação ('d', estado) para
+    deslocar, ('r', regra) para reduzir ou ('a', 0) para aceitar, e
+    `desvios[(estado, variavel)]` o estado seguinte depois de uma redução.
+    A última regra é a regra aumentada S' -> S.
+    """
+    TIPOS = ('LALR(1)', 'LR(1)')
+
+    def __init__(self, regras, inicial, tabela, conflitos, desvios: dict, tipo: str):
+        super().__init__(regras, inicial, tabela, conflitos)
+        self.desvios = desvios
+        self.TIPO = tipo
+
+    @classmethod
+    def gerar(cls, analise, lalr: bool = True) -> TabelaLR:
+        """
+        Constrói a coleção canónica de conjuntos de itens LR(1) e, com
+        `lalr=True`, junta os estados com o mesmo núcleo (LALR(1)).
+        """
+        variaveis = analise.variaveis
+        inicial_aumentada = f"{analise.inicial}'"
+        while inicial_aumentada in variaveis or inicial_aumentada in analise.terminais:
+            inicial_aumentada += "'"
+        regras = list(analise.regras) + [(inicial_aumentada, (analise.inicial,))]
+        aumentada = len(regras) - 1
+        regras_de = analise.regras_de
+
+        # primeiros_sufixo[(regra, ponto)] = FIRST do que vem depois do símbolo em `ponto`
+        primeiros_sufixo = {}
+
+        def fechar(itens) -> frozenset:
+            fechados = set(itens)
+            fila = list(itens)
+            while fila:
+                regra, ponto, lookahead = fila.pop()
+                simbolos = regras[regra][1]
+                if ponto == len(simbolos) or simbolos[ponto] not in variaveis:
+                    continue
+                sufixo = primeiros_sufixo.get((regra, ponto))
+                if sufixo is None:
+                    sufixo = primeiros_sufixo[(regra, ponto)] = analise.primeiros_de(simbolos[ponto + 1:])
+                lookaheads, anulavel = sufixo
+                if anulavel:
+                    lookaheads = lookaheads | {lookahead}
+                for prevista in regras_de.get(simbolos[ponto], ()):
+                    for terminal in lookaheads:
+                        item = (prevista, 0, terminal)
+                        if item not in fechados:
+                            fechados.add(item)
+                            fila.append(item)
+            return frozenset(fechados)
+
+        estados = [fechar({(aumentada, 0, FIM)})]
+        indices = {estados[0]: 0}
+        transicoes = []
+        for estado in estados:
+            nucleos = {}
+            for regra, ponto, lookahead in estado:
+                simbolos = regras[regra][1]
+                if ponto < len(simbolos):
+                    nucleos.setdefault(simbolos[ponto], set()).add((regra, ponto + 1, lookahead))
+            saidas = {}
+            for simbolo, nucleo in nucleos.items():
+                destino = fechar(nucleo)
+                if destino not in indices:
+                    indices[destino] = len(estados)
+                    estados.append(destino)
+                saidas[simbolo] = indices[destino]
+            transicoes.append(saidas)
+
+        if lalr:
+            # Estados com o mesmo núcleo (itens sem lookahead) passam a ser um só.
+            por_nucleo = {}
+            juntar = []
+            for estado in estados:
+                nucleo = frozenset((regra, ponto) for regra, ponto, _ in estado)
+                juntar.append(por_nucleo.setdefault(nucleo, len(por_nucleo)))
+            juntos = [set() for _ in por_nucleo]
+            transicoes_juntas = [{} for _ in por_nucleo]
+            for antigo, estado in enumerate(estados):
+                juntos[juntar[antigo]] |= estado
+                for simbolo, destino in transicoes[antigo].items():
+                    transicoes_juntas[juntar[antigo]][simbolo] = juntar[destino]
+            estados, transicoes = juntos, transicoes_juntas
+
+        tabela = cls(regras, analise.inicial, {}, [], {}, 'LALR(1)' if lalr else 'LR(1)')
+
+        def descrever(acao):
+            tipo, alvo = acao
+            if tipo == 'd':
+                return f"deslocar {alvo}"
+            if tipo == 'r':
+                return f"reduzir {_formatar_regra(regras[alvo])}"
+            return "aceitar"
+
+        for indice, estado in enumerate(estados):
+            for simbolo, destino in transicoes[indice].items():
+                if simbolo in variaveis:
+                    tabela.desvios[(indice, simbolo)] = destino
+                else:
+                    tabela._registrar((indice, simbolo), ('d', destino), descrever)
+            for regra, ponto, lookahead in sorted(estado, key=lambda item: (item[0], item[1], str(item[2]))):
+                if ponto == len(regras[regra][1]):
+                    acao = ('a', 0) if regra == aumentada else ('r', regra)
+                    tabela._registrar((indice, lookahead), acao, descrever)
+        return tabela
+
+    def para_dict(self) -> dict:
+        dados = super().para_dict()
+        dados['desvios'] = [[estado, variavel, destino] for (estado, variavel), destino in self.desvios.items()]
+        return dados
+
+    def _tabela_para_lista(self) -> list:
+        return [[estado, simbolo, list(acao)] for (estado, simbolo), acao in self.tabela.items()]
+
+    @classmethod
+    def _de_dict(cls, dados) -> TabelaLR:
+        tabela = {(estado, simbolo): tuple(acao) for estado, simbolo, acao in dados['tabela']}
+        return cls(dados['regras'], dados['inicial'], tabela, dados['conflitos'],
+                   cls._tabela_de_lista(dados['desvios']), dados['tipo'])
+
+    def analisar(self, tokens):
+        """
+        Analisa a sequência de tokens e devolve a árvore de derivação
+        `(variavel, [filhos])`, ou None se a entrada for rejeitada.
+        """
+        self._verificar()
+        tabela = self.tabela
+        desvios = self.desvios
+        regras = self.regras
+        entrada = iter(tokens)
+        atual = next(entrada, FIM)
+
+        estados = [0]
+        nos = []
+        while True:
+            acao = tabela.get((estados[-1], atual))
+            if acao is None:
+                return None
+            tipo, alvo = acao
+            if tipo == 'd':
+                estados.append(alvo)
+                nos.append(atual)
+                atual = next(entrada, FIM)
+            elif tipo == 'r':
+                variavel, simbolos = regras[alvo]
+                tamanho = len(simbolos)
+                filhos = nos[len(nos) - tamanho:]
+                if tamanho:
+                    del estados[-tamanho:]
+                    del nos[-tamanho:]
+                estados.append(desvios[(estados[-1], variavel)])
+                nos.append((variavel, filhos))
+            else:
+                return nos[-1]
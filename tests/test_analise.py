@@ -0,0 +1,117 @@
+from __future__ import annotations
+import itertools
+import random
+
+from gramatica_livre_contexto import GLC
+from gramatica_livre_contexto.analise import FIM
+
+VARIAVEIS = ['S', 'A', 'B', 'C', 'D']
+
+
+def gramatica_aleatoria(aleatorio: random.Random) -> GLC:
+    simbolos = VARIAVEIS + ['a', 'b']
+    regras = {variavel: [[aleatorio.choice(simbolos) for _ in range(aleatorio.randint(0, 3))] or ['ε']
+                         for _ in range(aleatorio.randint(0, 3))]
+              for variavel in VARIAVEIS if aleatorio.random() < 0.9}
+    return GLC(V=set(VARIAVEIS), E={'a', 'b'}, R=regras, S='S')
+
+
+def producoes(glc: GLC):
+    for variavel, lista in glc.R.items():
+        for producao in lista:
+            yield variavel, [s for s in producao if s != 'ε']
+
+
+def ponto_fixo(passo, inicial):
+    atual = inicial
+    while True:
+        seguinte = passo(atual)
+        if seguinte == atual:
+            return atual
+        atual = seguinte
+
+
+def referencia(glc: GLC) -> dict:
+    regras = list(producoes(glc))
+    eh_variavel = lambda s: s in VARIAVEIS
+
+    anulaveis = ponto_fixo(lambda atual: atual | {v for v, p in regras if all(s in atual for s in p)}, set())
+    produtivas = ponto_fixo(
+        lambda atual: atual | {v for v, p in regras if all(s in atual or not eh_variavel(s) for s in p)}, set())
+    alcancaveis = ponto_fixo(
+        lambda atual: atual | {s for v, p in regras if v in atual for s in p if eh_variavel(s)}, {'S'})
+
+    def primeiros_de(simbolos, primeiros):
+        resultado = set()
+        for s in simbolos:
+            if not eh_variavel(s):
+                return resultado | {s}
+            resultado |= primeiros[s]
+            if s not in anulaveis:
+                return resultado
+        return resultado
+
+    primeiros = {v: set() for v in VARIAVEIS}
+    mudou = True
+    while mudou:
+        mudou = False
+        for v, p in regras:
+            novos = primeiros_de(p, primeiros) - primeiros[v]
+            if novos:
+                primeiros[v] |= novos
+                mudou = True
+
+    seguintes = {v: set() for v in VARIAVEIS}
+    seguintes['S'].add(FIM)
+    mudou = True
+    while mudou:
+        mudou = False
+        for v, p in regras:
+            for i, s in enumerate(p):
+                if not eh_variavel(s):
+                    continue
+                resto = p[i + 1:]
+                novos = primeiros_de(resto, primeiros)
+                if all(r in anulaveis for r in resto):
+                    novos |= seguintes[v]
+                if novos - seguintes[s]:
+                    seguintes[s] |= novos
+                    mudou = True
+
+    return {'anulaveis': anulaveis, 'produtivas': produtivas, 'alcancaveis': alcancaveis,
+            'primeiros': primeiros, 'seguintes': seguintes}
+
+
+def test_conjuntos_coincidem_com_pontos_fixos_ingenuos():
+    aleatorio = random.Random(0)
+    for _ in range(300):
+        glc = gramatica_aleatoria(aleatorio)
+        analise = glc.analise()
+        esperado = referencia(glc)
+        assert analise.anulaveis == esperado['anulaveis'], glc.R
+        assert analise.produtivas == esperado['produtivas'], glc.R
+        assert analise.alcancaveis == esperado['alcancaveis'], glc.R
+        for variavel in VARIAVEIS:
+            assert analise.primeiros[variavel] == esperado['primeiros'][variavel], (glc.R, variavel)
+            assert analise.seguintes[variavel] == esperado['seguintes'][variavel], (glc.R, variavel)
+
+
+def test_limpar_preserva_a_linguagem():
+    aleatorio = random.Random(1)
+    cadeias = [''.join(c) for n in range(6) for c in itertools.product('ab', repeat=n)]
+    for _ in range(200):
+        glc = gramatica_aleatoria(aleatorio)
+        limpa = glc.limpar()
+        assert [limpa.aceita(c) for c in cadeias] == [glc.aceita(c) for c in cadeias], glc.R
+        analise = limpa.analise()
+        if analise.uteis:
+            assert analise.uteis == set(limpa.R) == limpa.V
+
+
+def test_analise_acompanha_alteracoes_no_lugar():
+    glc = GLC(V={'S', 'A'}, E={'a'}, R={'S': [['A', 'a']], 'A': [['a']]}, S='S')
+    assert glc.analise().anulaveis == set()
+    assert not glc.aceita('a')
+    glc.R['A'].append(['ε'])
+    assert glc.analise().anulaveis == {'A'}
+    assert glc.aceita('a')
@@ -0,0 +1,86 @@
+from __future__ import annotations
+import itertools
+
+import pytest
+
+from automatos import OrcamentoEsgotado
+from gramatica_livre_contexto import GLC, conversao_GLC_para_AP
+
+
+def cadeias_ate(alfabeto, tamanho_maximo: int):
+    for tamanho in range(tamanho_maximo + 1):
+        for simbolos in itertools.product(sorted(alfabeto), repeat=tamanho):
+            yield ''.join(simbolos)
+
+
+def gramatica_anulaveis() -> GLC:
+    # Oito variáveis anuláveis em sequência: a pilha chega a |cadeia| + 9 símbolos.
+    return GLC(V={'S', 'A'}, E={'a'}, R={'S': [['A'] * 8], 'A': [['a'], ['ε']]}, S='S')
+
+
+def gramatica_soma() -> GLC:
+    return GLC(V={'E'}, E={'a', '+'}, R={'E': [['E', '+', 'a'], ['a']]}, S='E')
+
+
+def gramatica_expressoes() -> GLC:
+    return GLC(
+        V={'E', 'T', 'F'},
+        E={'a', '+', '*', '(', ')'},
+        R={
+            'E': [['E', '+', 'T'], ['T']],
+            'T': [['T', '*', 'F'], ['F']],
+            'F': [['(', 'E', ')'], ['a']],
+        },
+        S='E',
+    )
+
+
+@pytest.mark.parametrize("glc, tamanho_maximo", [
+    (gramatica_anulaveis(), 10),
+    (GLC(V={'S'}, E={'0', '1'}, R={'S': [['0', 'S', '1'], ['ε']]}, S='S'), 8),
+    # Recursivas à esquerda: as rejeições terminam com False, sem esgotar o orçamento.
+    (gramatica_soma(), 8),
+    (gramatica_expressoes(), 4),
+])
+def test_ap_decide_como_earley_e_cyk(glc, tamanho_maximo):
+    ap = conversao_GLC_para_AP(glc)
+    cyk = glc.reconhecedor_cyk()
+    for cadeia in cadeias_ate(glc.E, tamanho_maximo):
+        esperado = glc.aceita(cadeia)
+        assert cyk.aceita(cadeia) == esperado, cadeia
+        assert ap.aceita(cadeia) == esperado, cadeia
+
+
+def test_ap_aceita_com_variaveis_anulaveis():
+    ap = conversao_GLC_para_AP(gramatica_anulaveis())
+    assert ap.aceita('')
+    assert ap.aceita('a')
+    assert ap.aceita('a' * 8)
+    assert not ap.aceita('a' * 9)
+
+
+def test_recursao_a_esquerda_rejeita_sem_esgotar_memoria():
+    ap = conversao_GLC_para_AP(gramatica_soma())
+    assert ap.aceita('+', limite_passos=1000) is False
+    assert ap.aceita('a+a+', limite_passos=1000) is False
+    assert ap.aceita('a+a+a', limite_passos=1000) is True
+
+    ap = conversao_GLC_para_AP(gramatica_expressoes())
+    cadeia = '(a+a)*a+' * 6 + 'a'
+    assert ap.aceita(cadeia)
+    assert not ap.aceita(cadeia + '+')
+
+
+def test_profundidade_maxima_que_descarta_nao_responde_false():
+    ap = conversao_GLC_para_AP(gramatica_anulaveis())
+    with pytest.raises(OrcamentoEsgotado):
+        ap.aceita('a', profundidade_maxima=3)
+
+
+def test_recursao_anulavel_esgota_o_orcamento():
+    # S -> S S com S anulável: a pilha cresce sem ler entrada e nenhum limite a corta.
+    glc = GLC(V={'S'}, E={'0', '1'}, R={'S': [['0', 'S', '1'], ['S', 'S'], ['ε']]}, S='S')
+    ap = conversao_GLC_para_AP(glc)
+    assert ap.aceita('0101', limite_passos=20_000)
+    with pytest.raises(OrcamentoEsgotado):
+        ap.aceita('1', limite_passos=2_000)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+import asyncio
+import random
+
+import pytest
+
+from automatos import AFDBuscaMultiPadrao, AFDBuscaPadrao, AFNDBuscaPadrao
+from automatos.assincrono import buscar_async, contar_async
+
+# 'ção' ocupa 5 bytes em UTF-8: pacotes de 1 a 3 bytes partem os caracteres
+# multibyte e as ocorrências entre pacotes.
+TEXTO = "a ação, a canção e a ação" + ''.join(random.Random(0).choices("açãoc ", k=2000)) + "ção"
+
+
+def leitor_em_pacotes(dados: bytes, tamanho_pacote: int) -> asyncio.StreamReader:
+    """StreamReader local alimentado em pacotes de `tamanho_pacote` bytes, cedendo o ciclo entre eles."""
+    leitor = asyncio.StreamReader()
+
+    async def alimentar():
+        for inicio in range(0, len(dados), tamanho_pacote):
+            leitor.feed_data(dados[inicio:inicio + tamanho_pacote])
+            await asyncio.sleep(0)
+        leitor.feed_eof()
+
+    asyncio.get_running_loop().create_task(alimentar())
+    return leitor
+
+
+async def blocos_de_texto(texto: str, tamanho: int):
+    for inicio in range(0, len(texto), tamanho):
+        yield texto[inicio:inicio + tamanho]
+        await asyncio.sleep(0)
+
+
+async def recolher(iterador) -> list:
+    return [ocorrencia async for ocorrencia in iterador]
+
+
+@pytest.mark.parametrize('busca', [
+    AFDBuscaPadrao("ção"), AFNDBuscaPadrao("ção"), AFDBuscaMultiPadrao(["ção", "ão", "a a"]),
+], ids=['kmp', 'shift-and', 'aho-corasick'])
+def test_busca_assincrona_coincide_com_buscar_e_buscar_stream(busca):
+    esperado = busca.buscar(TEXTO)
+    assert esperado
+    dados = TEXTO.encode('utf-8')
+    assert list(busca.buscar_stream(dados, chunk_size=3)) == esperado
+
+    async def verificar():
+        for tamanho_pacote in (1, 2, 3, 7):
+            # `chunk_size` menor do que o pacote: cada pacote chega em várias leituras.
+            for chunk_size in (1, 2, 5, 4096):
+                ocorrencias = await recolher(busca.buscar_async(leitor_em_pacotes(dados, tamanho_pacote), chunk_size))
+                assert ocorrencias == esperado, (tamanho_pacote, chunk_size)
+            assert await busca.contar_async(leitor_em_pacotes(dados, tamanho_pacote), 4) == len(esperado)
+
+        assert await recolher(busca.buscar_async(blocos_de_texto(TEXTO, 5))) == esperado
+        # Com limite_executor=1 todos os blocos são varridos no executor.
+        ocorrencias = await recolher(buscar_async(busca, leitor_em_pacotes(dados, 3), 4, limite_executor=1))
+        assert ocorrencias == esperado
+        assert await contar_async(busca, blocos_de_texto(TEXTO, 5), 5, limite_executor=1) == len(esperado)
+
+    asyncio.run(verificar())
+
+
+def test_ocorrencia_partida_entre_pacotes():
+    texto = "xxxxxgattacaxxxx"
+    busca = AFDBuscaPadrao("gattaca")
+
+    async def verificar():
+        return await recolher(busca.buscar_async(leitor_em_pacotes(texto.encode('utf-8'), 8), 8))
+
+    assert asyncio.run(verificar()) == busca.buscar(texto) == [5]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+import itertools
+import random
+import struct
+
+import pytest
+
+from automatos import AFD, AFND, compilar_regex
+from automatos import binario
+from automatos.lote import aceita_lote
+
+CADEIAS = [''.join(c) for n in range(6) for c in itertools.product('abcx', repeat=n)]
+
+
+def afd_aleatorio(aleatorio: random.Random) -> AFD:
+    estados = [f"q{i}" for i in range(aleatorio.randint(1, 7))]
+    transicoes = {estado: {simbolo: aleatorio.choice(estados) for simbolo in 'abc' if aleatorio.random() < 0.7}
+                  for estado in estados}
+    finais = {estado for estado in estados if aleatorio.random() < 0.4}
+    return AFD(set(estados), set('abc'), transicoes, estados[0], finais)
+
+
+def afnd_aleatorio(aleatorio: random.Random) -> AFND:
+    estados = [f"p{i}" for i in range(aleatorio.randint(1, 6))]
+    transicoes = {}
+    for origem in estados:
+        for simbolo in ('a', 'b', AFND.EPSILON):
+            destinos = {aleatorio.choice(estados) for _ in range(aleatorio.randint(0, 2))}
+            if destinos:
+                transicoes.setdefault(origem, {})[simbolo] = destinos
+    finais = {estado for estado in estados if aleatorio.random() < 0.4}
+    return AFND(set(estados), {'a', 'b'}, transicoes, estados[0], finais)
+
+
+def transicoes(automato) -> dict:
+    return {estado: dict(linha) for estado, linha in automato.transicoes.items() if linha}
+
+
+def test_afd_ida_e_volta(tmp_path):
+    aleatorio = random.Random(0)
+    caminho = tmp_path / 'afd.bin'
+    for _ in range(100):
+        afd = afd_aleatorio(aleatorio)
+        afd.salvar_automato(caminho, binario=True)
+        assert binario.eh_binario(caminho)
+        with AFD.abrir_arquivo(caminho) as carregado:
+            assert carregado.compilar().arquivo is not None
+            assert [carregado.aceita(c) for c in CADEIAS] == [afd.aceita(c) for c in CADEIAS]
+            assert carregado.estados == afd.estados and carregado.alfabeto == afd.alfabeto
+            assert carregado.estado_inicial == afd.estado_inicial
+            assert carregado.estados_finais == afd.estados_finais
+            assert transicoes(carregado) == transicoes(afd)
+        # Depois de fechado, as tabelas são cópias e o ficheiro pode ser reescrito.
+        assert carregado.compilar().arquivo is None and carregado.compilar_classes().arquivo is None
+        caminho.write_bytes(b'')
+        assert [carregado.aceita(c) for c in CADEIAS] == [afd.aceita(c) for c in CADEIAS]
+
+
+def test_regex_ida_e_volta(tmp_path):
+    caminho = tmp_path / 'regex.bin'
+    regex = compilar_regex('(a|.b)*c?')
+    regex.salvar_automato(caminho, binario=True)
+    with AFD.abrir_arquivo(caminho) as carregado:
+        assert [carregado.aceita(c) for c in CADEIAS] == [regex.aceita(c) for c in CADEIAS]
+        # O compilado mapeado também pode ser enviado para outros processos.
+        resultado = aceita_lote(carregado.compilar_classes(), CADEIAS, workers=2, limite_local=0)
+        assert resultado == [regex.aceita(c) for c in CADEIAS]
+
+
+def test_le_a_versao_1(tmp_path):
+    caminho = tmp_path / 'v1.bin'
+    afd = afd_aleatorio(random.Random(1))
+    afd.salvar_automato(caminho, binario=True)
+    dados = bytearray(caminho.read_bytes())
+    por_classes = afd.compilar_classes()
+    # A versão 1 termina na tabela simples: sem n_classes, classes nem tabela por classes.
+    tamanho_classes = 4 + 4 * len(afd.compilar().simbolos) + 4 * len(por_classes.tabela)
+    del dados[len(dados) - tamanho_classes:]
+    struct.pack_into('<H', dados, 4, 1)
+    caminho.write_bytes(dados)
+    with AFD.abrir_arquivo(caminho) as carregado:
+        assert [carregado.aceita(c) for c in CADEIAS] == [afd.aceita(c) for c in CADEIAS]
+
+
+def test_afnd_ida_e_volta(tmp_path):
+    aleatorio = random.Random(2)
+    caminho = tmp_path / 'afnd.bin'
+    for _ in range(50):
+        afnd = afnd_aleatorio(aleatorio)
+        afnd.salvar_automato(caminho, binario=True)
+        carregado = AFND.from_file(caminho)
+        assert [carregado.aceita(c) for c in CADEIAS] == [afnd.aceita(c) for c in CADEIAS]
+        assert carregado.estados == afnd.estados and carregado.estados_finais == afnd.estados_finais
+        assert transicoes(carregado) == transicoes(afnd)
+
+
+def test_ficheiros_invalidos(tmp_path):
+    caminho = tmp_path / 'afnd.bin'
+    afnd_aleatorio(random.Random(3)).salvar_automato(caminho, binario=True)
+    with pytest.raises(ValueError):
+        AFD.abrir_arquivo(caminho)
+    dados = bytearray(caminho.read_bytes())
+    struct.pack_into('<H', dados, 4, binario.VERSAO + 1)
+    caminho.write_bytes(dados)
+    with pytest.raises(ValueError):
+        AFND.from_file(caminho)
+    with pytest.raises(ValueError):
+        AFD().salvar_automato(tmp_path / 'vazio.bin', binario=True)
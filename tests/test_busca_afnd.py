@@ -0,0 +1,49 @@
+from __future__ import annotations
+import random
+
+import pytest
+
+from automatos import AFNDBuscaPadrao
+
+
+def ocorrencias_ingenuas(padrao: str, texto: str) -> list[int]:
+    return [i for i in range(len(texto) - len(padrao) + 1) if texto.startswith(padrao, i)]
+
+
+def test_shift_and_coincide_com_conjuntos_e_busca_ingenua():
+    aleatorio = random.Random(0)
+    for _ in range(300):
+        alfabeto = 'abc'[:aleatorio.randint(1, 3)]
+        padrao = ''.join(aleatorio.choices(alfabeto, k=aleatorio.randint(1, 8)))
+        texto = ''.join(aleatorio.choices(alfabeto + 'x', k=200))
+        busca = AFNDBuscaPadrao(padrao)
+        esperado = ocorrencias_ingenuas(padrao, texto)
+        assert busca.buscar(texto) == esperado, padrao
+        assert busca.buscar(texto, bitparalelo=False) == esperado, padrao
+
+
+@pytest.mark.parametrize('tamanho', [63, 64, 65, 200])
+def test_padroes_maiores_que_uma_palavra(tamanho):
+    padrao = ('ab' * tamanho)[:tamanho - 1] + 'c'
+    texto = 'x' + padrao + padrao[:-1] + padrao
+    busca = AFNDBuscaPadrao(padrao)
+    assert busca.buscar(texto) == ocorrencias_ingenuas(padrao, texto)
+
+
+def test_afnd_modificado_volta_a_simulacao_por_conjuntos():
+    busca = AFNDBuscaPadrao('ab')
+    assert busca.bitparalelo_disponivel()
+    # Passa a reconhecer também 'aa': as máscaras deixam de descrever o AFND.
+    busca.transicoes['1']['a'].add('2')
+    assert not busca.bitparalelo_disponivel()
+    assert busca.buscar('xaabab') == [1, 2, 4]
+
+
+def test_estado_bitparalelo_atravessa_blocos():
+    padrao = 'abaab'
+    texto = ''.join(random.Random(3).choices('abx', k=5_000))
+    busca = AFNDBuscaPadrao(padrao)
+    esperado = ocorrencias_ingenuas(padrao, texto)
+    for tamanho_bloco in (1, 2, 5, 97):
+        assert list(busca.buscar_stream(texto.encode(), chunk_size=tamanho_bloco)) == esperado
+        assert busca.contar_stream(texto.encode(), chunk_size=tamanho_bloco) == len(esperado)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+import random
+
+import pytest
+
+from automatos import AFD, AFDBuscaMultiPadrao, AFDBuscaPadrao
+
+
+def transicoes(afd: AFD) -> dict:
+    return {estado: dict(linha) for estado, linha in afd.transicoes.items()}
+
+
+def construir_referencia(padrao: str) -> AFD:
+    afd = AFD()
+    AFDBuscaPadrao._construir_automato_de_padrao_referencia(afd, padrao)
+    return afd
+
+
+def palavra_de_fibonacci(tamanho: int) -> str:
+    anterior, atual = "a", "ab"
+    while len(atual) < tamanho:
+        anterior, atual = atual, atual + anterior
+    return atual[:tamanho]
+
+
+def padroes_adversariais():
+    for n in range(1, 12):
+        yield "a" * n
+        yield "a" * n + "b"
+        yield "b" + "a" * n
+        yield ("ab" * n)[:n + 1]
+        yield palavra_de_fibonacci(n + 1)
+    yield "aabaabaaab"
+    yield "abacabadabacaba"
+    yield "abcabcabd"
+
+
+def padroes_aleatorios(quantidade: int, semente: int = 0):
+    aleatorio = random.Random(semente)
+    for _ in range(quantidade):
+        alfabeto = "abcd"[:aleatorio.randint(1, 4)]
+        yield ''.join(aleatorio.choices(alfabeto, k=aleatorio.randint(1, 16)))
+
+
+def ocorrencias_ingenuas(padrao: str, texto: str) -> list[int]:
+    return [i for i in range(len(texto) - len(padrao) + 1) if texto.startswith(padrao, i)]
+
+
+@pytest.mark.parametrize('padroes', [list(padroes_adversariais()), list(padroes_aleatorios(2000))],
+                         ids=['adversariais', 'aleatorios'])
+def test_kmp_coincide_com_a_construcao_de_referencia(padroes):
+    aleatorio = random.Random(1)
+    for padrao in padroes:
+        busca = AFDBuscaPadrao(padrao)
+        referencia = construir_referencia(padrao)
+        assert transicoes(busca) == transicoes(referencia), padrao
+        assert busca.estados == referencia.estados and busca.estados_finais == referencia.estados_finais
+
+        texto = ''.join(aleatorio.choices(sorted(set(padrao)) + ['x'], k=200)) + padrao
+        assert busca.buscar(texto) == ocorrencias_ingenuas(padrao, texto), padrao
+
+
+def test_aho_corasick_coincide_com_buscas_ingenuas():
+    aleatorio = random.Random(2)
+    for _ in range(200):
+        padroes = list(padroes_aleatorios(aleatorio.randint(1, 5), aleatorio.random()))
+        texto = ''.join(aleatorio.choices('abcdx', k=300))
+        esperado = sorted((i, id_padrao) for id_padrao, padrao in enumerate(padroes)
+                          for i in ocorrencias_ingenuas(padrao, texto))
+        encontrados = AFDBuscaMultiPadrao(padroes).buscar(texto)
+        assert sorted((i, id_padrao) for id_padrao, i in encontrados) == esperado, padroes
+
+
+def test_padrao_vazio_e_recusado():
+    with pytest.raises(ValueError):
+        AFDBuscaPadrao('')
+    with pytest.raises(ValueError):
+        AFDBuscaMultiPadrao(['a', ''])
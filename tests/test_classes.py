@@ -0,0 +1,82 @@
+from __future__ import annotations
+import pickle
+import random
+
+from automatos import AFD
+from automatos.classes import BLOCO
+
+ALFABETO = list('abcdefgh') + ['é', '€', '😀']
+
+
+def afd_aleatorio(aleatorio: random.Random, alfabeto) -> AFD:
+    estados = [f"q{i}" for i in range(aleatorio.randint(1, 6))]
+    # Poucos destinos por estado, para que vários símbolos partilhem a mesma coluna.
+    transicoes = {}
+    for estado in estados:
+        destinos = aleatorio.sample(estados, min(2, len(estados)))
+        transicoes[estado] = {s: aleatorio.choice(destinos) for s in alfabeto if aleatorio.random() < 0.8}
+    finais = {estado for estado in estados if aleatorio.random() < 0.4}
+    return AFD(set(estados), set(alfabeto), transicoes, estados[0], finais)
+
+
+def aceita_ingenuo(afd: AFD, cadeia) -> bool:
+    estado = afd.estado_inicial
+    for simbolo in cadeia:
+        estado = afd.transicoes.get(estado, {}).get(simbolo, afd.estado_inicial)
+    return estado in afd.estados_finais
+
+
+def test_classes_coincidem_com_tabela_simples_e_dicionarios():
+    aleatorio = random.Random(0)
+    for _ in range(100):
+        afd = afd_aleatorio(aleatorio, ALFABETO)
+        por_classes = afd.compilar_classes()
+        simples = afd.compilar()
+        assert por_classes.largura <= simples.largura
+        for _ in range(30):
+            cadeia = ''.join(aleatorio.choices(ALFABETO + ['x', 'Ω'], k=aleatorio.randint(0, 20)))
+            esperado = aceita_ingenuo(afd, cadeia)
+            assert por_classes.aceita(cadeia) == esperado, cadeia
+            assert simples.aceita(cadeia) == esperado, cadeia
+            assert afd.aceita(list(cadeia)) == esperado, cadeia
+
+
+def test_cadeia_maior_que_um_bloco():
+    aleatorio = random.Random(1)
+    afd = afd_aleatorio(aleatorio, ALFABETO)
+    cadeia = ''.join(aleatorio.choices(ALFABETO + ['x'], k=3 * BLOCO + 17))
+    assert afd.aceita(cadeia) == aceita_ingenuo(afd, cadeia)
+
+
+def test_entrada_em_bytes():
+    aleatorio = random.Random(2)
+    for _ in range(50):
+        afd = afd_aleatorio(aleatorio, list(range(0, 256, 7)))
+        particao = afd.compilar_classes().classes
+        assert particao.tabela_bytes is not None
+        for _ in range(20):
+            dados = bytes(aleatorio.choices(range(256), k=aleatorio.randint(0, 30)))
+            esperado = aceita_ingenuo(afd, dados)
+            assert afd.aceita(dados) == esperado
+            assert afd.aceita(bytearray(dados)) == esperado
+            assert afd.aceita(list(dados)) == esperado
+
+
+def test_mais_de_256_classes():
+    # Uma cadeia de 300 estados em que cada símbolo só avança num estado: todas as colunas diferem.
+    simbolos = [chr(0x100 + i) for i in range(300)]
+    transicoes = {f"q{i}": {simbolos[i]: f"q{i + 1}"} for i in range(300)}
+    afd = AFD({f"q{i}" for i in range(301)}, set(simbolos), transicoes, 'q0', {'q300'})
+    particao = afd.compilar_classes().classes
+    assert particao.n_classes == 301
+    assert particao.tabela_caracteres is None and particao.tabela_bytes is None
+    assert afd.aceita(''.join(simbolos))
+    assert not afd.aceita(''.join(simbolos[:-1]) + 'x')
+
+
+def test_particao_serializavel():
+    afd = afd_aleatorio(random.Random(3), ALFABETO)
+    compilado = afd.compilar_classes()
+    copia = pickle.loads(pickle.dumps(compilado))
+    for cadeia in ('abc€😀', 'ééé', 'hgfe'):
+        assert copia.aceita(cadeia) == compilado.aceita(cadeia)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+import itertools
+import pickle
+import random
+
+import pytest
+
+from automatos import AFD, AFDCompacto, AFND, AFNDCompacto
+
+CADEIAS = [''.join(c) for n in range(6) for c in itertools.product('abx', repeat=n)]
+
+
+def afd_aleatorio(aleatorio: random.Random) -> AFD:
+    estados = [f"q{i}" for i in range(aleatorio.randint(1, 7))]
+    transicoes = {estado: {simbolo: aleatorio.choice(estados) for simbolo in 'ab' if aleatorio.random() < 0.7}
+                  for estado in estados}
+    finais = {estado for estado in estados if aleatorio.random() < 0.4}
+    return AFD(set(estados) | {'isolado'}, {'a', 'b'}, transicoes, estados[0], finais)
+
+
+def afnd_aleatorio(aleatorio: random.Random) -> AFND:
+    estados = [f"p{i}" for i in range(aleatorio.randint(1, 6))]
+    transicoes = {}
+    for origem in estados:
+        for simbolo in ('a', 'b', AFND.EPSILON):
+            destinos = {aleatorio.choice(estados) for _ in range(aleatorio.randint(0, 2))}
+            if destinos:
+                transicoes.setdefault(origem, {})[simbolo] = destinos
+    finais = {estado for estado in estados if aleatorio.random() < 0.4}
+    return AFND(set(estados) | {'isolado'}, {'a', 'b'}, transicoes, estados[0], finais)
+
+
+def transicoes(automato) -> dict:
+    return {estado: dict(linha) for estado, linha in automato.transicoes.items() if linha}
+
+
+def test_afd_compacto_coincide_com_afd():
+    aleatorio = random.Random(0)
+    for _ in range(100):
+        afd = afd_aleatorio(aleatorio)
+        arestas = [(o, s, d) for o, linha in afd.transicoes.items() for s, d in linha.items()]
+        for compacto in (AFDCompacto.de_afd(afd),
+                         AFDCompacto.de_arestas(arestas, afd.estado_inicial, afd.estados_finais, afd.alfabeto)):
+            assert [compacto.aceita(c) for c in CADEIAS] == [afd.aceita(c) for c in CADEIAS]
+            assert compacto.aceita_lote(CADEIAS) == [afd.aceita(c) for c in CADEIAS]
+            assert transicoes(compacto) == transicoes(afd)
+            assert compacto.estado_inicial == afd.estado_inicial
+            assert compacto.estados_finais == afd.estados_finais
+            assert transicoes(compacto.para_afd()) == transicoes(afd)
+        assert set(AFDCompacto.de_afd(afd).estados) == afd.estados
+
+
+def test_afnd_compacto_coincide_com_afnd():
+    aleatorio = random.Random(1)
+    for _ in range(100):
+        afnd = afnd_aleatorio(aleatorio)
+        compacto = AFNDCompacto.de_afnd(afnd)
+        assert [compacto.aceita(c) for c in CADEIAS] == [afnd.aceita(c) for c in CADEIAS]
+        assert compacto.aceita_lote(CADEIAS) == [afnd.aceita(c) for c in CADEIAS]
+        for estado in afnd.estados:
+            assert compacto.e_fecho(estado) == afnd.e_fecho(estado)
+        assert set(compacto.estados) == afnd.estados
+        assert transicoes(compacto) == transicoes(afnd)
+        assert transicoes(compacto.para_afnd()) == transicoes(afnd)
+        copia = pickle.loads(pickle.dumps(compacto))
+        assert [copia.aceita(c) for c in CADEIAS] == [afnd.aceita(c) for c in CADEIAS]
+
+
+@pytest.mark.parametrize('binario', [False, True])
+def test_abrir_arquivo(binario, tmp_path):
+    aleatorio = random.Random(2)
+    afd = afd_aleatorio(aleatorio)
+    afnd = afnd_aleatorio(aleatorio)
+    afd.salvar_automato(tmp_path / 'afd', binario=binario)
+    afnd.salvar_automato(tmp_path / 'afnd', binario=binario)
+    with AFDCompacto.abrir_arquivo(tmp_path / 'afd') as compacto:
+        assert [compacto.aceita(c) for c in CADEIAS] == [afd.aceita(c) for c in CADEIAS]
+        assert transicoes(compacto) == transicoes(afd)
+    with AFNDCompacto.abrir_arquivo(tmp_path / 'afnd') as compacto:
+        assert [compacto.aceita(c) for c in CADEIAS] == [afnd.aceita(c) for c in CADEIAS]
+        assert set(compacto.estados) == afnd.estados
+    # Depois de fechado continua utilizável, com vetores próprios.
+    assert [compacto.aceita(c) for c in CADEIAS] == [afnd.aceita(c) for c in CADEIAS]
+
+
+def test_arestas_repetidas_sao_descartadas():
+    arestas = [('0', 'a', '1'), ('0', 'a', '1'), ('1', AFND.EPSILON, '0'), ('0', 'b', '0')]
+    compacto = AFNDCompacto.de_arestas(arestas, '0', {'1'})
+    assert len(compacto.arestas_destino) == 3
+    assert compacto.alfabeto == {'a', 'b'}
+    assert compacto.aceita('aba') and not compacto.aceita('ab')
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import itertools
+import random
+
+from automatos import AFND
+
+EPSILON = AFND.EPSILON
+
+
+def afnd_aleatorio(aleatorio: random.Random, n_estados: int) -> AFND:
+    estados = [f"q{i}" for i in range(n_estados)]
+    transicoes = {}
+    for origem in estados:
+        for simbolo in ('a', 'b', EPSILON):
+            destinos = {aleatorio.choice(estados) for _ in range(aleatorio.randint(0, 2))}
+            if destinos:
+                transicoes.setdefault(origem, {})[simbolo] = destinos
+    finais = set(aleatorio.sample(estados, min(n_estados, aleatorio.randint(1, 2))))
+    return AFND(set(estados), {'a', 'b'}, transicoes, 'q0', finais)
+
+
+def fecho_ingenuo(afnd: AFND, estados) -> set:
+    fecho = set(estados)
+    pilha = list(fecho)
+    while pilha:
+        estado = pilha.pop()
+        for destino in afnd.transicoes.get(estado, {}).get(EPSILON, ()):
+            if destino not in fecho:
+                fecho.add(destino)
+                pilha.append(destino)
+    return fecho
+
+
+def aceita_ingenuo(afnd: AFND, cadeia: str) -> bool:
+    ativos = fecho_ingenuo(afnd, {afnd.estado_inicial})
+    for simbolo in cadeia:
+        ativos = fecho_ingenuo(afnd, {d for e in ativos for d in afnd.transicoes.get(e, {}).get(simbolo, ())})
+    return not ativos.isdisjoint(afnd.estados_finais)
+
+
+def test_fechos_coincidem_com_busca_em_profundidade():
+    aleatorio = random.Random(0)
+    for _ in range(300):
+        afnd = afnd_aleatorio(aleatorio, aleatorio.randint(1, 12))
+        for estado in afnd.estados:
+            assert afnd.e_fecho(estado) == fecho_ingenuo(afnd, {estado})
+        conjunto = set(aleatorio.sample(sorted(afnd.estados), min(3, len(afnd.estados))))
+        assert afnd.e_fecho(conjunto) == fecho_ingenuo(afnd, conjunto)
+
+
+def test_estados_da_mesma_componente_partilham_o_fecho():
+    transicoes = {'a': {EPSILON: {'b'}}, 'b': {EPSILON: {'c'}}, 'c': {EPSILON: {'a', 'd'}}}
+    afnd = AFND({'a', 'b', 'c', 'd'}, set(), transicoes, 'a', {'d'})
+    fechos = afnd.fechos_epsilon()
+    assert fechos['a'] is fechos['b'] is fechos['c']
+    assert fechos['a'] == {'a', 'b', 'c', 'd'}
+
+
+def test_indice_e_recalculado_apos_modificacao():
+    afnd = AFND({'p', 'q', 'r'}, {'a'}, {'p': {EPSILON: {'q'}}}, 'p', {'r'})
+    assert afnd.e_fecho('p') == {'p', 'q'}
+    afnd.transicoes['q'][EPSILON].add('r')
+    assert afnd.e_fecho('p') == {'p', 'q', 'r'}
+    assert afnd.aceita('')
+
+
+def test_cadeia_epsilon_profunda_sem_recursao():
+    n = 200_000
+    transicoes = {f"q{i}": {EPSILON: {f"q{i + 1}"}} for i in range(n)}
+    transicoes[f"q{n}"] = {EPSILON: {'q0'}}
+    afnd = AFND({f"q{i}" for i in range(n + 1)}, set(), transicoes, 'q0', {f"q{n}"})
+    assert len(afnd.e_fecho('q0')) == n + 1
+
+
+def test_aceita_coincide_com_simulacao_ingenua():
+    aleatorio = random.Random(1)
+    for _ in range(100):
+        afnd = afnd_aleatorio(aleatorio, aleatorio.randint(1, 8))
+        for tamanho in range(5):
+            for cadeia in map(''.join, itertools.product('ab', repeat=tamanho)):
+                assert afnd.aceita(cadeia) == aceita_ingenuo(afnd, cadeia)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+import itertools
+import random
+
+from gramatica_livre_contexto import GLC
+
+
+def gramatica_aleatoria(aleatorio: random.Random) -> GLC:
+    # 'C' está em V mas pode ficar sem produções.
+    variaveis = ['S', 'A', 'B', 'C']
+    simbolos = variaveis + ['a', 'b']
+    regras = {}
+    for variavel in variaveis[:3] + (['C'] if aleatorio.random() < 0.5 else []):
+        regras[variavel] = [[aleatorio.choice(simbolos) for _ in range(aleatorio.randint(0, 3))] or ['ε']
+                            for _ in range(aleatorio.randint(1, 3))]
+    return GLC(V=set(variaveis), E={'a', 'b'}, R=regras, S='S')
+
+
+def cadeias_ate(alfabeto, tamanho_maximo: int):
+    for tamanho in range(tamanho_maximo + 1):
+        for simbolos in itertools.product(sorted(alfabeto), repeat=tamanho):
+            yield ''.join(simbolos)
+
+
+def folhas(arvore) -> str:
+    if isinstance(arvore, str):
+        return '' if arvore == 'ε' else arvore
+    return ''.join(folhas(filho) for filho in arvore[1])
+
+
+def verificar_arvore(glc: GLC, arvore):
+    if isinstance(arvore, str):
+        return
+    variavel, filhos = arvore
+    simbolos = [filho if isinstance(filho, str) else filho[0] for filho in filhos]
+    producoes = [[s for s in producao if s != 'ε'] for producao in glc.R[variavel]]
+    assert simbolos in producoes, (variavel, simbolos)
+    for filho in filhos:
+        verificar_arvore(glc, filho)
+
+
+def test_earley_coincide_com_cyk_em_gramaticas_aleatorias():
+    aleatorio = random.Random(0)
+    for _ in range(150):
+        glc = gramatica_aleatoria(aleatorio)
+        cyk = glc.reconhecedor_cyk()
+        for cadeia in cadeias_ate('ab', 5):
+            aceita = glc.aceita(cadeia)
+            assert aceita == cyk.aceita(cadeia), (glc.R, cadeia)
+            # Tokens que são variáveis nunca são lidos como terminais.
+            assert not glc.aceita(cadeia + 'C')
+            if aceita:
+                arvore = glc.analisar(cadeia).arvore()
+                assert arvore[0] == 'S' and folhas(arvore) == cadeia
+                verificar_arvore(glc, arvore)
+
+
+def test_variavel_sem_producoes_nao_e_terminal():
+    glc = GLC(V={'S', 'A'}, E={'a'}, R={'S': [['A', 'a'], ['a']]}, S='S')
+    assert not glc.aceita('Aa')
+    assert glc.aceita('a')
+    assert glc.aceita('Aa') == glc.reconhecedor_cyk().aceita('Aa')
+
+
+def test_floresta_de_gramatica_ambigua():
+    glc = GLC(V={'E'}, E={'a', '+'}, R={'E': [['E', '+', 'E'], ['a']]}, S='E')
+    raiz = glc.analisar('a+a+a')
+    assert raiz is not None and raiz.ambiguo()
+    assert folhas(raiz.arvore()) == 'a+a+a'
+    assert glc.analisar('a+') is None
+
+
+def test_aceita_sequencias_de_tokens():
+    glc = GLC(V={'S'}, E={'id', '+'}, R={'S': [['S', '+', 'id'], ['id']]}, S='S')
+    assert glc.aceita(['id', '+', 'id'])
+    assert not glc.aceita(['id', '+'])
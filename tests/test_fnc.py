@@ -0,0 +1,65 @@
+from __future__ import annotations
+import itertools
+import random
+
+import pytest
+
+from gramatica_livre_contexto import GLC
+from gramatica_livre_contexto.fnc import ReconhecedorCYK
+
+
+def gramatica_aleatoria(aleatorio: random.Random) -> GLC:
+    variaveis = ['S', 'A', 'B']
+    simbolos = variaveis + ['a', 'b']
+    regras = {variavel: [[aleatorio.choice(simbolos) for _ in range(aleatorio.randint(0, 4))] or ['ε']
+                         for _ in range(aleatorio.randint(1, 3))]
+              for variavel in variaveis}
+    return GLC(V=set(variaveis), E={'a', 'b'}, R=regras, S='S')
+
+
+def cadeias_ate(tamanho_maximo: int):
+    for tamanho in range(tamanho_maximo + 1):
+        yield from map(''.join, itertools.product('ab', repeat=tamanho))
+
+
+def na_fnc(glc: GLC) -> bool:
+    for variavel, producoes in glc.R.items():
+        for producao in producoes:
+            if producao == ['ε']:
+                if variavel != glc.S:
+                    return False
+            elif len(producao) == 1:
+                if producao[0] in glc.R:
+                    return False
+            elif len(producao) != 2 or any(s not in glc.R or s == glc.S for s in producao):
+                return False
+    return True
+
+
+def test_fnc_e_cyk_coincidem_com_earley():
+    aleatorio = random.Random(0)
+    for _ in range(200):
+        glc = gramatica_aleatoria(aleatorio)
+        fnc = glc.para_FNC()
+        assert na_fnc(fnc), fnc.R
+        cyk = ReconhecedorCYK(fnc)
+        cadeias = list(cadeias_ate(6))
+        esperado = [glc.aceita(c) for c in cadeias]
+        assert cyk.aceita_lote(cadeias) == esperado, glc.R
+        assert [fnc.aceita(c) for c in cadeias] == esperado, glc.R
+
+
+def test_nomes_novos_nao_colidem():
+    # Os nomes que a conversão escolheria (S0, T_a, S_) já estão em uso.
+    glc = GLC(V={'S', 'S0', 'T_a', 'S_'}, E={'a', 'b'},
+              R={'S': [['a', 'S0', 'T_a', 'b'], ['S_']], 'S0': [['a']], 'T_a': [['b']], 'S_': [['ε']]}, S='S')
+    fnc = glc.para_FNC()
+    assert na_fnc(fnc)
+    for cadeia in cadeias_ate(5):
+        assert fnc.reconhecedor_cyk().aceita(cadeia) == glc.aceita(cadeia), cadeia
+
+
+def test_producao_fora_da_fnc():
+    glc = GLC(V={'S'}, E={'a'}, R={'S': [['a', 'S', 'a'], ['a']]}, S='S')
+    with pytest.raises(ValueError):
+        ReconhecedorCYK(glc)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def executar(codigo: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+
+
+def test_importar_pacotes_nao_carrega_submodulos():
+    resultado = executar(
+        "import sys, automatos, gramatica_livre_contexto\n"
+        "print(sorted(m for m in sys.modules if m.startswith(('automatos.', 'gramatica_livre_contexto.'))))\n"
+    )
+    assert resultado.stdout.strip() == '[]'
+    assert resultado.stderr == ''
+
+
+@pytest.mark.parametrize('codigo', [
+    "from automatos import AFD, AFDBuscaPadrao\n"
+    "AFD({'0'}, {'a'}, {'0': {'a': '0'}}, '0', {'0'}).aceita('aa')\n"
+    "AFDBuscaPadrao('ab').buscar('xab')\n",
+    "from gramatica_livre_contexto import GLC\n"
+    "GLC(V={'S'}, E={'a'}, R={'S': [['a']]}, S='S').aceita('a')\n",
+])
+def test_uso_basico_nao_carrega_dependencias_pesadas(codigo):
+    resultado = executar(
+        codigo + "import sys\n"
+        "print(sorted(m for m in ('asyncio', 'concurrent.futures', 'numpy', 'multiprocessing') if m in sys.modules))\n"
+    )
+    assert resultado.stdout.strip() == '[]'
+    assert resultado.stderr == ''
+
+
+def test_exportacoes():
+    import automatos
+    import gramatica_livre_contexto
+    for pacote in (automatos, gramatica_livre_contexto):
+        assert set(pacote.__all__) <= set(dir(pacote))
+        for nome in pacote.__all__:
+            assert getattr(pacote, nome) is not None
+        with pytest.raises(AttributeError):
+            getattr(pacote, 'NaoExiste')
+
+
+def test_mensagens_vao_para_o_logging(caplog, capsys):
+    from automatos import AFDBuscaPadrao
+    with caplog.at_level(logging.DEBUG, logger='automatos'):
+        AFDBuscaPadrao('abc')
+    assert any(registo.name.startswith('automatos.') for registo in caplog.records)
+    saida = capsys.readouterr()
+    assert saida.out == '' and saida.err == ''
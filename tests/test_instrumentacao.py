@@ -0,0 +1,53 @@
+from __future__ import annotations
+import random
+
+import pytest
+
+from automatos import AFD, AFDBuscaMultiPadrao, AFDBuscaPadrao, AFNDBuscaPadrao
+
+
+def texto_aleatorio(tamanho: int, semente: int, alfabeto: str = 'abcx') -> str:
+    return ''.join(random.Random(semente).choices(alfabeto, k=tamanho))
+
+
+def test_simbolo_do_alfabeto_na_classe_outros_nao_e_ausente():
+    # 'c' leva sempre ao estado inicial, por isso fica na classe 0 junto com 'x'.
+    afd = AFD(estados={'0', '1'}, alfabeto={'a', 'c'},
+              transicoes={'0': {'a': '1', 'c': '0'}, '1': {'a': '1', 'c': '0'}},
+              estado_inicial='0', estados_finais={'1'})
+    assert 'c' not in afd.compilar_classes().simbolos
+    instrumentacao = afd.instrumentar()
+    assert afd.aceita('cxcxa')
+    afd.desinstrumentar()
+    assert instrumentacao.contadores['ausentes'] == 2
+    assert instrumentacao.contadores['transicoes'] == 5
+
+
+@pytest.mark.parametrize('busca', [
+    AFDBuscaPadrao('abca'),
+    AFDBuscaMultiPadrao(['ab', 'bca', 'a']),
+    AFNDBuscaPadrao('abca'),
+], ids=['kmp', 'aho-corasick', 'shift-and'])
+def test_busca_instrumentada_coincide_com_a_normal(busca):
+    texto = texto_aleatorio(3_000, 1)
+    esperado = busca.buscar(texto)
+    passos = []
+    instrumentacao = busca.instrumentar(lambda posicao, simbolo, estado: passos.append(posicao))
+    assert busca.buscar(texto) == esperado
+    assert busca.desinstrumentar() is instrumentacao
+
+    contadores = instrumentacao.contadores
+    assert contadores['transicoes'] == len(texto)
+    assert contadores['ausentes'] == texto.count('x')
+    assert contadores['ocorrencias'] == len(esperado)
+    assert passos == list(range(len(texto)))
+    assert busca.buscar(texto) == esperado and 'instrumentacao' not in busca.__dict__
+
+
+@pytest.mark.parametrize('busca', [AFDBuscaPadrao('aab'), AFDBuscaMultiPadrao(['aab', 'ab', 'b'])],
+                         ids=['kmp', 'aho-corasick'])
+def test_contar_e_varredura_em_blocos(busca):
+    texto = texto_aleatorio(2_000, 2, 'abx')
+    esperado = busca.buscar(texto)
+    assert busca.contar_stream(texto.encode(), chunk_size=7) == len(esperado)
+    assert list(busca.buscar_stream(texto.encode(), chunk_size=5)) == esperado
@@ -0,0 +1,43 @@
+from __future__ import annotations
+import itertools
+import random
+
+import pytest
+
+from automatos import AFD, AFND, compilar_regex
+from automatos.lote import aceita_lote
+
+CADEIAS = [''.join(c) for n in range(7) for c in itertools.product('abx', repeat=n)]
+
+
+def afd_multiplos_de_tres() -> AFD:
+    # Aceita as cadeias com um número de 'a' múltiplo de 3; 'x' volta ao início.
+    transicoes = {str(i): {'a': str((i + 1) % 3), 'b': str(i)} for i in range(3)}
+    return AFD({'0', '1', '2'}, {'a', 'b'}, transicoes, '0', {'0'})
+
+
+def afnd_termina_em_ab() -> AFND:
+    transicoes = {'p': {'a': {'p', 'q'}, 'b': {'p'}, 'x': {'p'}}, 'q': {'b': {'r'}}, 'r': {AFND.EPSILON: {'s'}}}
+    return AFND({'p', 'q', 'r', 's'}, {'a', 'b', 'x'}, transicoes, 'p', {'s'})
+
+
+AUTOMATOS = [afd_multiplos_de_tres(), afnd_termina_em_ab(), compilar_regex('(a|b)*x?b')]
+IDS = ['afd', 'afnd', 'regex']
+
+
+@pytest.mark.parametrize('automato', AUTOMATOS, ids=IDS)
+def test_lote_local_coincide_com_aceita(automato):
+    assert automato.aceita_lote(CADEIAS) == [automato.aceita(c) for c in CADEIAS]
+    assert automato.aceita_lote(iter(CADEIAS), workers=1) == [automato.aceita(c) for c in CADEIAS]
+
+
+@pytest.mark.parametrize('automato', AUTOMATOS, ids=IDS)
+def test_lote_com_processos_coincide_com_aceita(automato):
+    cadeias = CADEIAS + [''.join(random.Random(i).choices('abx', k=50)) for i in range(200)]
+    compilado = automato.compilar_classes() if isinstance(automato, AFD) else automato.compilar()
+    resultado = aceita_lote(compilado, cadeias, workers=2, chunksize=37, limite_local=0)
+    assert resultado == [automato.aceita(c) for c in cadeias]
+
+
+def test_lote_vazio():
+    assert afd_multiplos_de_tres().aceita_lote([]) == []
@@ -0,0 +1,58 @@
+from __future__ import annotations
+import random
+
+import pytest
+
+from automatos import AFD, compilar_regex
+
+
+def afd_aleatorio(aleatorio: random.Random, alfabeto: str = "ab") -> AFD:
+    estados = [f"q{i}" for i in range(aleatorio.randint(1, 8))]
+    transicoes = {estado: {simbolo: aleatorio.choice(estados) for simbolo in alfabeto if aleatorio.random() < 0.7}
+                  for estado in estados}
+    finais = {estado for estado in estados if aleatorio.random() < 0.4}
+    return AFD(set(estados), set(alfabeto), transicoes, estados[0], finais)
+
+
+def cadeias(aleatorio: random.Random, alfabeto: str, quantidade: int, tamanho_maximo: int = 7):
+    return [''.join(aleatorio.choices(alfabeto, k=aleatorio.randrange(tamanho_maximo))) for _ in range(quantidade)]
+
+
+def test_minimizar_preserva_a_linguagem_de_afds_aleatorios():
+    aleatorio = random.Random(0)
+    for _ in range(200):
+        afd = afd_aleatorio(aleatorio)
+        minimo = afd.minimizar()
+        assert len(minimo.estados) <= len(afd.estados)
+        for cadeia in cadeias(aleatorio, "abc", 100):
+            assert minimo.aceita(cadeia) == afd.aceita(cadeia), cadeia
+
+
+def test_minimizar_junta_estados_equivalentes():
+    # q1 e q2 são equivalentes: o mínimo tem dois estados.
+    afd = AFD({'q0', 'q1', 'q2'}, {'a'}, {'q0': {'a': 'q1'}, 'q1': {'a': 'q2'}, 'q2': {'a': 'q1'}},
+              'q0', {'q1', 'q2'})
+    minimo = afd.minimizar()
+    assert minimo.estados == {'q0', 'q1'}
+    assert minimo.transicoes['q1'] == {'a': 'q1'}
+
+
+@pytest.mark.parametrize("expressao, cadeia, esperado", [
+    ("ab", "cab", False),
+    ("ab", "xab", False),
+    ("a.b", "azb", True),
+    ("[^a]*b", "zzb", True),
+])
+def test_minimizar_preserva_a_coluna_outros(expressao, cadeia, esperado):
+    # Nestas tabelas a coluna "outros" leva a um estado morto ou ao destino de '.'.
+    afd = compilar_regex(expressao)
+    assert afd.aceita(cadeia) == esperado
+    assert afd.minimizar().aceita(cadeia) == esperado
+
+
+def test_minimizar_produto_com_outros_nao_padrao():
+    diferenca = (compilar_regex(".*b") - compilar_regex("a+b")).para_afd()
+    minimo = diferenca.minimizar()
+    aleatorio = random.Random(1)
+    for cadeia in cadeias(aleatorio, "abz", 2000, 6):
+        assert minimo.aceita(cadeia) == diferenca.aceita(cadeia), cadeia
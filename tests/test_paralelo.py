@@ -0,0 +1,37 @@
+from __future__ import annotations
+import random
+
+import pytest
+
+from automatos import AFDBuscaMultiPadrao, AFDBuscaPadrao, AFNDBuscaPadrao
+from automatos import _processos
+from automatos.paralelo import buscar_paralelo
+
+
+def texto_aleatorio(tamanho: int, semente: int) -> str:
+    return ''.join(random.Random(semente).choices('ab', k=tamanho))
+
+
+@pytest.mark.parametrize('busca', [
+    AFDBuscaPadrao('abaab'),
+    AFDBuscaMultiPadrao(['ab', 'bab', 'aaaa']),
+    AFNDBuscaPadrao('aba'),
+], ids=['kmp', 'aho-corasick', 'shift-and'])
+@pytest.mark.parametrize('chunk_size', [1, 3, 64])
+def test_busca_paralela_coincide_com_sequencial(busca, chunk_size):
+    texto = texto_aleatorio(2_000, chunk_size)
+    esperado = busca.buscar(texto)
+    assert esperado
+    assert buscar_paralelo(busca, texto, workers=2, chunk_size=chunk_size, limite_local=0) == esperado
+
+
+def test_texto_pequeno_corre_localmente():
+    busca = AFDBuscaPadrao('ab')
+    assert busca.buscar_paralelo('xabab', workers=4) == busca.buscar('xabab')
+
+
+def test_planear():
+    assert _processos.planear(10, 1, None, 0) is None
+    assert _processos.planear(10, 4, None, 100) is None
+    assert _processos.planear(100, 4, None, 0) == (4, 7)
+    assert _processos.planear(100, 4, 30, 0) == (4, 30)
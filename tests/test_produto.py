@@ -0,0 +1,70 @@
+from __future__ import annotations
+import itertools
+import random
+
+import pytest
+
+from automatos import AFD, AFDProduto, compilar_regex
+
+CADEIAS = [''.join(c) for n in range(7) for c in itertools.product('abx', repeat=n)]
+
+
+def afd_aleatorio(aleatorio: random.Random) -> AFD:
+    estados = [f"q{i}" for i in range(aleatorio.randint(1, 5))]
+    transicoes = {estado: {simbolo: aleatorio.choice(estados) for simbolo in 'ab' if aleatorio.random() < 0.7}
+                  for estado in estados}
+    finais = {estado for estado in estados if aleatorio.random() < 0.5}
+    return AFD(set(estados), {'a', 'b'}, transicoes, estados[0], finais)
+
+
+EXPRESSOES = [
+    (lambda a, b, c: a & b, lambda a, b, c: a and b),
+    (lambda a, b, c: a | b, lambda a, b, c: a or b),
+    (lambda a, b, c: a - b, lambda a, b, c: a and not b),
+    (lambda a, b, c: ~a, lambda a, b, c: not a),
+    (lambda a, b, c: (a | ~b) & (c - a), lambda a, b, c: (a or not b) and (c and not a)),
+    (lambda a, b, c: ~(a & b) | (a & c), lambda a, b, c: not (a and b) or (a and c)),
+]
+
+
+@pytest.mark.parametrize('montar, avaliar', EXPRESSOES)
+def test_produto_coincide_com_a_combinacao_booleana(montar, avaliar):
+    aleatorio = random.Random(0)
+    for _ in range(40):
+        folhas = [afd_aleatorio(aleatorio) for _ in range(3)]
+        produto = montar(*folhas)
+        assert isinstance(produto, AFDProduto)
+        afd = produto.para_afd()
+        minimo = afd.minimizar()
+        for cadeia in CADEIAS:
+            esperado = avaliar(*(folha.aceita(cadeia) for folha in folhas))
+            assert produto.aceita(cadeia) == esperado, cadeia
+            assert afd.aceita(cadeia) == esperado, cadeia
+            assert minimo.aceita(cadeia) == esperado, cadeia
+
+
+def test_folha_repetida_e_regex():
+    termina_em_b = compilar_regex('.*b')
+    tem_aa = compilar_regex('.*aa.*')
+    produto = (termina_em_b & ~tem_aa) | (termina_em_b - termina_em_b)
+    assert len(produto.folhas) == 2
+    for cadeia in CADEIAS:
+        assert produto.aceita(cadeia) == (cadeia.endswith('b') and 'aa' not in cadeia)
+
+
+def test_limite_de_estados_e_modificacao():
+    folhas = [afd_aleatorio(random.Random(i)) for i in range(3)]
+    produto = folhas[0] & folhas[1] | folhas[2]
+    produto.LIMITE_ESTADOS = 2
+    for cadeia in CADEIAS:
+        esperado = (folhas[0].aceita(cadeia) and folhas[1].aceita(cadeia)) or folhas[2].aceita(cadeia)
+        assert produto.aceita(cadeia) == esperado
+        assert produto.estados_materializados <= 2
+    folhas[2].estados_finais = set()
+    for cadeia in CADEIAS:
+        assert produto.aceita(cadeia) == (folhas[0].aceita(cadeia) and folhas[1].aceita(cadeia))
+
+
+def test_operando_invalido():
+    with pytest.raises(TypeError):
+        AFDProduto('e', afd_aleatorio(random.Random(0)), 'abc')
@@ -0,0 +1,86 @@
+from __future__ import annotations
+import random
+import re
+
+import pytest
+
+from automatos import AFD, ErroRegex, compilar_regex, thompson
+
+
+ALFABETO_TESTE = "abcz1 "
+
+
+def expressao_aleatoria(aleatorio: random.Random, profundidade: int = 3) -> str:
+    if profundidade == 0 or aleatorio.random() < 0.3:
+        return aleatorio.choice(["a", "b", "c", ".", "[ab]", "[^a]", "[a-c]", r"\d", r"\w", r"\s", "[^ab1]"])
+    escolha = aleatorio.randrange(4)
+    if escolha == 0:
+        return expressao_aleatoria(aleatorio, profundidade - 1) + expressao_aleatoria(aleatorio, profundidade - 1)
+    if escolha == 1:
+        return f"({expressao_aleatoria(aleatorio, profundidade - 1)}|{expressao_aleatoria(aleatorio, profundidade - 1)})"
+    return f"({expressao_aleatoria(aleatorio, profundidade - 1)}){aleatorio.choice('*+?')}"
+
+
+def cadeias(aleatorio: random.Random, quantidade: int, tamanho_maximo: int = 7):
+    return [''.join(aleatorio.choices(ALFABETO_TESTE, k=aleatorio.randrange(tamanho_maximo)))
+            for _ in range(quantidade)]
+
+
+def test_compilar_regex_coincide_com_re():
+    aleatorio = random.Random(0)
+    for _ in range(300):
+        expressao = expressao_aleatoria(aleatorio)
+        afd = compilar_regex(expressao)
+        minimo = afd.minimizar()
+        for cadeia in cadeias(aleatorio, 60):
+            esperado = re.fullmatch(expressao, cadeia) is not None
+            assert afd.aceita(cadeia) == esperado, (expressao, cadeia)
+            assert minimo.aceita(cadeia) == esperado, (expressao, cadeia)
+
+
+def test_ignorar_maiusculas():
+    afd = compilar_regex("ab[c-d]", ignorar_maiusculas=True)
+    for cadeia in ("abc", "ABD", "aBc", "abe", "ab"):
+        assert afd.aceita(cadeia) == (re.fullmatch("ab[c-d]", cadeia, re.IGNORECASE) is not None)
+
+
+def test_thompson_reconhece_os_simbolos_da_expressao():
+    afnd = thompson("(ab|c)*d")
+    for cadeia in ("d", "abd", "cabcd", "ab", "abcab"):
+        assert afnd.aceita(cadeia) == (re.fullmatch("(ab|c)*d", cadeia) is not None)
+
+
+@pytest.mark.parametrize("expressao", ["a(b", "a)", "[a", "*a", "a&b", "a\\"])
+def test_expressao_invalida(expressao):
+    with pytest.raises(ErroRegex):
+        compilar_regex(expressao)
+
+
+def test_ida_e_volta_pelo_formato_binario(tmp_path):
+    aleatorio = random.Random(1)
+    caminho = tmp_path / "regex.dfa"
+    for expressao in ("ab", "a.b", "[^a]*b", "(ab|c)*d", r"\d+(\s\w)?"):
+        afd = compilar_regex(expressao)
+        for origem in (afd, afd.minimizar()):
+            origem.salvar_automato(caminho, binario=True)
+            with AFD.abrir_arquivo(caminho) as carregado:
+                for cadeia in ["cab", "xab", "azb", *cadeias(aleatorio, 200)]:
+                    assert carregado.aceita(cadeia) == (re.fullmatch(expressao, cadeia) is not None), \
+                        (expressao, cadeia)
+
+
+def test_formato_de_texto_recusa_a_coluna_outros(tmp_path):
+    caminho = tmp_path / "regex.dfa"
+    for afd in (compilar_regex("ab"), compilar_regex("ab").minimizar()):
+        with pytest.raises(ValueError):
+            afd.salvar_automato(caminho)
+    assert not caminho.exists()
+
+
+def test_formato_de_texto_aceita_afds_comuns(tmp_path):
+    caminho = tmp_path / "comum.dfa"
+    afd = AFD({'q0', 'q1'}, {'a', 'b'}, {'q0': {'a': 'q1'}, 'q1': {'b': 'q0'}}, 'q0', {'q1'})
+    afd.minimizar().salvar_automato(caminho)
+    carregado = AFD.abrir_arquivo(caminho)
+    for cadeia in ("a", "aba", "ab", "ca", "abba"):
+        assert carregado.aceita(cadeia) == afd.aceita(cadeia)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+import itertools
+
+import pytest
+
+from gramatica_livre_contexto import ConflitoGramatica, GLC
+from gramatica_livre_contexto.tabelas import TabelaAnalise, TabelaLL1, TabelaLR
+
+# E -> T E', E' -> + T E' | ε, T -> F T', T' -> * F T' | ε, F -> ( E ) | a
+LL1 = GLC(V={'E', 'E2', 'T', 'T2', 'F'}, E={'+', '*', '(', ')', 'a'}, R={
+    'E': [['T', 'E2']], 'E2': [['+', 'T', 'E2'], ['ε']],
+    'T': [['F', 'T2']], 'T2': [['*', 'F', 'T2'], ['ε']],
+    'F': [['(', 'E', ')'], ['a']],
+}, S='E')
+
+# Recursiva à esquerda: não é LL(1), mas é LALR(1).
+LALR = GLC(V={'E', 'T', 'F'}, E={'+', '*', '(', ')', 'a'}, R={
+    'E': [['E', '+', 'T'], ['T']], 'T': [['T', '*', 'F'], ['F']], 'F': [['(', 'E', ')'], ['a']],
+}, S='E')
+
+# S -> a A d | b B d | a B e | b A e, A -> c, B -> c: LR(1) mas não LALR(1).
+LR1 = GLC(V={'S', 'A', 'B'}, E={'a', 'b', 'c', 'd', 'e'}, R={
+    'S': [['a', 'A', 'd'], ['b', 'B', 'd'], ['a', 'B', 'e'], ['b', 'A', 'e']],
+    'A': [['c']], 'B': [['c']],
+}, S='S')
+
+
+def folhas(arvore) -> str:
+    if isinstance(arvore, str):
+        return arvore
+    return ''.join(folhas(filho) for filho in arvore[1])
+
+
+def cadeias_ate(alfabeto, tamanho_maximo: int):
+    for tamanho in range(tamanho_maximo + 1):
+        for simbolos in itertools.product(sorted(alfabeto), repeat=tamanho):
+            yield ''.join(simbolos)
+
+
+def test_base_abstrata():
+    with pytest.raises(TypeError):
+        TabelaAnalise([], 'S', {}, [])
+
+
+@pytest.mark.parametrize('glc, gerar, tipo', [
+    (LL1, GLC.tabela_ll1, TabelaLL1),
+    (LL1, GLC.tabela_lr, TabelaLR),
+    (LALR, GLC.tabela_lr, TabelaLR),
+    (LALR, lambda glc: glc.tabela_lr(lalr=False), TabelaLR),
+    (LR1, lambda glc: glc.tabela_lr(lalr=False), TabelaLR),
+])
+def test_tabela_coincide_com_earley(glc, gerar, tipo, tmp_path):
+    tabela = gerar(glc)
+    assert isinstance(tabela, tipo) and not tabela.conflitos
+    caminho = tmp_path / 'tabela.json'
+    tabela.salvar(caminho)
+    carregada = TabelaAnalise.carregar(caminho)
+    assert type(carregada) is tipo
+    for cadeia in cadeias_ate(glc.E, 5):
+        arvore = tabela.analisar(cadeia)
+        assert (arvore is not None) == glc.aceita(cadeia), cadeia
+        assert carregada.analisar(cadeia) == arvore
+        if arvore is not None:
+            assert arvore[0] == glc.S and folhas(arvore) == cadeia
+
+
+def test_tabela_analise_escolhe_a_mais_simples():
+    assert LL1.tabela_analise().TIPO == 'LL(1)'
+    assert LALR.tabela_analise().TIPO == 'LALR(1)'
+    assert LR1.tabela_analise().TIPO == 'LR(1)'
+    assert LALR.tabela_ll1().conflitos
+    assert LR1.tabela_lr().conflitos
+
+
+def test_gramatica_ambigua_tem_conflitos():
+    ambigua = GLC(V={'E'}, E={'+', 'a'}, R={'E': [['E', '+', 'E'], ['a']]}, S='E')
+    with pytest.raises(ConflitoGramatica):
+        ambigua.tabela_analise()
+    with pytest.raises(ConflitoGramatica):
+        ambigua.tabela_lr().analisar('a+a')
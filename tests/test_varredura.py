@@ -0,0 +1,62 @@
+from __future__ import annotations
+import io
+import mmap
+import random
+
+import pytest
+
+from automatos import AFDBuscaMultiPadrao, AFDBuscaPadrao, AFNDBuscaPadrao
+from automatos.varredura import ler_blocos
+
+TEXTO = ''.join(random.Random(0).choices(['a', 'b', 'ç', 'ã', '€', 'x'], k=4_000))
+
+BUSCAS = [AFDBuscaPadrao('açã'), AFDBuscaMultiPadrao(['ab', 'ç€', 'ãa']), AFNDBuscaPadrao('b€')]
+IDS = ['kmp', 'aho-corasick', 'shift-and']
+
+
+def fontes(caminho):
+    dados = TEXTO.encode('utf-8')
+    caminho.write_bytes(dados)
+    yield caminho
+    yield str(caminho)
+    yield dados
+    yield bytearray(dados)
+    yield io.BytesIO(dados)
+    yield io.StringIO(TEXTO)
+    with open(caminho, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        yield mapa
+
+
+@pytest.mark.parametrize('busca', BUSCAS, ids=IDS)
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1 << 20])
+def test_busca_em_fluxo_coincide_com_buscar(busca, chunk_size, tmp_path):
+    esperado = busca.buscar(TEXTO)
+    assert esperado
+    for fonte in fontes(tmp_path / 'texto.txt'):
+        assert list(busca.buscar_stream(fonte, chunk_size=chunk_size)) == esperado, type(fonte)
+        if hasattr(fonte, 'seek'):
+            fonte.seek(0)
+        assert busca.contar_stream(fonte, chunk_size=chunk_size) == len(esperado), type(fonte)
+
+
+def test_blocos_reconstroem_caracteres_multibyte():
+    dados = TEXTO.encode('utf-8')
+    for tamanho in (1, 2, 5):
+        assert ''.join(ler_blocos(dados, tamanho)) == TEXTO
+        assert ''.join(ler_blocos(io.BytesIO(dados), tamanho)) == TEXTO
+
+
+def test_ficheiro_vazio_e_outra_codificacao(tmp_path):
+    vazio = tmp_path / 'vazio.txt'
+    vazio.write_bytes(b'')
+    busca = AFDBuscaPadrao('ab')
+    assert list(busca.buscar_stream(vazio)) == []
+    assert busca.contar_stream(vazio) == 0
+    latin = tmp_path / 'latin.txt'
+    latin.write_bytes('çab'.encode('latin-1'))
+    assert list(busca.buscar_stream(latin, chunk_size=1, encoding='latin-1')) == [1]
+
+
+def test_bloco_invalido():
+    with pytest.raises(ValueError):
+        list(ler_blocos(b'ab', 0))